@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""Compares the time the transformer spends building the documents of an
+item whose text is collected from large ``sources`` (e.g. the text of PDF
+files), with the documents built once per item and, as before, with the
+combined index document built again for the index document.
+
+Usage: python bin/benchmark_items.py [number of runs] [size of sources in KB]
+"""
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ocd_backend.items import BaseItem
+
+
+class SourcesItem(BaseItem):
+    combined_index_fields = dict(BaseItem.combined_index_fields,
+                                 sources=list)
+
+    def get_original_object_id(self):
+        return unicode(self.original_item['id'])
+
+    def get_original_object_urls(self):
+        return {'html': u'https://example.org/%s' % self.original_item['id']}
+
+    def get_collection(self):
+        return u'Benchmark'
+
+    def get_rights(self):
+        return u'undefined'
+
+    def get_combined_index_data(self):
+        return {
+            'title': u'Item %s' % self.original_item['id'],
+            'date': datetime(2018, 1, 1),
+            'sources': self.original_item['sources'],
+        }
+
+    def get_index_data(self):
+        return {}
+
+    def get_all_text(self):
+        return u' '.join(source['description']
+                         for source in self.original_item['sources'])
+
+
+def make_sources(source_size):
+    # Sources of about 1 KB each
+    return [{'url': u'https://example.org/%d.pdf' % i,
+             'description': u'Lorem ipsum dolor sit amet. ' * 37}
+            for i in range(source_size)]
+
+
+def transform(item, memoized):
+    """Returns the documents of `item`, as the transformer does."""
+    combined_index_doc = item.get_combined_index_doc()
+    if not memoized:
+        # The index document built the combined index document again
+        item._combined_index_doc = None
+    return combined_index_doc, item.get_index_doc()
+
+
+def main(runs, source_size):
+    sources = make_sources(source_size)
+
+    print 'Item with %d KB of sources, %d runs:' % (source_size, runs)
+    for name, memoized in (('built per call', False),
+                           ('built once', True)):
+        def run():
+            item = SourcesItem({'id': 'benchmark'}, 'application/json', '{}',
+                               {'id': 1, 'sources': sources}, 'item')
+            transform(item, memoized)
+        duration = timeit.timeit(run, number=runs) / runs
+        print '  %-16s %9.3f ms per item' % (name, duration * 1000)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 1024)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""Compares the size and speed of task messages encoded with the pickle
+serializer and gzip message compression (``ocd_serializer``) to the
+msgpack serializer (``ocd_msgpack``).
+
+The messages are loader tasks for the example documents in
+``tests/ocd_backend/test_dumps``, as sent by the pipeline.
+
+Usage: python bin/benchmark_serializers.py [number of runs]
+"""
+import json
+import os
+import pickle
+import sys
+import timeit
+import zlib
+from copy import deepcopy
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dateutil.parser import parse
+
+from ocd_backend.utils.serializers import MsgpackSerializer, COMPRESSIONS
+
+DUMPS_DIR = os.path.join(os.path.dirname(__file__), '..', 'tests',
+                         'ocd_backend', 'test_dumps')
+SOURCES_FILE = os.path.join(os.path.dirname(__file__), '..', 'ocd_backend',
+                            'sources', 'oude_ijsselstreek.json')
+
+
+def load_dump(name):
+    with open(os.path.join(DUMPS_DIR, name)) as f:
+        return f.read()
+
+
+def loader_message(source_data, content_type):
+    """Returns the body of a loader task message (args, kwargs, embed),
+    for an item with `source_data`."""
+    combined_index_doc = json.loads(load_dump('combined_index_doc.json'))
+    doc = json.loads(load_dump('index_doc.json'))
+    for d in (combined_index_doc, doc):
+        d['date'] = parse(d['date'])
+    doc['source_data'] = {'content_type': content_type, 'data': source_data}
+
+    with open(SOURCES_FILE) as f:
+        source_definition = json.load(f)[0]
+
+    item = ('5ce09994448a2ce826701e2fb7aa785bb9c1f2df',
+            u'749181', combined_index_doc, doc, 'item')
+    kwargs = {
+        'source_definition': source_definition,
+        'run_identifier': 'pipeline_0123456789abcdef0123456789abcdef',
+        'current_index_name': 'ori_oude_ijsselstreek_20180101000000',
+        'new_index_name': 'ori_oude_ijsselstreek_20180102000000',
+        'index_alias': 'ori_oude_ijsselstreek',
+        'chain_id': '0123456789abcdef0123456789abcdef',
+    }
+    embed = {'callbacks': None, 'errbacks': None, 'chain': None,
+             'chord': None}
+    return (item,), kwargs, embed
+
+
+def pickle_gzip_dumps(obj):
+    # As ocd_serializer with CELERY_MESSAGE_COMPRESSION set to gzip
+    return zlib.compress(pickle.dumps(obj))
+
+
+def pickle_gzip_loads(data):
+    return pickle.loads(zlib.decompress(data))
+
+
+def benchmark(name, dumps, loads, message, runs):
+    data = dumps(message)
+    assert loads(data) == message
+
+    encode = timeit.timeit(lambda: dumps(message), number=runs) / runs
+    decode = timeit.timeit(lambda: loads(data), number=runs) / runs
+    print '  %-22s %9d bytes %9.3f ms encode %9.3f ms decode' % (
+        name, len(data), encode * 1000, decode * 1000)
+
+
+def main(runs):
+    messages = [
+        ('OAI record (XML)', loader_message(
+            json.loads(load_dump('item.json'))['_source']['source_data']
+            ['data'].encode('utf-8'), 'application/xml')),
+        ('GO meeting (HTML)', loader_message(
+            load_dump('den_helder_meeting.html'), 'text/html')),
+    ]
+
+    serializers = [('pickle + gzip', pickle_gzip_dumps, pickle_gzip_loads)]
+    for compression in sorted(c for c in COMPRESSIONS if c):
+        serializer = MsgpackSerializer(compression)
+        serializers.append(('msgpack + %s' % compression,
+                            serializer.dumps, serializer.loads))
+    serializer = MsgpackSerializer(None)
+    serializers.append(('msgpack', serializer.dumps, serializer.loads))
+
+    for message_name, message in messages:
+        print '%s, %d runs:' % (message_name, runs)
+        for name, dumps, loads in serializers:
+            benchmark(name, dumps, loads, deepcopy(message), runs)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -332,7 +332,16 @@ def extract_list_sources(sources_config):
 @click.argument('source_id')
 @click.option('--subitem', '-s', multiple=True)
 @click.option('--entiteit', '-e', multiple=True)
-def extract_start(source_id, subitem, entiteit, sources_config):
+@click.option('--incremental', is_flag=True, expose_value=True,
+              help='Resume extraction from the last checkpoint of each '
+                   'entity instead of the configured start date')
+@click.option('--record', is_flag=True, expose_value=True,
+              help='Record the extracted items, so they can be replayed')
+@click.option('--replay', is_flag=True, expose_value=True,
+              help='Process the items of the latest recording instead of '
+                   'extracting them')
+def extract_start(source_id, subitem, entiteit, sources_config, incremental,
+                  record, replay):
     """
     Start extraction for a pipeline specified by ``source_id`` defined in
     ``--sources-config``. ``--sources-config defaults to ``settings.SOURCES_CONFIG_FILE``.
@@ -345,12 +354,33 @@ def extract_start(source_id, subitem, entiteit, sources_config):
 
     Note: ``--subitem`` and ``--entiteit`` only work in new-style yaml configurations.
 
+    With ``--incremental``, extractors that extract by date interval start at the
+    date up to which the previous run extracted the entity, and the
+    Gegevensmagazijn feed extractor continues at the feed page after the last
+    one that was processed.
+
+    With ``--record``, the extracted items of each pipeline are also written to
+    segment files in ``settings.SEGMENTS_DIR``. With ``--replay``, the items of
+    the latest complete recording of each pipeline are processed instead of
+    extracting them, i.e. to reprocess a source after changing its items.
+
     :param sources_config: Path to file containing pipeline definitions. Defaults to the value of ``settings.SOURCES_CONFIG_FILE``
     :param source_id: identifier used in ``--sources_config`` to describe pipeline
     :param subitem: one ore more items under the parent `source_id`` to specify which subitems should be run
     :param entiteit: one ore more entity arguments to specify which entities should be run
+    :param incremental: resume each entity from its last checkpoint
+    :param record: record the extracted items of each pipeline
+    :param replay: process the latest recording of each pipeline
     """
 
+    options = {}
+    if incremental:
+        options['incremental'] = True
+    if record:
+        options['record_segments'] = True
+    if replay:
+        options['replay_segments'] = True
+
     sources = load_sources_config(sources_config)
 
     # Find the requested source definition in the list of available sources
@@ -364,6 +394,7 @@ def extract_start(source_id, subitem, entiteit, sources_config):
 
     # Check for old-style json sources
     if 'id' in source:
+        source.update(options)
         setup_pipeline(source)
         return
 
@@ -386,6 +417,7 @@ def extract_start(source_id, subitem, entiteit, sources_config):
         for item in source.get('entities'):
             if (not entiteit and item) or (entiteit and item.get('entity') in entiteit):
                 source.update(item)
+                source.update(options)
                 setup_pipeline(source)
 
 
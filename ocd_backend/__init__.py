@@ -74,7 +74,18 @@ class RegisterTask(celery_app.Task):
     """Since Celery 4.0.0 Task classes are not registered automatically:
     http://docs.celeryproject.org/en/latest/whatsnew-4.0.html#the-task-base-class-no-longer-automatically-register-tasks
     In order to keep the code working this class enables Celery 3.x behaviour"""
-    pass
+
+    #: Whether the task looks up its source definition when it is passed a
+    #: reference to it, see :mod:`ocd_backend.utils.definitions`
+    uses_source_definition = True
+
+    def __call__(self, *args, **kwargs):
+        # Tasks can be passed a reference to the source definition of their
+        # pipeline instead of the definition itself
+        if self.uses_source_definition:
+            from ocd_backend.utils.definitions import source_definitions
+            source_definitions.resolve(kwargs)
+        return super(RegisterTask, self).__call__(*args, **kwargs)
 
 
 # Monkeypatching Task in order to let it register automatically
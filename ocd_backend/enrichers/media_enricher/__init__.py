@@ -2,15 +2,16 @@ import os
 from base64 import b64encode
 from tempfile import SpooledTemporaryFile
 
-from requests import Session
-from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
 from ggm import GegevensmagazijnMotionText
 from ocd_backend.enrichers import BaseEnricher
 from ocd_backend.exceptions import SkipEnrichment, UnsupportedContentType
 from ocd_backend.log import get_source_logger
-from ocd_backend.settings import TEMP_DIR_PATH, USER_AGENT
+from ocd_backend.settings import (TEMP_DIR_PATH, HTTP_POOL_CONNECTIONS,
+                                  HTTP_POOL_MAXSIZE)
+from ocd_backend.utils import http_cache
+from ocd_backend.utils.http_sessions import http_sessions
 from ocd_backend.utils.misc import get_secret
 from .tasks import ImageMetadata, MediaType, FileToText
 
@@ -37,24 +38,22 @@ class MediaEnricher(BaseEnricher):
         'ggm_motion_text': GegevensmagazijnMotionText
     }
 
-    http_session = None
-
-    def setup_http_session(self):
-        if self.http_session:
-            self.http_session.close()
-
-        self.http_session = Session()
-        self.http_session.headers['User-Agent'] = USER_AGENT
-
-        http_retry = Retry(total=5, status_forcelist=[500, 503],
-                           backoff_factor=.5)
-        http_adapter = HTTPAdapter(max_retries=http_retry)
-        self.http_session.mount('http://', http_adapter)
-
-        http_retry = Retry(total=5, status_forcelist=[500, 503],
-                           backoff_factor=.5)
-        http_adapter = HTTPAdapter(max_retries=http_retry)
-        self.http_session.mount('https://', http_adapter)
+    #: Local copies of fetched media, shared with the text extraction of
+    #: documents, see :class:`~ocd_backend.utils.http_cache.DownloadStore`
+    download_store = http_cache.download_store
+
+    @property
+    def http_session(self):
+        """Returns the session of the current source, which is kept for the
+        lifetime of the worker so connections are reused between items."""
+        return http_sessions.get(
+            u'%s:%s' % (self.__class__.__name__, self.source_definition['id']),
+            max_retries=Retry(total=5, status_forcelist=[500, 503],
+                              backoff_factor=.5),
+            pool_connections=self.source_definition.get(
+                'http_pool_connections', HTTP_POOL_CONNECTIONS),
+            pool_maxsize=self.source_definition.get(
+                'http_pool_maxsize', HTTP_POOL_MAXSIZE))
 
     def setup_http_auth(self):
         user, password = get_secret(self.source_definition['id'])
@@ -86,6 +85,12 @@ class MediaEnricher(BaseEnricher):
             returned by the remote server.
         """
 
+        # Complete files are kept locally, so they only have to be
+        # downloaded again when they have been modified
+        if not partial_fetch:
+            return self.download_store.fetch(self.http_session, url,
+                                             timeout=(60, 120))
+
         http_resp = self.http_session.get(url, stream=True, timeout=(60, 120))
         http_resp.raise_for_status()
 
@@ -145,8 +150,6 @@ class MediaEnricher(BaseEnricher):
         if not doc.get('media_urls', []):
             raise SkipEnrichment('No "media_urls" in document.')
 
-        self.setup_http_session()
-
         if self.enricher_settings.get('authentication', False):
             self.setup_http_auth()
 
@@ -4,12 +4,25 @@ from hashlib import sha1
 from ocd_backend.enrichers.media_enricher import MediaEnricher
 from ocd_backend.log import get_source_logger
 from ocd_backend.settings import DATA_DIR_PATH
+from ocd_backend.utils.http_cache import DownloadStore
 
 log = get_source_logger('enricher')
 
 
 class StaticMediaEnricher(MediaEnricher):
+    # The static files are served from the local copies, so these are
+    # all kept
+    download_store = DownloadStore(os.path.join(DATA_DIR_PATH, 'static'),
+                                   keep_all=True)
+
     def fetch_media(self, object_id, url, partial_fetch=False):
+        if not partial_fetch:
+            return self.download_store.fetch(self.http_session, url,
+                                             timeout=(60, 120))
+
+        # The partial content overwrites the local copy
+        self.download_store.remove_validators(url)
+
         http_resp = self.http_session.get(url, stream=True, timeout=(60, 120))
         http_resp.raise_for_status()
 
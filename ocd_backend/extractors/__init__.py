@@ -1,12 +1,16 @@
 import requests
+from collections import deque
 from datetime import datetime
+from multiprocessing.pool import ThreadPool
 from dateutil.relativedelta import relativedelta
 from dateutil.parser import parse
 from requests.packages.urllib3.util.retry import Retry
-from requests.adapters import HTTPAdapter
 
-from ocd_backend.settings import USER_AGENT
+from ocd_backend import settings
 from ocd_backend.log import get_source_logger
+from ocd_backend.utils.checkpoints import checkpoint_store
+from ocd_backend.utils.http_sessions import http_sessions
+from ocd_backend.utils.rate_limit import RateLimitedSession
 
 log = get_source_logger('extractor')
 
@@ -37,12 +41,19 @@ class BaseExtractor(object):
         """
         raise NotImplementedError
 
-    def interval_generator(self):
-        """Returns a generator with date intervals
+    def intervals(self):
+        """Returns the date intervals to extract, and the
+        :class:`IntervalCheckpoint` that should be notified when an interval
+        has been extracted.
 
         The intervals are generated between the 'start_date' and 'end_date'
         specified in the source configuration. The default is one month ago
         from now, which can be changed by specifying 'months_interval'.
+
+        When 'incremental' is set in the source configuration, the intervals
+        start 'incremental_overlap_days' days before the checkpoint of the
+        source instead of at the 'start_date', and the checkpoint is moved
+        forward as the intervals are extracted.
         """
 
         months = 1  # Max 1 months intervals by default
@@ -55,16 +66,36 @@ class BaseExtractor(object):
         else:
             interval_delta = relativedelta(months=months)
 
-        current_start = datetime.today() - interval_delta
+        now = datetime.today()
+        current_start = now - interval_delta
 
         if 'start_date' in self.source_definition:
             current_start = parse(self.source_definition['start_date'])
 
-        end_date = datetime.today() + interval_delta
+        end_date = now + interval_delta
 
         if 'end_date' in self.source_definition:
             end_date = parse(self.source_definition['end_date'])
 
+        # The checkpoint store is only used by incremental runs
+        checkpoint_name = None
+        checkpoint = None
+        if self.source_definition.get('incremental'):
+            checkpoint_name = self.source_definition.get('id')
+        if checkpoint_name:
+            checkpoint = checkpoint_store.get(checkpoint_name)
+
+        if checkpoint:
+            overlap = relativedelta(days=self.source_definition.get(
+                'incremental_overlap_days', settings.INCREMENTAL_OVERLAP_DAYS))
+            current_start = max(current_start, checkpoint - overlap)
+            log.info("Resuming extraction of %s from %s" % (
+                checkpoint_name, current_start))
+
+        interval_checkpoint = IntervalCheckpoint(checkpoint_name, checkpoint,
+                                                 current_start, now)
+
+        intervals = []
         while True:
             current_end = current_start + interval_delta
 
@@ -74,7 +105,7 @@ class BaseExtractor(object):
                 log.debug("Next interval exceeds %s, months_interval not used"
                           % end_date)
 
-            yield current_start, current_end
+            intervals.append((current_start, current_end))
 
             current_start = current_end + relativedelta(seconds=1)
 
@@ -82,6 +113,98 @@ class BaseExtractor(object):
             if current_start > end_date:
                 break
 
+        return intervals, interval_checkpoint
+
+    def interval_generator(self):
+        """Returns a generator with date intervals, see :meth:`intervals`.
+
+        Once all items of an interval are extracted, the end of the interval
+        is stored as the checkpoint of the source.
+        """
+        intervals, interval_checkpoint = self.intervals()
+
+        for start_date, end_date in intervals:
+            yield start_date, end_date
+            interval_checkpoint.completed(end_date)
+
+    def extract_intervals(self, extract_interval):
+        """Yields the items that ``extract_interval(start_date, end_date)``
+        returns for each interval of :meth:`intervals`.
+
+        Up to 'interval_concurrency' intervals (as specified in the source
+        configuration) are extracted at the same time, each in its own
+        thread. Items are still yielded in the order of the intervals, as
+        soon as all intervals before them are extracted.
+        """
+        concurrency = self.source_definition.get(
+            'interval_concurrency', settings.INTERVAL_CONCURRENCY)
+
+        if concurrency <= 1:
+            for start_date, end_date in self.interval_generator():
+                for item in extract_interval(start_date, end_date):
+                    yield item
+            return
+
+        intervals, interval_checkpoint = self.intervals()
+
+        def extract(start_date, end_date):
+            return list(extract_interval(start_date, end_date))
+
+        # Only `concurrency` intervals are extracted ahead of the items that
+        # are yielded, to bound the number of items kept in memory
+        pool = ThreadPool(concurrency)
+        pending = deque()
+        try:
+            for start_date, end_date in intervals:
+                pending.append((end_date, pool.apply_async(
+                    extract, (start_date, end_date,))))
+
+                if len(pending) < concurrency:
+                    continue
+
+                end, result = pending.popleft()
+                for item in result.get():
+                    yield item
+                interval_checkpoint.completed(end)
+
+            while pending:
+                end, result = pending.popleft()
+                for item in result.get():
+                    yield item
+                interval_checkpoint.completed(end)
+        finally:
+            pool.terminate()
+
+
+class IntervalCheckpoint(object):
+    """Keeps the checkpoint of a source up to date while its intervals are
+    extracted.
+
+    The checkpoint is set to the end of the last extracted interval, but
+    not beyond the start of the run, as items dated after that might still
+    change. It only moves forward if there is no gap between the extracted
+    intervals and the intervals that were extracted before.
+
+    :param name: the name of the checkpoint, or ``None`` to not store it.
+    :param checkpoint: the current checkpoint, or ``None``.
+    :param start_date: the start of the first interval.
+    :param now: the start of the run.
+    """
+
+    def __init__(self, name, checkpoint, start_date, now):
+        self.name = name
+        self.checkpoint = checkpoint
+        self.now = now
+        self.contiguous = checkpoint is None or start_date <= checkpoint
+
+    def completed(self, end_date):
+        """Registers that all intervals up to `end_date` are extracted."""
+        completed = min(end_date, self.now)
+        if self.name and self.contiguous and (
+                self.checkpoint is None or completed > self.checkpoint):
+            self.checkpoint = completed
+            checkpoint_store.set(self.name, completed)
+
 
 class CustomRetry(Retry):
     """A subclass of the Retry class but with extra logging"""
@@ -97,9 +220,27 @@ class HttpRequestMixin(object):
     """A mixin that can be used by extractors that use HTTP as a method
     to fetch data from a remote source. A persistent
     :class:`requests.Session` is used to take advantage of
-    HTTP Keep-Alive.
+    HTTP Keep-Alive. Requests are rate limited per host, see
+    :class:`~ocd_backend.utils.rate_limit.RateLimitedSession`.
+
+    The session is shared by all objects of the same class and source in
+    the process, see :class:`~ocd_backend.utils.http_sessions.SessionRegistry`.
+    Connection pools are kept for ``http_pool_connections`` hosts, with at
+    most ``http_pool_maxsize`` connections per host; both can be set in the
+    source definition. When ``http_pool_block`` is set, the pool size is
+    also the maximum number of concurrent requests per host.
     """
 
+    http_pool_connections = settings.HTTP_POOL_CONNECTIONS
+    http_pool_maxsize = settings.HTTP_POOL_MAXSIZE
+    http_pool_block = False
+
+    @property
+    def http_session_key(self):
+        source_definition = getattr(self, 'source_definition', None) or {}
+        return u'%s:%s' % (self.__class__.__name__,
+                           source_definition.get('id'))
+
     @property
     def http_session(self):
         """Returns a :class:`requests.Session` object. A new session is
@@ -107,19 +248,18 @@ class HttpRequestMixin(object):
         http_session = getattr(self, '_http_session', None)
         if not http_session:
             requests.packages.urllib3.disable_warnings()
-            session = requests.Session()
-            session.headers['User-Agent'] = USER_AGENT
-
-            http_retry = CustomRetry(total=12, status_forcelist=[500, 503],
-                                     backoff_factor=.4)
-            http_adapter = HTTPAdapter(max_retries=http_retry)
-            session.mount('http://', http_adapter)
-
-            http_retry = CustomRetry(total=12, status_forcelist=[500, 503],
-                                     backoff_factor=.4)
-            http_adapter = HTTPAdapter(max_retries=http_retry)
-            session.mount('https://', http_adapter)
+            source_definition = getattr(self, 'source_definition', None) or {}
 
-            self._http_session = session
+            self._http_session = http_sessions.get(
+                self.http_session_key,
+                session_class=RateLimitedSession,
+                max_retries=CustomRetry(total=12,
+                                        status_forcelist=[500, 503],
+                                        backoff_factor=.4),
+                pool_connections=source_definition.get(
+                    'http_pool_connections', self.http_pool_connections),
+                pool_maxsize=source_definition.get(
+                    'http_pool_maxsize', self.http_pool_maxsize),
+                pool_block=self.http_pool_block)
 
         return self._http_session
@@ -0,0 +1,272 @@
+import sys
+from collections import deque
+from multiprocessing.pool import ThreadPool
+from Queue import Queue, Empty, Full
+from threading import Event, Thread
+
+from ocd_backend import settings
+from ocd_backend.extractors import BaseExtractor, HttpRequestMixin
+from ocd_backend.log import get_source_logger
+
+log = get_source_logger('extractor')
+
+# Marks the end of the references or results of a thread
+_DONE = object()
+
+
+class ExtractionStopped(Exception):
+    """Raised in the threads of a :class:`ConcurrentHttpExtractor` or
+    :func:`merge_iterables` when their values are no longer consumed."""
+
+
+class _Failure(object):
+    """An exception raised in a thread, to be raised again by the thread
+    that consumes the items."""
+
+    def __init__(self, exc_info):
+        self.exc_info = exc_info
+
+    def reraise(self):
+        raise self.exc_info[0], self.exc_info[1], self.exc_info[2]
+
+
+class _Channel(object):
+    """A bounded queue between threads. Putting and getting raise
+    :class:`ExtractionStopped` once `stopped` is set."""
+
+    def __init__(self, size, stopped):
+        self.queue = Queue(size)
+        self.stopped = stopped
+
+    def put(self, value):
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(value, timeout=.1)
+                return
+            except Full:
+                pass
+        raise ExtractionStopped()
+
+    def get(self):
+        while not self.stopped.is_set():
+            try:
+                return self.queue.get(timeout=.1)
+            except Empty:
+                pass
+        raise ExtractionStopped()
+
+
+def _run_threads(targets, results, stopped):
+    """Runs each of `targets` in a thread and yields the values they put
+    in `results`, until each has put :data:`_DONE`. An exception in a
+    thread is raised again, and all threads are stopped when the
+    consumer stops."""
+    threads = [Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    try:
+        done = 0
+        while done < len(threads):
+            try:
+                result = results.queue.get(timeout=.1)
+            except Empty:
+                continue
+
+            if result is _DONE:
+                done += 1
+            elif isinstance(result, _Failure):
+                result.reraise()
+            else:
+                yield result
+    finally:
+        # Stops the threads when all values have been consumed, but also
+        # when a thread failed or the values are no longer consumed
+        stopped.set()
+        for thread in threads:
+            thread.join()
+
+
+def merge_iterables(iterables, queue_size):
+    """Consumes each of `iterables` in its own thread, and yields
+    ``(index, value)`` tuples in the order in which the values are
+    produced. At most `queue_size` values are buffered."""
+    stopped = Event()
+    results = _Channel(queue_size, stopped)
+
+    def consumer(index, iterable):
+        def consume():
+            try:
+                for value in iterable:
+                    results.put((index, value))
+                results.put(_DONE)
+            except ExtractionStopped:
+                pass
+            except Exception:
+                try:
+                    results.put(_Failure(sys.exc_info()))
+                except ExtractionStopped:
+                    pass
+        return consume
+
+    return _run_threads([consumer(index, iterable)
+                         for index, iterable in enumerate(iterables)],
+                        results, stopped)
+
+
+class ConcurrentHttpExtractor(BaseExtractor, HttpRequestMixin):
+    """A base extractor for HTTP sources that list items on pages and
+    serve the details of each item separately.
+
+    Subclasses implement :meth:`pages`, :meth:`fetch_page` and
+    :meth:`fetch_detail`. By default, pages and details are fetched one
+    after the other. When the source definition sets ``concurrent``, up to
+    ``concurrency`` pages and ``concurrency`` details are fetched at the
+    same time, and items are yielded in the order in which they are
+    fetched.
+
+    At most ``queue_size`` references to details and ``queue_size``
+    extracted items are buffered, so fetching waits when the pipeline
+    does not keep up. Requests are retried and rate limited as all
+    requests of :class:`~ocd_backend.extractors.HttpRequestMixin`.
+    """
+
+    http_pool_block = True
+
+    def __init__(self, *args, **kwargs):
+        super(ConcurrentHttpExtractor, self).__init__(*args, **kwargs)
+
+        self.concurrent = self.source_definition.get('concurrent', False)
+        self.concurrency = self.source_definition.get(
+            'concurrency', settings.EXTRACTION_CONCURRENCY)
+        self.queue_size = self.source_definition.get(
+            'queue_size', settings.EXTRACTION_QUEUE_SIZE)
+
+        if self.concurrent:
+            self.http_pool_maxsize = self.concurrency
+
+    def pages(self):
+        """Returns an iterable of the pages to fetch, which may be endless
+        when :meth:`fetch_page` signals the last page."""
+        raise NotImplementedError
+
+    def fetch_page(self, page):
+        """Returns a list of references to the details on `page`, or
+        ``None`` if `page` is beyond the last page."""
+        raise NotImplementedError
+
+    def fetch_detail(self, ref):
+        """Returns an iterable of ``(content_type, data)`` tuples of the
+        item(s) referred to by `ref`."""
+        raise NotImplementedError
+
+    def run(self):
+        if self.concurrent:
+            return self.run_concurrent()
+        return self.run_serial()
+
+    def run_serial(self):
+        for page in self.pages():
+            refs = self.fetch_page(page)
+            if refs is None:
+                break
+
+            for ref in refs:
+                for item in self.fetch_detail(ref):
+                    yield item
+
+    def iter_page_refs(self):
+        """Yields the references on all pages, fetching up to
+        ``concurrency`` pages at the same time."""
+        pool = ThreadPool(self.concurrency)
+        try:
+            pages = iter(self.pages())
+            window = deque()
+            last_page = False
+
+            while True:
+                while not last_page and len(window) < self.concurrency:
+                    try:
+                        page = next(pages)
+                    except StopIteration:
+                        last_page = True
+                        break
+                    window.append(pool.apply_async(self.fetch_page, (page,)))
+
+                if not window:
+                    return
+
+                refs = window.popleft().get()
+                if refs is None:
+                    # Pages that are still being fetched are beyond the last
+                    # page as well
+                    return
+
+                for ref in refs:
+                    yield ref
+        finally:
+            pool.terminate()
+
+    def run_concurrent(self):
+        stopped = Event()
+        refs = _Channel(self.queue_size, stopped)
+        results = _Channel(self.queue_size, stopped)
+
+        def fetch_pages():
+            page_refs = self.iter_page_refs()
+            try:
+                for ref in page_refs:
+                    refs.put(ref)
+            except ExtractionStopped:
+                return
+            except Exception:
+                try:
+                    results.put(_Failure(sys.exc_info()))
+                except ExtractionStopped:
+                    return
+            finally:
+                page_refs.close()
+
+            try:
+                for _ in range(self.concurrency):
+                    refs.put(_DONE)
+            except ExtractionStopped:
+                pass
+
+        def fetch_details():
+            try:
+                while True:
+                    ref = refs.get()
+                    if ref is _DONE:
+                        break
+
+                    for item in self.fetch_detail(ref):
+                        results.put(item)
+
+                results.put(_DONE)
+            except ExtractionStopped:
+                pass
+            except Exception:
+                try:
+                    results.put(_Failure(sys.exc_info()))
+                except ExtractionStopped:
+                    pass
+
+        # The page thread does not put _DONE in the results, so it is
+        # started separately from the detail threads
+        pager = Thread(target=fetch_pages)
+        pager.daemon = True
+        pager.start()
+
+        try:
+            for item in _run_threads([fetch_details] * self.concurrency,
+                                     results, stopped):
+                yield item
+        except Exception:
+            log.error('Concurrent extraction of %s failed' %
+                      self.source_definition.get('id'))
+            raise
+        finally:
+            stopped.set()
+            pager.join()
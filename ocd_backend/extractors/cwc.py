@@ -3,13 +3,13 @@ from pprint import pprint
 import re
 
 from lxml import etree
-from suds.client import Client
 from suds.sudsobject import asdict
 
 from ocd_backend.extractors import BaseExtractor, HttpRequestMixin
 from ocd_backend.exceptions import ConfigurationError
 
 from ocd_backend import settings
+from ocd_backend.utils.soap import soap_clients
 from ocd_backend.utils.ibabs import (
     meeting_to_dict, document_to_dict, meeting_item_to_dict,
     meeting_type_to_dict, list_report_response_to_dict,
@@ -52,7 +52,7 @@ class CompanyWebcastBaseExtractor(BaseExtractor):
     def __init__(self, *args, **kwargs):
         super(CompanyWebcastBaseExtractor, self).__init__(*args, **kwargs)
 
-        self.client = Client(settings.CWC_WSDL)
+        self.client = soap_clients.get_client(settings.CWC_WSDL)
         # self.client.set_options(port='BasicHttpsBinding_IPublic')
 
 
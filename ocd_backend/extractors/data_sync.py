@@ -1,13 +1,22 @@
-from pprint import pprint
-
+from ocd_backend import settings
 from ocd_backend.extractors import BaseExtractor
+from ocd_backend.extractors.concurrent import merge_iterables
+from ocd_backend.log import get_source_logger
+from ocd_backend.utils.join_table import JoinTable
 from ocd_backend.utils.misc import load_object, load_sources_config
 
+log = get_source_logger('extractor')
+
 
 class DataSyncBaseExtractor(BaseExtractor):
     """
     A data synchronizer extractor. Takes two (or more) sources, then
     reconciles data.
+
+    By default, all datasets are extracted into memory and paired up by
+    match_data. When the source definition sets `streaming`, the datasets
+    are extracted concurrently and paired up by item_key instead, through
+    a join table on disk.
     """
 
     def __init__(self, *args, **kwargs):
@@ -16,6 +25,13 @@ class DataSyncBaseExtractor(BaseExtractor):
         self.sources = load_sources_config(self.source_definition['sources_config'])
         self.extractors = [self._init_extractor_from_source(s) for s in self.source_definition['sources']]
 
+        self.streaming = self.source_definition.get('streaming', False)
+        self.queue_size = self.source_definition.get(
+            'queue_size', settings.EXTRACTION_QUEUE_SIZE)
+
+        key_function = self.source_definition.get('key_function')
+        self.key_function = load_object(key_function) if key_function else None
+
     def _init_extractor_from_source(self, source_name):
         """
         Initializes an extractor from a specified source name.
@@ -47,7 +63,19 @@ class DataSyncBaseExtractor(BaseExtractor):
         """
         raise NotImplementedError
 
-    def run(self):
+    def item_key(self, dataset_id, item):
+        """
+        Returns the key on which an item of the dataset `dataset_id` is
+        matched with the items of other datasets in streaming mode, or None
+        to leave the item unmatched. The item is a tuple of content type
+        and object. By default, the function named by `key_function` in the
+        source definition is used.
+        """
+        if self.key_function is None:
+            raise NotImplementedError
+        return self.key_function(dataset_id, item)
+
+    def match_datasets(self):
         # list comprehension to activate the generators ...
         datasets = []
         for x in self.extractors:
@@ -59,14 +87,60 @@ class DataSyncBaseExtractor(BaseExtractor):
                 'id': x.source_definition['id'],
                 'data': data_for_dataset
             })
-        pprint(datasets)
 
         # here we need to pair up the datasets (aka matching)
-        matched_data = self.match_data(datasets)
-        #pprint(matched_data)
+        return self.match_data(datasets).itervalues()
+
+    def stream_matched_data(self):
+        """
+        Matches the items of all datasets by their item_key while they are
+        being extracted. The datasets are extracted concurrently, and each
+        group of items is yielded as soon as it has an item of every
+        dataset. Unmatched items are kept in an on-disk join table and
+        yielded at the end.
+        """
+        dataset_ids = [x.source_definition['id'] for x in self.extractors]
+        table = JoinTable(dataset_ids, settings.TEMP_DIR_PATH)
+
+        try:
+            items = merge_iterables([self._run_extractor(x)
+                                     for x in self.extractors],
+                                    self.queue_size)
+            for index, item in items:
+                dataset_id = dataset_ids[index]
+                key = self.item_key(dataset_id, item)
+                if key is None:
+                    yield {dataset_id: item}
+                    continue
+
+                content_type, data = item
+                data_items = table.add(key, dataset_id, content_type, data)
+                if data_items is not None:
+                    yield data_items
+
+            for data_items in table.remaining():
+                yield data_items
+        finally:
+            table.close()
+
+    @staticmethod
+    def _run_extractor(extractor):
+        try:
+            for item in extractor.run():
+                yield item
+        except TypeError:
+            log.exception('Extraction of %s failed' %
+                          extractor.source_definition['id'])
+
+    def run(self):
+        if self.streaming:
+            matched_data = self.stream_matched_data()
+        else:
+            matched_data = self.match_datasets()
+
         num_counted = 0
         num_matched = 0
-        for item_id, data_items in matched_data.iteritems():
+        for data_items in matched_data:
             num_counted += 1
             if len(data_items.keys()) > 1:
                 #  pprint(data_items)
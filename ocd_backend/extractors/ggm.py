@@ -1,12 +1,18 @@
 import json
 import os
 from base64 import b64encode
+from multiprocessing.pool import ThreadPool
+from urlparse import urlparse, parse_qs
 
 from ocd_backend import celery_app
 from ocd_backend.extractors import BaseExtractor, HttpRequestMixin
 from ocd_backend.extractors.extensions import BaseExtension
+from ocd_backend.log import get_source_logger
+from ocd_backend.utils.checkpoints import checkpoint_store
 from ocd_backend.utils.misc import get_secret
 
+log = get_source_logger('extractor')
+
 
 class GegevensmagazijnBaseExtractor(BaseExtractor, HttpRequestMixin):
     def __init__(self, source_definition):
@@ -20,41 +26,97 @@ class GegevensmagazijnBaseExtractor(BaseExtractor, HttpRequestMixin):
 
 
 class GegevensmagazijnFeedExtractor(GegevensmagazijnBaseExtractor):
+    """
+    Extracts the entries of the Gegevensmagazijn feed, page by page.
+
+    After the entries of a page have been yielded, the piket (the position
+    in the feed) of the next page and the number of entries extracted so
+    far are stored in the checkpoint store. An incremental run continues
+    at the stored piket. The next page is fetched while the entries of the
+    current page are being processed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(GegevensmagazijnFeedExtractor, self).__init__(*args, **kwargs)
+        self.checkpoint_name = self.source_definition['id']
+
+    def get_page(self, piket):
+        if piket:
+            url = u'%s&piket=%s' % (self.feed_url, piket)
+        else:
+            url = self.feed_url
+
+        log.info('Downloading feed page %s' % url)
+        resp = self.http_session.get(url)
+        if resp.status_code != 200:
+            log.error('Downloading feed page %s failed with status %s' % (
+                url, resp.status_code))
+            return None
+
+        return json.loads(resp.content)
+
+    @staticmethod
+    def link_piket(feed, rel):
+        """Returns the piket of the link `rel` of `feed`, or ``None`` if
+        there is no such link."""
+        for link in feed['links']:
+            if link['rel'] == rel:
+                query = parse_qs(urlparse(link['href']).query)
+                return query.get('piket', [None])[0]
+        return None
+
+    def save_position(self, piket, entries):
+        checkpoint_store.set_state(self.checkpoint_name, {
+            'piket': piket,
+            'entries': entries
+        })
 
     def run(self, piket=None, **kwargs):
-        while True:
-            if piket:
-                print "Downloading:", piket
-                resp = self.http_session.get(u'%s&piket=%s' % (
-                    self.feed_url, piket))
-            elif os.environ.get('GGM_PIKET'):
-                print "Downloading using env:", os.environ.get('GGM_PIKET')
-                resp = self.http_session.get(
-                    u'%s&piket=%s' % (self.feed_url, os.environ['GGM_PIKET']))
-            else:
-                print "Downloading the base_url"
-                resp = self.http_session.get(self.feed_url)
-
-            if resp.status_code == 200:
-                feed = json.loads(resp.content)
+        entries = 0
+
+        if piket is None and self.source_definition.get('incremental'):
+            state = checkpoint_store.get_state(self.checkpoint_name)
+            if state:
+                piket, entries = state['piket'], state['entries']
+                log.info('Resuming %s at piket %s, after %d entries' % (
+                    self.checkpoint_name, piket, entries))
+
+        if piket is None:
+            piket = os.environ.get('GGM_PIKET')
+
+        pool = ThreadPool(1)
+        try:
+            next_page = pool.apply_async(self.get_page, (piket,))
+            while True:
+                feed = next_page.get()
+                if feed is None:
+                    break
+
+                next_piket = self.link_piket(feed, 'next')
+                if next_piket:
+                    next_page = pool.apply_async(self.get_page, (next_piket,))
 
                 for entry in feed['entries']:
                     yield (entry['content']['src'],)
+                entries += len(feed['entries'])
+
+                if next_piket:
+                    self.save_position(next_piket, entries)
+                    piket = next_piket
+                    continue
+
+                if not any(link['rel'] == 'resume' for link in feed['links']):
+                    raise Exception("No next piket or resume found")
 
-                try:
-                    next_piket = [link["href"] for link in feed['links'] if link['rel'] == 'next'][0]
-                    os.environ['GGM_PIKET'] = next_piket.split('=')[-1]
-                    os.putenv('GGM_PIKET', next_piket.split('=')[-1])
-                except:
-                    if 'resume' in [link['rel'] for link in feed['links']]:
-                        print "DONE!!!"
-                        break
-                    else:
-                        raise Exception("No next piket or resume found")
-            else:
-                print resp.status_code
-                #raise  # todo fix this!
+                # The end of the feed; a later run continues at the resume
+                # link, or at this page if the link has no piket
+                self.save_position(self.link_piket(feed, 'resume') or piket,
+                                   entries)
+                log.info('Extracted all %d entries of %s' % (
+                    entries, self.checkpoint_name))
                 break
+        finally:
+            pool.terminate()
 
 
 class GegevensmagazijnEntityExtractor(HttpRequestMixin, BaseExtension):
@@ -1,12 +1,12 @@
 import json
 from pprint import pprint
 import re
-from time import sleep
 
 from lxml import etree
 from suds.client import Client
 
 from ocd_backend.extractors import BaseExtractor, HttpRequestMixin
+from ocd_backend.extractors.concurrent import ConcurrentHttpExtractor
 from ocd_backend.exceptions import ConfigurationError
 
 from ocd_backend import settings
@@ -69,7 +69,14 @@ class GemeenteOplossingenCommitteesExtractor(GemeenteOplossingenBaseExtractor):
             yield 'application/json', json.dumps(c)
 
 
-class GemeenteOplossingenMeetingsExtractor(GemeenteOplossingenBaseExtractor):
+class GemeenteOplossingenMeetingsExtractor(GemeenteOplossingenBaseExtractor,
+                                           ConcurrentHttpExtractor):
+    """
+    Extracts meetings by scraping the upcoming or archived meetings of each
+    committee. The meeting pages are fetched concurrently when the source
+    sets 'concurrent'.
+    """
+
     def _get_upcoming_meetings(self, upcoming_url):
         """
         Gets a list of upcoming meetings from the URL specified.
@@ -132,52 +139,49 @@ class GemeenteOplossingenMeetingsExtractor(GemeenteOplossingenBaseExtractor):
 
         return True
 
-    def run(self):
-        pages = self._get_pages()
-
-        for page in pages:
-            if self.source_definition.get('upcoming', True):
-                meetings = self._get_upcoming_meetings(page)
-            else:
-                meetings = self._get_archived_meetings(page)
+    def pages(self):
+        return self._get_pages()
 
-            for meeting in meetings:
-                sleep(1)
+    def fetch_page(self, page):
+        if self.source_definition.get('upcoming', True):
+            return self._get_upcoming_meetings(page)
+        return self._get_archived_meetings(page)
 
-                resp = self.http_session.get(meeting['url'])
-                if resp.status_code != 200:
-                    continue
+    def fetch_detail(self, meeting):
+        resp = self.http_session.get(meeting['url'])
+        if resp.status_code != 200:
+            return
 
-                html = etree.HTML(resp.content)
+        html = etree.HTML(resp.content)
 
-                if not self.filter_meeting(meeting, html):
-                    continue
+        if not self.filter_meeting(meeting, html):
+            return
 
-                # this is a bit ugly, but saves us from having to scrape
-                # all the meeting pages twice ...
+        # this is a bit ugly, but saves us from having to scrape
+        # all the meeting pages twice ...
 
-                meeting_obj = {
-                    'type': 'meeting',
-                    'content': etree.tostring(html),
-                    'full_content': resp.content,
-                }
+        meeting_obj = {
+            'type': 'meeting',
+            'content': etree.tostring(html),
+            'full_content': resp.content,
+        }
 
-                yield 'application/json', json.dumps(meeting_obj)
+        yield 'application/json', json.dumps(meeting_obj)
 
-                if not self.source_definition.get('extract_meeting_items', False):
-                    print "Should not extract meeting items"
-                    continue
+        if not self.source_definition.get('extract_meeting_items', False):
+            print "Should not extract meeting items"
+            return
 
-                for meeting_item_html in html.xpath(
-                    '//li[contains(@class, "agendaRow")]'):
+        for meeting_item_html in html.xpath(
+                '//li[contains(@class, "agendaRow")]'):
 
-                        meeting_item_obj = {
-                            'type': 'meeting-item',
-                            'content': etree.tostring(meeting_item_html),
-                            'full_content': resp.content,
-                        }
+            meeting_item_obj = {
+                'type': 'meeting-item',
+                'content': etree.tostring(meeting_item_html),
+                'full_content': resp.content,
+            }
 
-                        yield 'application/json', json.dumps(meeting_item_obj)
+            yield 'application/json', json.dumps(meeting_item_obj)
 
 
 class GemeenteOplossingenResolutionsExtractor(GemeenteOplossingenMeetingsExtractor):
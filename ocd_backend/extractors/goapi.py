@@ -42,26 +42,27 @@ class GemeenteOplossingenMeetingsExtractor(GemeenteOplossingenBaseExtractor):
     """
 
     def run(self):
+        return self.extract_intervals(self.extract_interval)
+
+    def extract_interval(self, start_date, end_date):
         meeting_count = 0
-        for start_date, end_date in self.interval_generator():
-
-            resp = self.http_session.get(
-                u'%s/meetings?date_from=%i&date_to=%i' % (
-                    self.base_url,
-                    (start_date - datetime(1970, 1, 1)).total_seconds(),
-                    (end_date - datetime(1970, 1, 1)).total_seconds()
-                )
+        resp = self.http_session.get(
+            u'%s/meetings?date_from=%i&date_to=%i' % (
+                self.base_url,
+                (start_date - datetime(1970, 1, 1)).total_seconds(),
+                (end_date - datetime(1970, 1, 1)).total_seconds()
             )
+        )
 
-            if resp.status_code == 200:
-                static_json = json.loads(resp.content)
+        if resp.status_code == 200:
+            static_json = json.loads(resp.content)
 
-                for meeting in static_json:
-                    yield 'application/json', json.dumps(meeting)
-                    meeting_count += 1
+            for meeting in static_json:
+                yield 'application/json', json.dumps(meeting)
+                meeting_count += 1
 
-            log.info("Now processing meetings from %s to %s" % (start_date, end_date,))
-            log.info("Extracted total of %d meetings." % meeting_count)
+        log.info("Now processing meetings from %s to %s" % (start_date, end_date,))
+        log.info("Extracted %d meetings." % meeting_count)
 
 
 class GemeenteOplossingenMeetingItemsExtractor(GemeenteOplossingenBaseExtractor):
@@ -70,31 +71,32 @@ class GemeenteOplossingenMeetingItemsExtractor(GemeenteOplossingenBaseExtractor)
     """
 
     def run(self):
+        return self.extract_intervals(self.extract_interval)
+
+    def extract_interval(self, start_date, end_date):
         meeting_count = 0
-        for start_date, end_date in self.interval_generator():
-
-            resp = self.http_session.get(
-                u'%s/meetings?date_from=%i&date_to=%i' % (
-                    self.base_url,
-                    (start_date - datetime(1970, 1, 1)).total_seconds(),
-                    (end_date - datetime(1970, 1, 1)).total_seconds()
-                )
+        resp = self.http_session.get(
+            u'%s/meetings?date_from=%i&date_to=%i' % (
+                self.base_url,
+                (start_date - datetime(1970, 1, 1)).total_seconds(),
+                (end_date - datetime(1970, 1, 1)).total_seconds()
             )
+        )
 
-            if resp.status_code == 200:
-                static_json = json.loads(resp.content)
+        if resp.status_code == 200:
+            static_json = json.loads(resp.content)
 
-                for meeting in static_json:
-                    if 'items' in meeting:
-                        for item in meeting['items']:
+            for meeting in static_json:
+                if 'items' in meeting:
+                    for item in meeting['items']:
 
-                            # Temporary hack to inherit meetingitem date from meeting
-                            if 'date' not in item:
-                                item['date'] = meeting['date']
+                        # Temporary hack to inherit meetingitem date from meeting
+                        if 'date' not in item:
+                            item['date'] = meeting['date']
 
-                            kv = {meeting['id']: item}
-                            yield 'application/json', json.dumps(kv)
-                            meeting_count += 1
+                        kv = {meeting['id']: item}
+                        yield 'application/json', json.dumps(kv)
+                        meeting_count += 1
 
-            log.info("Now processing meetings from %s to %s" % (start_date, end_date,))
-            log.info("Extracted total of %d meetings." % meeting_count)
+        log.info("Now processing meetings from %s to %s" % (start_date, end_date,))
+        log.info("Extracted %d meetings." % meeting_count)
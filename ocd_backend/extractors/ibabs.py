@@ -2,17 +2,20 @@ import json
 from pprint import pprint
 import re
 from hashlib import sha1
+from threading import local
 
 import requests
-from suds.client import Client
 
 from ocd_backend.extractors import BaseExtractor
 
 from ocd_backend import settings
 from ocd_backend.utils.ibabs import (
     meeting_to_dict, meeting_item_to_dict,
-    meeting_type_to_dict, list_report_response_to_dict,
-    list_entry_response_to_dict, votes_to_dict)
+    list_report_response_to_dict,
+    list_entry_response_to_dict, votes_to_dict, meeting_type_registry)
+from ocd_backend.utils.misc import concurrent_map
+from ocd_backend.utils.rate_limit import get_rate_limiter
+from ocd_backend.utils.soap import soap_clients
 from ocd_backend.log import get_source_logger
 
 log = get_source_logger('extractor')
@@ -22,6 +25,11 @@ class IBabsBaseExtractor(BaseExtractor):
     """
     A base extractor for the iBabs SOAP service. Instantiates the client
     and configures the right port tu use.
+
+    Extractors that need a SOAP call per meeting or list entry can fan
+    these calls out with :meth:`concurrent_map`. The number of threads is
+    set by ``concurrency`` in the source definition, and the calls per
+    second to a site are limited by ``requests_per_second``.
     """
 
     def __init__(self, *args, **kwargs):
@@ -32,8 +40,41 @@ class IBabsBaseExtractor(BaseExtractor):
         except Exception as e:
             ibabs_wsdl = settings.IBABS_WSDL
         #pprint(ibabs_wsdl)
-        self.client = Client(ibabs_wsdl)
-        self.client.set_options(port='BasicHttpsBinding_IPublic')
+        self.client = soap_clients.get_client(
+            ibabs_wsdl, port='BasicHttpsBinding_IPublic')
+
+        self.concurrency = self.source_definition.get(
+            'concurrency', settings.IBABS_CONCURRENCY)
+        self.rate_limiter = get_rate_limiter(
+            u'ibabs-%s' % self.source_definition.get('sitename'),
+            self.source_definition.get(
+                'requests_per_second', settings.IBABS_REQUESTS_PER_SECOND))
+        self.thread_local = local()
+
+    def _meetingtypes_as_dict(self):
+        return meeting_type_registry.as_dict(
+            self.client, self.source_definition['sitename'])
+
+    def thread_client(self):
+        """Returns the client of the current thread. A suds client is not
+        thread-safe, so each thread uses its own clone."""
+        client = getattr(self.thread_local, 'client', None)
+        if client is None:
+            client = self.thread_local.client = self.client.clone()
+        return client
+
+    def concurrent_map(self, func, items):
+        """Calls ``func(client, item)`` for each of `items` using up to
+        ``concurrency`` threads, and yields the results in the order of
+        `items`.
+        """
+        def call(item):
+            self.rate_limiter.wait()
+            if self.concurrency <= 1:
+                return func(self.client, item)
+            return func(self.thread_client(), item)
+
+        return concurrent_map(call, items, self.concurrency)
 
 
 class IBabsCommitteesExtractor(IBabsBaseExtractor):
@@ -47,16 +88,14 @@ class IBabsCommitteesExtractor(IBabsBaseExtractor):
             'commitee_designator', 'commissie')
         log.info("Getting committees with designator: %s" % (
             committee_designator,))
-        meeting_types = self.client.service.GetMeetingtypes(
-            self.source_definition['sitename']
-        )
-
-        if meeting_types.Meetingtypes:
-            for mt in meeting_types.Meetingtypes[0]:
-                if committee_designator in mt.Meetingtype.lower():
-                    yield 'application/json', json.dumps(meeting_type_to_dict(mt))
-        else:
-            log.warn('SOAP service error for %s: %s' % (self.source_definition['index_name'], meeting_types.Message))
+        site_meeting_types = meeting_type_registry.get(
+            self.client, self.source_definition['sitename'])
+
+        for mt in site_meeting_types or []:
+            if committee_designator in mt['Meetingtype'].lower():
+                committee = dict(mt)
+                del committee['Description']
+                yield 'application/json', json.dumps(committee)
 
 
 class IBabsMeetingsExtractor(IBabsBaseExtractor):
@@ -65,54 +104,53 @@ class IBabsMeetingsExtractor(IBabsBaseExtractor):
     state which kind of meetings should be extracted.
     """
 
-    def _meetingtypes_as_dict(self):
-        return {
-            o.Id: o.Description for o in self.client.service.GetMeetingtypes(
-                self.source_definition['sitename']).Meetingtypes[0]}
-
     def run(self):
+        self.meeting_types = self._meetingtypes_as_dict()
+        return self.extract_intervals(self.extract_interval)
+
+    def extract_interval(self, start_date, end_date):
         meeting_count = 0
         meetings_skipped = 0
         meeting_item_count = 0
-        for start_date, end_date in self.interval_generator():
-            log.info("Now processing meetings from %s to %s" % (start_date, end_date,))
-
-            meetings = self.client.service.GetMeetingsByDateRange(
-                Sitename=self.source_definition['sitename'],
-                StartDate=start_date.strftime('%Y-%m-%dT%H:%M:%S'),
-                EndDate=end_date.strftime('%Y-%m-%dT%H:%M:%S'),
-                MetaDataOnly=False)
-
-            meeting_types = self._meetingtypes_as_dict()
+        log.info("Now processing meetings from %s to %s" % (start_date, end_date,))
 
-            if meetings.Meetings:
-                for meeting in meetings.Meetings[0]:
-                    meeting_dict = meeting_to_dict(meeting)
+        # Intervals may be extracted in separate threads
+        meetings = self.thread_client().service.GetMeetingsByDateRange(
+            Sitename=self.source_definition['sitename'],
+            StartDate=start_date.strftime('%Y-%m-%dT%H:%M:%S'),
+            EndDate=end_date.strftime('%Y-%m-%dT%H:%M:%S'),
+            MetaDataOnly=False)
 
-                    # sometimes a meetingtype is actualy a meeting for some
-                    # reason. Let's ignore these for now
-                    if meeting_dict['MeetingtypeId'] not in meeting_types:
-                        meetings_skipped += 1
-                        continue
+        if meetings.Meetings:
+            for meeting in meetings.Meetings[0]:
+                meeting_dict = meeting_to_dict(meeting)
 
-                    meeting_dict['Meetingtype'] = meeting_types[
-                        meeting_dict['MeetingtypeId']]
-                    yield 'application/json', json.dumps(meeting_dict)
+                # sometimes a meetingtype is actualy a meeting for some
+                # reason. Let's ignore these for now
+                if meeting_dict['MeetingtypeId'] not in self.meeting_types:
+                    meetings_skipped += 1
+                    continue
 
-                    if meeting.MeetingItems is not None:
-                        for meeting_item in meeting.MeetingItems[0]:
-                            meeting_item_dict = meeting_item_to_dict(
-                                meeting_item)
-                            # This is a bit hacky, but we need to know this
-                            meeting_item_dict['MeetingId'] = meeting_dict['Id']
-                            meeting_item_dict['Meeting'] = meeting_dict
-                            yield 'application/json', json.dumps(
-                                meeting_item_dict)
-                            meeting_item_count += 1
-                    meeting_count += 1
+                meeting_dict['Meetingtype'] = self.meeting_types[
+                    meeting_dict['MeetingtypeId']]
+                yield 'application/json', json.dumps(meeting_dict)
+
+                if meeting.MeetingItems is not None:
+                    for meeting_item in meeting.MeetingItems[0]:
+                        meeting_item_dict = meeting_item_to_dict(
+                            meeting_item)
+                        # This is a bit hacky, but we need to know this
+                        meeting_item_dict['MeetingId'] = meeting_dict['Id']
+                        meeting_item_dict['Meeting'] = meeting_dict
+                        yield 'application/json', json.dumps(
+                            meeting_item_dict)
+                        meeting_item_count += 1
+                meeting_count += 1
 
-            log.info("Extracted total of %d meetings and %d meeting items. Also "
-                     "Skipped %d meetings in total." % (meeting_count, meeting_item_count, meetings_skipped,))
+        log.info("Extracted %d meetings and %d meeting items from %s to %s. "
+                 "Also skipped %d meetings." % (
+                     meeting_count, meeting_item_count, start_date, end_date,
+                     meetings_skipped,))
 
 
 class IBabsVotesMeetingsExtractor(IBabsBaseExtractor):
@@ -121,10 +159,28 @@ class IBabsVotesMeetingsExtractor(IBabsBaseExtractor):
     source definition should state which kind of meetings should be extracted.
     """
 
-    def _meetingtypes_as_dict(self):
-        return {
-            o.Id: o.Description for o in self.client.service.GetMeetingtypes(
-                self.source_definition['sitename']).Meetingtypes[0]}
+    def _get_meeting_with_options(self, client, meeting_id):
+        kv = client.factory.create('ns0:iBabsKeyValue')
+        kv.Key = 'IncludeMeetingItems'
+        kv.Value = True
+
+        kv2 = client.factory.create('ns0:iBabsKeyValue')
+        kv2.Key = 'IncludeListEntries'
+        kv2.Value = True
+
+        params = client.factory.create('ns0:ArrayOfiBabsKeyValue')
+        params.iBabsKeyValue.append(kv)
+        params.iBabsKeyValue.append(kv2)
+
+        return client.service.GetMeetingWithOptions(
+            Sitename=self.source_definition['sitename'],
+            MeetingId=meeting_id,
+            Options=params)
+
+    def _get_list_entry_votes(self, client, entry_id):
+        return client.service.GetListEntryVotes(
+            Sitename=self.source_definition['sitename'],
+            EntryId=entry_id)
 
     def valid_meeting(self, meeting):
         """
@@ -145,6 +201,7 @@ class IBabsVotesMeetingsExtractor(IBabsBaseExtractor):
         return False
 
     def run(self):
+        meeting_types = self._meetingtypes_as_dict()
         for start_date, end_date in self.interval_generator():
             meetings = self.client.service.GetMeetingsByDateRange(
                 Sitename=self.source_definition['sitename'],
@@ -152,38 +209,27 @@ class IBabsVotesMeetingsExtractor(IBabsBaseExtractor):
                 EndDate=end_date,
                 MetaDataOnly=False)
 
-            meeting_types = self._meetingtypes_as_dict()
-
             meeting_count = 0
             vote_count = 0
 
             meeting_sorting_key = self.source_definition.get('meeting_sorting', 'MeetingDate')
 
             sorted_meetings = sorted(meetings.Meetings[0], key=lambda m: getattr(m, meeting_sorting_key))
-            processed = []
+            meeting_dicts = []
             for meeting in sorted_meetings:
                 meeting_dict = meeting_to_dict(meeting)
                 # Getting the meeting type as a string is easier this way ...
                 pprint(meeting_dict['Id'])
                 meeting_dict['Meetingtype'] = meeting_types[
                     meeting_dict['MeetingtypeId']]
+                meeting_dicts.append(meeting_dict)
 
-                kv = self.client.factory.create('ns0:iBabsKeyValue')
-                kv.Key = 'IncludeMeetingItems'
-                kv.Value = True
-
-                kv2 = self.client.factory.create('ns0:iBabsKeyValue')
-                kv2.Key = 'IncludeListEntries'
-                kv2.Value = True
+            vote_meetings = self.concurrent_map(
+                self._get_meeting_with_options,
+                [m['Id'] for m in meeting_dicts])
 
-                params = self.client.factory.create('ns0:ArrayOfiBabsKeyValue')
-                params.iBabsKeyValue.append(kv)
-                params.iBabsKeyValue.append(kv2)
-
-                vote_meeting = self.client.service.GetMeetingWithOptions(
-                    Sitename=self.source_definition['sitename'],
-                    MeetingId=meeting_dict['Id'],
-                    Options=params)
+            entries = []
+            for meeting_dict, vote_meeting in zip(meeting_dicts, vote_meetings):
                 meeting_dict_short = meeting_to_dict(vote_meeting.Meeting)
 
                 if meeting_dict_short['MeetingItems'] is None:
@@ -192,29 +238,33 @@ class IBabsVotesMeetingsExtractor(IBabsBaseExtractor):
                     if mi['ListEntries'] is None:
                         continue
                     for le in mi['ListEntries']:
-                        log.debug("Motie id : %s" % le['EntryId'])
-                        hash_content = u'motion-%s' % (le['EntryId'])
-                        hashed_motion_id = unicode(sha1(hash_content.decode('utf8')).hexdigest())
-                        log.debug("Hashedotie id : %s" % (hashed_motion_id.strip(),))
-
-                        votes = self.client.service.GetListEntryVotes(
-                            Sitename=self.source_definition['sitename'],
-                            EntryId=le['EntryId'])
-                        if votes.ListEntryVotes is None:
-                            votes = []
-                        else:
-                            votes = votes_to_dict(votes.ListEntryVotes[0])
-                        result = {
-                            'motion_id': hashed_motion_id,
-                            'meeting': meeting_dict,
-                            'entry': le,
-                            'votes': votes
-                        }
-                        vote_count += 1
-                        if self.valid_meeting(result):
-                            processed += self.process_meeting(result)
+                        entries.append((meeting_dict, le,))
                 meeting_count += 1
 
+            entry_votes = self.concurrent_map(
+                self._get_list_entry_votes, [le['EntryId'] for _, le in entries])
+
+            processed = []
+            for (meeting_dict, le), votes in zip(entries, entry_votes):
+                log.debug("Motie id : %s" % le['EntryId'])
+                hash_content = u'motion-%s' % (le['EntryId'])
+                hashed_motion_id = unicode(sha1(hash_content.decode('utf8')).hexdigest())
+                log.debug("Hashedotie id : %s" % (hashed_motion_id.strip(),))
+
+                if votes.ListEntryVotes is None:
+                    votes = []
+                else:
+                    votes = votes_to_dict(votes.ListEntryVotes[0])
+                result = {
+                    'motion_id': hashed_motion_id,
+                    'meeting': meeting_dict,
+                    'entry': le,
+                    'votes': votes
+                }
+                vote_count += 1
+                if self.valid_meeting(result):
+                    processed += self.process_meeting(result)
+
             #pprint(processed)
             passed_vote_count = 0
             for result in processed:
@@ -392,6 +442,12 @@ class IBabsReportsExtractor(IBabsBaseExtractor):
     state which kind of reports should be extracted.
     """
 
+    def _get_list_entry(self, client, entry):
+        list_id, entry_id = entry
+        return client.service.GetListEntry(
+            Sitename=self.source_definition['sitename'],
+            ListId=list_id, EntryId=entry_id)
+
     def run(self):
         lists = self.client.service.GetLists(
             Sitename=self.source_definition['sitename'])
@@ -452,13 +508,18 @@ class IBabsReportsExtractor(IBabsBaseExtractor):
                     total_count += per_page
                     continue
 
+                dict_items = []
                 for item in document_element.results:
                     dict_item = list_report_response_to_dict(item)
                     dict_item['_ListName'] = result.ListName
                     dict_item['_ReportName'] = result.ReportName
-                    extra_info_item = self.client.service.GetListEntry(
-                        Sitename=self.source_definition['sitename'],
-                        ListId=l.Key, EntryId=dict_item['id'][0])
+                    dict_items.append(dict_item)
+
+                extra_info_items = self.concurrent_map(
+                    self._get_list_entry,
+                    [(l.Key, d['id'][0],) for d in dict_items])
+
+                for dict_item, extra_info_item in zip(dict_items, extra_info_items):
                     dict_item['_Extra'] = list_entry_response_to_dict(
                         extra_info_item)
                     #pprint(dict_item)
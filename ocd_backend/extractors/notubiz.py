@@ -2,8 +2,10 @@ import json
 
 from requests import HTTPError
 from dateutil.parser import parse
+from ocd_backend import settings
 from ocd_backend.extractors import BaseExtractor, HttpRequestMixin
 from ocd_backend.log import get_source_logger
+from ocd_backend.utils.misc import concurrent_map
 
 log = get_source_logger('extractor')
 
@@ -12,76 +14,92 @@ class NotubizBaseExtractor(BaseExtractor, HttpRequestMixin):
     """
     A base extractor for the Notubiz API. This base extractor just
     configures the base url to use for accessing the API.
+
+    The details of the meetings on a page of events are fetched with up to
+    ``meeting_concurrency`` concurrent requests, which is also the maximum
+    number of connections to the API.
     """
 
+    http_pool_block = True
+
     def __init__(self, *args, **kwargs):
         super(NotubizBaseExtractor, self).__init__(*args, **kwargs)
         self.base_url = self.source_definition['base_url']
+        self.meeting_concurrency = self.source_definition.get(
+            'meeting_concurrency', settings.NOTUBIZ_MEETING_CONCURRENCY)
+        self.http_pool_maxsize = self.meeting_concurrency
 
     def extractor(self, meeting_json):
         raise NotImplemented
 
+    def get_meeting(self, item):
+        return self.http_session.get(
+            "%s/events/meetings/%i?format=json&version=1.10.8" %
+            (
+                self.base_url,
+                item['id']
+            )
+        )
+
     def run(self):
-        for start_date, end_date in self.interval_generator():
-            log.info("Now processing first page meeting(items) from %s to %s" % (
-            start_date, end_date,))
-
-            page = 1
-            while True:
-                resp = self.http_session.get(
-                    "%s/events?organisation_id=%i&date_from=%s&date_to=%s"
-                    "&format=json&version=1.10.8&page=%i" %
-                    (
-                        self.base_url,
-                        self.source_definition['organisation_id'],
-                        start_date.strftime("%Y-%m-%d %H:%M:%S"),
-                        end_date.strftime("%Y-%m-%d %H:%M:%S"),
-                        page
-                    )
+        return self.extract_intervals(self.extract_interval)
+
+    def extract_interval(self, start_date, end_date):
+        log.info("Now processing first page meeting(items) from %s to %s" % (
+        start_date, end_date,))
+
+        page = 1
+        while True:
+            resp = self.http_session.get(
+                "%s/events?organisation_id=%i&date_from=%s&date_to=%s"
+                "&format=json&version=1.10.8&page=%i" %
+                (
+                    self.base_url,
+                    self.source_definition['organisation_id'],
+                    start_date.strftime("%Y-%m-%d %H:%M:%S"),
+                    end_date.strftime("%Y-%m-%d %H:%M:%S"),
+                    page
                 )
+            )
+
+            try:
+                resp.raise_for_status()
+            except HTTPError, e:
+                log.warn('%s: %s' % (e, resp.request.url))
+                break
+
+            event_json = resp.json()
 
+            if not event_json[self.source_definition['doc_type']]:
+                break
+
+            if page > 1:
+                log.debug("Processing page %i" % page)
+
+            meeting_responses = concurrent_map(
+                self.get_meeting, event_json[self.source_definition['doc_type']],
+                self.meeting_concurrency)
+
+            for resp in meeting_responses:
                 try:
                     resp.raise_for_status()
+                    meeting_json = resp.json()['meeting']
                 except HTTPError, e:
                     log.warn('%s: %s' % (e, resp.request.url))
                     break
+                except KeyError, e:
+                    log.error('%s: %s' % (e, resp.request.url))
+                    break
 
-                event_json = resp.json()
+                for result in self.extractor(meeting_json):
+                    yield result
 
-                if not event_json[self.source_definition['doc_type']]:
-                    break
+            # Currently not working due to bug
+            # if not event_json['pagination']['has_more_pages']:
+            #     log.info("Done processing all entities!")
+            #     break
 
-                if page > 1:
-                    log.debug("Processing page %i" % page)
-
-                for item in event_json[self.source_definition['doc_type']]:
-                    resp = self.http_session.get(
-                        "%s/events/meetings/%i?format=json&version=1.10.8" %
-                        (
-                            self.base_url,
-                            item['id']
-                        )
-                    )
-
-                    try:
-                        resp.raise_for_status()
-                        meeting_json = resp.json()['meeting']
-                    except HTTPError, e:
-                        log.warn('%s: %s' % (e, resp.request.url))
-                        break
-                    except KeyError, e:
-                        log.error('%s: %s' % (e, resp.request.url))
-                        break
-
-                    for result in self.extractor(meeting_json):
-                        yield result
-
-                # Currently not working due to bug
-                # if not event_json['pagination']['has_more_pages']:
-                #     log.info("Done processing all entities!")
-                #     break
-
-                page += 1
+            page += 1
 
 
 class NotubizMeetingExtractor(NotubizBaseExtractor):
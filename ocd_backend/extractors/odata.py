@@ -1,5 +1,6 @@
 import json
 
+from ocd_backend.utils.json_stream import iter_json_array
 from .staticfile import StaticJSONExtractor
 
 
@@ -14,11 +15,20 @@ class ODataExtractor(StaticJSONExtractor):
         of items.
         """
         static_json = json.loads(static_content)
+
+        for item in self.filter_items(static_json['value']):
+            yield 'application/json', json.dumps(item)
+
+    def extract_items_stream(self, chunks):
+        for item in self.filter_items(iter_json_array(chunks, key='value')):
+            yield 'application/json', json.dumps(item)
+
+    def filter_items(self, items):
         item_filter = self.source_definition['filter']
 
-        for item in static_json['value']:
+        for item in items:
             passed_filter = (item_filter is None) or (
                 item[item_filter.keys()[0]] == item_filter.values()[0])
 
             if passed_filter:
-                yield 'application/json', json.dumps(item)
+                yield item
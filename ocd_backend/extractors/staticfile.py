@@ -1,5 +1,8 @@
+from ocd_backend import settings
 from ocd_backend.extractors import BaseExtractor, HttpRequestMixin
 from ocd_backend.exceptions import ConfigurationError
+from ocd_backend.utils.json_stream import iter_json_array
+from ocd_backend.utils.segments import latest_recording_path, read_segments
 
 from click import progressbar
 import gzip
@@ -9,7 +12,13 @@ from lxml import etree
 
 class StaticFileBaseExtractor(BaseExtractor, HttpRequestMixin):
     """ A base class for implementing extractors that retrieve items
-    by fetching a single statically hosted external file."""
+    by fetching a single statically hosted external file.
+
+    When ``streaming`` is enabled in the source definition, the file is
+    not loaded into memory as a whole, but passed to
+    :meth:`extract_items_stream` as it is downloaded, in chunks of
+    ``stream_chunk_size`` bytes.
+    """
 
     def __init__(self, *args, **kwargs):
         super(StaticFileBaseExtractor, self).__init__(*args, **kwargs)
@@ -22,6 +31,10 @@ class StaticFileBaseExtractor(BaseExtractor, HttpRequestMixin):
 
         self.file_url = self.source_definition['file_url']
 
+        self.streaming = self.source_definition.get('streaming', False)
+        self.stream_chunk_size = self.source_definition.get(
+            'stream_chunk_size', settings.STATIC_FILE_STREAM_CHUNK_SIZE)
+
     def extract_items(self, static_content):
         """Parses the static content and extracts the items.
 
@@ -41,13 +54,35 @@ class StaticFileBaseExtractor(BaseExtractor, HttpRequestMixin):
         """
         raise NotImplementedError
 
+    def extract_items_stream(self, chunks):
+        """Parses the static content while it is being retrieved and
+        extracts the items, as :meth:`extract_items` does.
+
+        Extractors that can parse their content incrementally should
+        override this method; by default all chunks are joined and
+        passed to :meth:`extract_items`.
+
+        :param chunks: an iterable of the chunks of the static content.
+        """
+        return self.extract_items(''.join(chunks))
+
     def run(self):
         # Retrieve the static content from the source
         # TODO: disable ssl verification fro now since the
         # almanak implementation (of ssl) is broken.
-        r = self.http_session.get(self.file_url, verify=False)
+        r = self.http_session.get(self.file_url, verify=False,
+                                  stream=self.streaming)
         r.raise_for_status()
 
+        if self.streaming:
+            try:
+                for item in self.extract_items_stream(
+                        r.iter_content(self.stream_chunk_size)):
+                    yield item
+            finally:
+                r.close()
+            return
+
         static_content = r.content
 
         # Extract and yield the items
@@ -61,18 +96,29 @@ class StaticXmlExtractor(StaticFileBaseExtractor):
     The XPath expression used to extract items from the retrieved
     XML file should be specified in the definition of the source
     by populating the ``item_xpath`` attribute.
+
+    In streaming mode, XPath expressions can not be evaluated. Instead,
+    every element with the tag given by the ``item_tag`` attribute (e.g.
+    ``{http://www.w3.org/2005/Atom}entry``) is extracted as an item, and
+    discarded once it has been yielded.
     """
 
     def __init__(self, *args, **kwargs):
         super(StaticXmlExtractor, self).__init__(*args, **kwargs)
 
-        if 'item_xpath' not in self.source_definition:
-            raise ConfigurationError('Missing \'item_xpath\' definition')
+        if self.streaming:
+            if not self.source_definition.get('item_tag'):
+                raise ConfigurationError('Missing \'item_tag\' definition')
 
-        if not self.source_definition['item_xpath']:
-            raise ConfigurationError('The \'item_xpath\' is empty')
+            self.item_tag = self.source_definition['item_tag']
+        else:
+            if 'item_xpath' not in self.source_definition:
+                raise ConfigurationError('Missing \'item_xpath\' definition')
 
-        self.item_xpath = self.source_definition['item_xpath']
+            if not self.source_definition['item_xpath']:
+                raise ConfigurationError('The \'item_xpath\' is empty')
+
+            self.item_xpath = self.source_definition['item_xpath']
 
         self.default_namespace = None
         if 'default_namespace' in self.source_definition:
@@ -98,6 +144,29 @@ class StaticXmlExtractor(StaticFileBaseExtractor):
         for item in tree.xpath(self.item_xpath, namespaces=self.namespaces):
             yield 'application/xml', etree.tostring(item)
 
+    def extract_items_stream(self, chunks):
+        parser = etree.XMLPullParser(events=('end',), tag=self.item_tag)
+
+        for chunk in chunks:
+            parser.feed(chunk)
+            for item in self._read_items(parser):
+                yield item
+
+        parser.close()
+        for item in self._read_items(parser):
+            yield item
+
+    @staticmethod
+    def _read_items(parser):
+        for _, element in parser.read_events():
+            yield 'application/xml', etree.tostring(element)
+
+            # Free the memory of the element and of preceding siblings,
+            # which are still referenced by the parent
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
 
 class StaticHtmlExtractor(StaticFileBaseExtractor):
     """Extract items from a single static HTML file.
@@ -158,6 +227,10 @@ class StaticJSONExtractor(StaticFileBaseExtractor):
         for item in static_json:
             yield 'application/json', json.dumps(item)
 
+    def extract_items_stream(self, chunks):
+        for item in iter_json_array(chunks):
+            yield 'application/json', json.dumps(item)
+
 
 class StaticJSONDumpExtractor(BaseExtractor):
     """
@@ -184,3 +257,28 @@ class StaticJSONDumpExtractor(BaseExtractor):
         ) as f:
             for line in f:
                 yield 'application/json', line.strip()
+
+
+class SegmentReplayExtractor(BaseExtractor):
+    """
+    Extracts the items of a recording made by a pipeline with
+    ``record_segments`` (see :mod:`ocd_backend.utils.segments`), to process
+    them again without extracting them from the source.
+
+    The recording is read from ``segments_path``, or else the latest
+    complete recording of ``segments_source`` (which defaults to the id of
+    the source) is used. Items before number ``replay_start`` are skipped.
+    """
+    def __init__(self, *args, **kwargs):
+        super(SegmentReplayExtractor, self).__init__(*args, **kwargs)
+
+        self.segments_path = self.source_definition.get('segments_path')
+        if not self.segments_path:
+            self.segments_path = latest_recording_path(
+                settings.SEGMENTS_DIR,
+                self.source_definition.get('segments_source',
+                                           self.source_definition['id']))
+
+    def run(self):
+        return read_segments(self.segments_path,
+                             self.source_definition.get('replay_start', 0))
@@ -1,5 +1,4 @@
 import json
-from collections import MutableMapping
 from datetime import datetime
 from hashlib import sha1
 
@@ -49,6 +48,10 @@ class BaseItem(object):
         'all_text': unicode
     }
 
+    # The documents of the item, built once when they are first requested
+    _combined_index_doc = None
+    _index_doc = None
+
     def __init__(self, source_definition, data_content_type, data, item,
                  doc_type, processing_started=None):
         self.source_definition = source_definition
@@ -64,68 +67,89 @@ class BaseItem(object):
 
         self.index_data = self.get_index_data()
 
+    @classmethod
+    def _record_classes(cls):
+        """Returns the record classes of the meta and the combined index
+        data of the item class, which are looked up once per class."""
+        record_classes = cls.__dict__.get('_meta_and_combined_records')
+        if record_classes is None:
+            record_classes = (record_class(cls.meta_fields),
+                              record_class(cls.combined_index_fields))
+            cls._meta_and_combined_records = record_classes
+        return record_classes
+
     def _construct_object_meta(self, processing_started=None):
-        self.meta = StrictMappingDict(self.meta_fields)
+        meta = {
+            'source_id': unicode(self.source_definition['id']),
+            'collection': self.get_collection(),
+            'rights': self.get_rights(),
+            'original_object_id': self.get_original_object_id(),
+            'original_object_urls': self.get_original_object_urls(),
+        }
         if not processing_started:
-            self.meta['processing_started'] = datetime.now()
+            meta['processing_started'] = datetime.now()
 
-        self.meta['source_id'] = unicode(self.source_definition['id'])
-        self.meta['collection'] = self.get_collection()
-        self.meta['rights'] = self.get_rights()
-        self.meta['original_object_id'] = self.get_original_object_id()
-        self.meta['original_object_urls'] = self.get_original_object_urls()
+        self.meta = self._record_classes()[0](meta)
 
     def _construct_combined_index_data(self):
-        self.combined_index_data = StrictMappingDict(self.combined_index_fields)
-
-        for field, value in self.get_combined_index_data().iteritems():
-            if type(value) == bool:
-                self.combined_index_data[field] = value
-            elif value:
-                self.combined_index_data[field] = value
+        self.combined_index_data = self._record_classes()[1]({
+            field: value for field, value
+            in self.get_combined_index_data().iteritems()
+            if value or type(value) is bool})
 
     def get_combined_index_doc(self):
         """Construct the document that should be inserted into the 'combined
-        index'.
+        index'. The document is built once, later calls return the same
+        dict.
 
         :returns: a dict ready to be indexed.
         :rtype: dict
         """
+        if self._combined_index_doc is not None:
+            return self._combined_index_doc
+
         combined_item = {}
 
-        combined_item['meta'] = dict(self.meta)
+        combined_item['meta'] = self.meta.as_dict()
         combined_item['enrichments'] = {}
-        combined_item.update(dict(self.combined_index_data))
+        self.combined_index_data.as_dict(combined_item)
         combined_item['all_text'] = self.get_all_text()
 
+        self._combined_index_doc = combined_item
         return combined_item
 
     def get_index_doc(self):
         """Construct the document that should be inserted into the index
-        belonging to the item's source.
+        belonging to the item's source. The document is built once, later
+        calls return the same dict.
 
         :returns: a dict ready for indexing.
         :rtype: dict
         """
+        if self._index_doc is not None:
+            return self._index_doc
+
         item = {}
 
-        item['meta'] = dict(self.meta)
+        item['meta'] = self.meta.as_dict()
         item['enrichments'] = {}
         item['source_data'] = {
             'content_type': self.data_content_type,
             'data': self.data
         }
 
-        combined_index_data = dict(self.combined_index_data)
-        item.update(combined_index_data)
+        self.combined_index_data.as_dict(item)
 
         # Store a string representation of the combined index data on the
         # collection specific index as well, as we need to be able to
-        # reconstruct the combined index from the individual indices
+        # reconstruct the combined index from the individual indices. The
+        # combined document is shared with get_combined_index_doc, so its
+        # text is only collected once per item.
         item['combined_index_data'] = json_encoder.encode(self.get_combined_index_doc())
 
         item.update(self.index_data)
 
+        self._index_doc = item
         return item
 
     def get_original_object_id(self):
@@ -321,41 +345,93 @@ class LocalDumpItem(BaseItem):
         return self.original_item.get('_source', {})
 
 
-class StrictMappingDict(MutableMapping):
-    """A dictionary that can only contain a select number of predefined
-    key-value pairs.
+class StrictRecord(object):
+    """A compact record of a select number of predefined key-value pairs,
+    used for the meta and combined index data of items. The values are
+    validated once, when the record is created, and are written directly
+    into the documents of the item by :meth:`as_dict`.
 
-    When setting an item, the key is first checked against
-    mapping. If the key is not in the mapping, a :exc:`KeyError` is
-    raised. If the value is not of the datetype that is specified in the
-    mapping, a :exc:`TypeError` is raised.
+    Record classes are created for a mapping of allowed keys and value
+    datatypes by :func:`record_class`. A :exc:`KeyError` is raised for a
+    key that is not in the mapping, and a :exc:`TypeError` for a value
+    that is not of the datatype specified in the mapping. Records can be
+    read like a dict.
 
-    :param mapping: the mapping of allowed keys and value datatypes.
-    :type mapping: dict
+    :param values: the key-value pairs of the record, as a dict or an
+        iterable of ``(key, value)`` tuples.
     """
 
-    def __init__(self, mapping):
-        self.mapping = mapping
+    __slots__ = ('_values',)
+
+    #: The allowed keys and the datatype of each key
+    mapping = {}
 
-        self.store = {}
+    def __init__(self, values=()):
+        self._values = values = dict(values)
+
+        mapping = self.mapping
+        if not mapping.viewkeys() >= values.viewkeys():
+            raise KeyError('According to the mapping, %s is not in allowed'
+                           % ', '.join(values.viewkeys() - mapping.viewkeys()))
+        for key, value in values.iteritems():
+            if type(value) is not mapping[key]:
+                raise TypeError('Value of %s must be %s, not %s'
+                                % (key, mapping[key], type(value)))
 
     def __getitem__(self, key):
-        return self.store[key]
+        return self._values[key]
 
     def __setitem__(self, key, value):
         if key not in self.mapping:
-            raise KeyError('According to the mapping, %s is not in allowed' % key)
-        elif type(value) is not self.mapping[key]:
+            raise KeyError('According to the mapping, %s is not in allowed'
+                           % key)
+        if type(value) is not self.mapping[key]:
             raise TypeError('Value of %s must be %s, not %s'
                             % (key, self.mapping[key], type(value)))
-        else:
-            self.store[key] = value
+        self._values[key] = value
 
     def __delitem__(self, key):
-        del self.store[key]
+        del self._values[key]
+
+    def __contains__(self, key):
+        return key in self._values
 
     def __iter__(self):
-        return iter(self.store)
+        return iter(self._values)
 
     def __len__(self):
-        return len(self.store)
+        return len(self._values)
+
+    def keys(self):
+        return self._values.keys()
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def as_dict(self, target=None):
+        """Adds the key-value pairs of the record to `target`, or to a new
+        dict when `target` is ``None``, and returns it."""
+        if target is None:
+            return dict(self._values)
+        target.update(self._values)
+        return target
+
+
+_record_classes = {}
+
+
+def record_class(mapping):
+    """Returns the :class:`StrictRecord` class for `mapping`, the allowed
+    keys and value datatypes. Classes are created once per mapping.
+
+    :type mapping: dict
+    """
+    cache_key = frozenset(mapping.iteritems())
+    cls = _record_classes.get(cache_key)
+    if cls is None:
+        cls = type('StrictRecord', (StrictRecord,), {
+            '__slots__': (),
+            'mapping': dict(mapping),
+        })
+        _record_classes[cache_key] = cls
+    return cls
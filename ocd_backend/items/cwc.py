@@ -22,7 +22,7 @@ class VideotulenItem(
         Gets the organisation that represents the council.
         """
 
-        results = self.api_request(
+        results = self.cached_api_request(
             self.source_definition['index_name'], 'organizations',
             classification='Council')
         return results[0]
@@ -32,7 +32,7 @@ class VideotulenItem(
         Gets the committees that are active for the council.
         """
 
-        results = self.api_request(
+        results = self.cached_api_request(
             self.source_definition['index_name'], 'organizations',
             classification=['committee', 'subcommittee'])
         return {unicode(c['name']): c for c in results}
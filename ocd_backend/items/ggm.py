@@ -41,7 +41,7 @@ class GegevensmagazijnBaseItem(HttpRequestMixin, FrontendAPIMixin):
         return u'%sResources/%s' % (self.source_definition['base_url'], item_id)
 
     def _get_party(self, party_id):
-        results = self.api_request(
+        results = self.cached_api_request(
             self.source_definition['index_name'], 'organizations',
             classification='Party')
 
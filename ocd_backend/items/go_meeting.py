@@ -45,7 +45,7 @@ class MeetingItem(
         Gets the organisation that represents the council.
         """
 
-        results = self.api_request(
+        results = self.cached_api_request(
             self.source_definition['index_name'], 'organizations',
             classification='Council')
         return results[0]
@@ -59,7 +59,7 @@ class MeetingItem(
         Gets the committees that are active for the council.
         """
 
-        results = self.api_request(
+        results = self.cached_api_request(
             self.source_definition['index_name'], 'organizations',
             classification=['committee', 'subcommittee'])
         return {self._find_meeting_type_id(c): c for c in results}
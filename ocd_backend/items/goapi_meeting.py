@@ -24,7 +24,7 @@ class Meeting(
         Gets the committees that are active for the council.
         """
 
-        results = self.api_request(
+        results = self.cached_api_request(
             self.source_definition['index_name'], 'organizations',
             classification=['committee', 'subcommittee'])
         return {self._find_meeting_type_id(c): c for c in results}
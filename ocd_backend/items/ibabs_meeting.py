@@ -3,7 +3,6 @@ import json
 from pprint import pprint
 import re
 from hashlib import sha1
-from time import sleep
 
 import iso8601
 
@@ -22,7 +21,7 @@ class IBabsMeetingItem(
         Gets the organisation that represents the council.
         """
 
-        results = self.api_request(
+        results = self.cached_api_request(
             self.source_definition['index_name'], 'organizations',
             classification='Council')
         return results[0]
@@ -36,7 +35,7 @@ class IBabsMeetingItem(
         Gets the committees that are active for the council.
         """
 
-        results = self.api_request(
+        results = self.cached_api_request(
             self.source_definition['index_name'], 'organizations',
             classification=['committee', 'subcommittee'])
         try:
@@ -134,7 +133,6 @@ class IBabsMeetingItem(
             documents = []
 
         for document in documents:
-            sleep(1)
             print u"%s: %s" % (
                 combined_index_data['name'], document['DisplayName'],)
             description = self.file_get_contents(
@@ -164,7 +162,7 @@ class IBabsReportItem(
         Gets the organisation that represents the council.
         """
 
-        results = self.api_request(
+        results = self.cached_api_request(
             self.source_definition['index_name'], 'organizations',
             classification='Council')
         return results[0]
@@ -174,7 +172,7 @@ class IBabsReportItem(
         Gets the committees that are active for the council.
         """
 
-        results = self.api_request(
+        results = self.cached_api_request(
             self.source_definition['index_name'], 'organizations',
             classification=['committee', 'subcommittee'])
         return {c['name']: c for c in results}
@@ -296,7 +294,6 @@ class IBabsReportItem(
             documents = []
 
         for document in documents:
-            sleep(1)
             print u"Extra docs : %s: %s" % (
                 combined_index_data['name'], document['DisplayName'],)
             description = self.file_get_contents(
@@ -2,7 +2,6 @@ from datetime import datetime
 import json
 from pprint import pprint
 from hashlib import sha1
-from time import sleep
 import re
 import random
 
@@ -23,18 +22,18 @@ class IBabsMotionVotingMixin(
         Gets the organisation that represents the council.
         """
 
-        results = self.api_request(
+        results = self.cached_api_request(
             self.source_definition['index_name'], 'organizations',
             classification='Council')
         return results[0]
 
     def _get_council_members(self):
-        results = self.api_request(self.source_definition['index_name'],
+        results = self.cached_api_request(self.source_definition['index_name'],
             'persons', size=100)  # 100 for now ...
         return results
 
     def _get_council_parties(self):
-        results = self.api_request(self.source_definition['index_name'],
+        results = self.cached_api_request(self.source_definition['index_name'],
             'organizations', classification='Party', size=100)  # 100 for now ...
         return results
 
@@ -185,7 +184,6 @@ class IBabsMotionVotingMixin(
         # then that text will be used.
         combined_index_data['text'] = u"-"
         for document in documents:
-            sleep(1)
             print u"%s: %s" % (
                 combined_index_data['name'], document['DisplayName'],)
             description = self.file_get_contents(
@@ -22,18 +22,18 @@ class IBabsVotingRoundItem(HttpRequestMixin, FrontendAPIMixin, BaseItem):
         Gets the organisation that represents the council.
         """
 
-        results = self.api_request(
+        results = self.cached_api_request(
             self.source_definition['index_name'], 'organizations',
             classification='Council')
         return results[0]
 
     def _get_council_members(self):
-        results = self.api_request(self.source_definition['index_name'],
+        results = self.cached_api_request(self.source_definition['index_name'],
             'persons', size=100)  # 100 for now ...
         return results
 
     def _get_council_parties(self):
-        results = self.api_request(self.source_definition['index_name'],
+        results = self.cached_api_request(self.source_definition['index_name'],
             'organizations', classification='Party', size=100)  # 100 for now ...
         return results
 
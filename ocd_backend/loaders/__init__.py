@@ -1,12 +1,19 @@
+import atexit
 import json
+from threading import RLock, Timer
+from time import time
 
 import requests
+from celery.signals import worker_process_shutdown
+from elasticsearch.helpers import bulk
 
 from ocd_backend import celery_app
 from ocd_backend import settings
 from ocd_backend.es import elasticsearch
 from ocd_backend.exceptions import ConfigurationError
 from ocd_backend.log import get_source_logger
+from ocd_backend.utils.fingerprints import fingerprint, fingerprint_index
+from ocd_backend.utils.misc import load_object
 from ocd_backend.mixins import (OCDBackendTaskSuccessMixin,
                                 OCDBackendTaskFailureMixin)
 
@@ -62,6 +69,10 @@ class ElasticsearchLoader(BaseLoader):
 
     Each URL found in ``media_urls`` is added as a document to the
     ``RESOLVER_URL_INDEX`` (if it doesn't already exist).
+
+    When ``skip_unchanged`` is set in the source definition, the
+    fingerprint of the extracted item is recorded once it is indexed, so
+    the pipeline can skip the item when it is extracted again unchanged.
     """
     def run(self, *args, **kwargs):
         self.current_index_name = kwargs.get('current_index_name')
@@ -76,13 +87,50 @@ class ElasticsearchLoader(BaseLoader):
     def load_item(self, combined_object_id, object_id, combined_index_doc, doc,
                   doc_type):
         log.info('Indexing document id: %s' % object_id)
-        elasticsearch.index(index=settings.COMBINED_INDEX,
-                            doc_type=doc_type, id=combined_object_id,
-                            body=combined_index_doc)
+        for action in self.index_actions(combined_object_id, object_id,
+                                         combined_index_doc, doc, doc_type):
+            # Update if already exists
+            elasticsearch.index(index=action['_index'],
+                                doc_type=action['_type'], id=action['_id'],
+                                body=action['_source'])
+
+        item_fingerprint = self.item_fingerprint(doc)
+        if item_fingerprint:
+            fingerprint_index.add(self.index_name, object_id, item_fingerprint)
+
+    def item_fingerprint(self, doc):
+        """Returns the fingerprint of the extracted item a document was
+        created from, or ``None`` if fingerprints are not used."""
+        if not self.source_definition.get('skip_unchanged') or \
+                'source_data' not in doc:
+            return
+
+        return fingerprint(doc['source_data']['content_type'],
+                           doc['source_data']['data'])
+
+    def index_actions(self, combined_object_id, object_id, combined_index_doc,
+                      doc, doc_type):
+        """Generates the index actions for a single item, in the format
+        that is used by :func:`elasticsearch.helpers.bulk`.
+
+        :returns: a generator that yields an action for the combined
+            index, one for the source index and one for each media URL
+            that should be added to the ``RESOLVER_URL_INDEX``.
+        """
+        yield {
+            '_index': settings.COMBINED_INDEX,
+            '_type': doc_type,
+            '_id': combined_object_id,
+            '_source': combined_index_doc
+        }
 
         # Index documents into new index
-        elasticsearch.index(index=self.index_name, doc_type=doc_type,
-                            body=doc, id=object_id)
+        yield {
+            '_index': self.index_name,
+            '_type': doc_type,
+            '_id': object_id,
+            '_source': doc
+        }
 
         m_url_content_types = {}
         if 'media_urls' in doc['enrichments']:
@@ -104,10 +152,204 @@ class ElasticsearchLoader(BaseLoader):
                     url_doc['content_type'] = \
                         m_url_content_types[media_url['original_url']]
 
-                # Update if already exists
-                elasticsearch.index(index=settings.RESOLVER_URL_INDEX,
-                                         doc_type='url', id=url_hash,
-                                         body=url_doc)
+                yield {
+                    '_index': settings.RESOLVER_URL_INDEX,
+                    '_type': 'url',
+                    '_id': url_hash,
+                    '_source': url_doc
+                }
+
+
+class BulkActionBuffer(object):
+    """A process-wide buffer of Elasticsearch bulk actions.
+
+    Next to the actions, the buffer keeps track of the chains whose
+    cleanup is postponed until their actions have been flushed, and of the
+    smallest ``bulk_max_bytes`` of the sources of the actions, which limits
+    the size of the bulk requests.
+    """
+
+    def __init__(self):
+        self.lock = RLock()
+        self.actions = []
+        self.pending_cleanups = []
+        self.pending_fingerprints = []
+        self.buffered_bytes = 0
+        self.first_buffered = None
+        self.timer = None
+        self.max_chunk_bytes = None
+
+    def add(self, action, flush_interval, max_bytes=None):
+        with self.lock:
+            self.actions.append(action)
+            self.buffered_bytes += len(action['_source'])
+
+            if max_bytes and (self.max_chunk_bytes is None or
+                              max_bytes < self.max_chunk_bytes):
+                self.max_chunk_bytes = max_bytes
+
+            if not self.first_buffered:
+                self.first_buffered = time()
+
+                # Makes sure the buffer is flushed even if no other item
+                # arrives at this worker process
+                self.timer = Timer(flush_interval, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def threshold_reached(self, max_actions, max_bytes, flush_interval):
+        with self.lock:
+            if not self.actions:
+                return False
+
+            return (len(self.actions) >= max_actions or
+                    self.buffered_bytes >= max_bytes or
+                    time() - self.first_buffered >= flush_interval)
+
+    def add_fingerprint(self, index_name, object_id, item_fingerprint):
+        """Registers a fingerprint that is recorded once the document with
+        `object_id` has been indexed into `index_name`."""
+        with self.lock:
+            self.pending_fingerprints.append(
+                (index_name, object_id, item_fingerprint))
+
+    def postpone_cleanup(self, source_definition, kwargs):
+        """Registers the cleanup of a chain if it still has buffered
+        actions.
+
+        :returns: ``True`` if the cleanup is postponed until the next
+            flush, ``False`` if the cleanup can be done right away.
+        """
+        with self.lock:
+            if not self.actions:
+                return False
+
+            self.pending_cleanups.append((source_definition, kwargs))
+            return True
+
+    def flush(self):
+        """Sends all buffered actions to Elasticsearch and triggers the
+        postponed cleanup of the chains that have been loaded.
+
+        :returns: a tuple with the number of successfully indexed
+            documents and a list of errors.
+        """
+        with self.lock:
+            actions, self.actions = self.actions, []
+            pending_cleanups, self.pending_cleanups = self.pending_cleanups, []
+            pending_fingerprints, self.pending_fingerprints = \
+                self.pending_fingerprints, []
+            self.buffered_bytes = 0
+            self.first_buffered = None
+            max_chunk_bytes, self.max_chunk_bytes = \
+                self.max_chunk_bytes or settings.ES_BULK_MAX_BYTES, None
+
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+
+        success, errors, failed = 0, [], set()
+        if actions:
+            log.info('Flushing %d actions to Elasticsearch' % len(actions))
+            success, errors = bulk(elasticsearch, actions,
+                                   chunk_size=len(actions),
+                                   max_chunk_bytes=max_chunk_bytes,
+                                   raise_on_error=False,
+                                   raise_on_exception=False)
+
+            for error in errors:
+                op_type, info = error.items()[0]
+                log.error('Failed to %s document %s in %s: %s' % (
+                    op_type, info.get('_id'), info.get('_index'),
+                    info.get('error')))
+                failed.add((info.get('_index'), info.get('_id')))
+
+        for index_name, object_id, item_fingerprint in pending_fingerprints:
+            if (index_name, object_id) not in failed:
+                fingerprint_index.add(index_name, object_id, item_fingerprint)
+
+        for source_definition, kwargs in pending_cleanups:
+            load_object(source_definition.get('cleanup'))().delay(**kwargs)
+
+        return success, errors
+
+
+bulk_buffer = BulkActionBuffer()
+
+# Don't lose buffered actions when the worker process shuts down. Prefork
+# children that are recycled exit without running the atexit handlers, so
+# the buffer is flushed on Celery's shutdown signal as well
+atexit.register(bulk_buffer.flush)
+
+
+@worker_process_shutdown.connect
+def flush_bulk_buffer(**kwargs):
+    bulk_buffer.flush()
+
+
+class ElasticsearchBulkLoader(ElasticsearchLoader):
+    """Indexes items into Elasticsearch using the ``_bulk`` API.
+
+    Instead of indexing every document with a separate request, the
+    actions generated by :meth:`~ElasticsearchLoader.index_actions` are
+    buffered across items (and tasks) within a worker process. The
+    buffer is flushed when one of the following thresholds is reached,
+    each of which can be overridden in the source definition:
+
+    - ``bulk_max_actions``: the number of buffered actions
+      (default ``settings.ES_BULK_MAX_ACTIONS``)
+    - ``bulk_max_bytes``: the size of the buffered documents in bytes
+      (default ``settings.ES_BULK_MAX_BYTES``)
+    - ``bulk_flush_interval``: the number of seconds since the oldest
+      buffered action (default ``settings.ES_BULK_FLUSH_INTERVAL``)
+
+    The cleanup of a chain is postponed until its actions are flushed,
+    so the alias swap of :class:`~ocd_backend.tasks.CleanupElasticsearch`
+    only happens when all documents of the run have been sent. Once the
+    extractor of the run is done, the buffer is flushed after each task.
+    """
+
+    def run(self, *args, **kwargs):
+        source_definition = kwargs.get('source_definition', {})
+        self.max_actions = source_definition.get(
+            'bulk_max_actions', settings.ES_BULK_MAX_ACTIONS)
+        self.max_bytes = source_definition.get(
+            'bulk_max_bytes', settings.ES_BULK_MAX_BYTES)
+        self.flush_interval = source_definition.get(
+            'bulk_flush_interval', settings.ES_BULK_FLUSH_INTERVAL)
+
+        super(ElasticsearchBulkLoader, self).run(*args, **kwargs)
+
+        if bulk_buffer.threshold_reached(self.max_actions, self.max_bytes,
+                                         self.flush_interval):
+            bulk_buffer.flush()
+
+    def load_item(self, combined_object_id, object_id, combined_index_doc, doc,
+                  doc_type):
+        log.info('Buffering document id: %s' % object_id)
+        serializer = elasticsearch.transport.serializer
+
+        for action in self.index_actions(combined_object_id, object_id,
+                                         combined_index_doc, doc, doc_type):
+            # Serialize once here, strings are passed as-is by the
+            # serializer when the bulk request is constructed
+            action['_source'] = serializer.dumps(action['_source'])
+            bulk_buffer.add(action, self.flush_interval, self.max_bytes)
+
+        item_fingerprint = self.item_fingerprint(doc)
+        if item_fingerprint:
+            bulk_buffer.add_fingerprint(self.index_name, object_id,
+                                        item_fingerprint)
+
+    def after_return(self, status, retval, task_id, args, kwargs, einfo):
+        # Once all items of the run have been extracted, the run can finish
+        # as soon as its last items are loaded, so the buffer is flushed
+        # right away instead of waiting for the timer
+        if self.backend.get(kwargs.get('run_identifier')) == 'done':
+            bulk_buffer.flush()
+
+        if not bulk_buffer.postpone_cleanup(self.source_definition, kwargs):
+            self.cleanup(**kwargs)
 
 
 class ElasticsearchUpdateOnlyLoader(ElasticsearchLoader):
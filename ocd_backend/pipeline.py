@@ -6,14 +6,34 @@ from elasticsearch.exceptions import NotFoundError
 from celery import chain, group
 
 from ocd_backend.es import elasticsearch as es
+from ocd_backend.extractors.staticfile import SegmentReplayExtractor
+from ocd_backend.transformers import BaseTransformer
 from ocd_backend import settings, celery_app
 from ocd_backend.log import get_source_logger
-from ocd_backend.utils.misc import load_object, propagate_chain_get
+from ocd_backend.utils.definitions import source_definitions
+from ocd_backend.utils.fingerprints import fingerprint, fingerprint_index
+from ocd_backend.utils.http_sessions import http_sessions
+from ocd_backend.utils.segments import SegmentWriter, new_recording_path
+from ocd_backend.utils.misc import (load_object, propagate_chain_get,
+                                    batches)
 from ocd_backend.exceptions import ConfigurationError
 
 logger = get_source_logger('pipeline')
 
 
+def skip_unchanged(items, index_name):
+    """Filters out the extracted items whose fingerprint shows they have
+    already been loaded into `index_name`."""
+    skipped = 0
+    for item in items:
+        if fingerprint_index.contains(index_name, fingerprint(*item)):
+            skipped += 1
+            continue
+        yield item
+
+    logger.info('Skipped %d unchanged items' % skipped)
+
+
 def setup_pipeline(source_definition):
     logger.info('Starting pipeline for source: %s' % source_definition.get('id'))
 
@@ -71,6 +91,7 @@ def setup_pipeline(source_definition):
     pipeline_transformers = {}
     pipeline_enrichers = {}
     pipeline_loaders = {}
+    pipeline_definition_params = {}
 
     for pipeline in pipelines:
         if 'id' not in pipeline:
@@ -81,9 +102,15 @@ def setup_pipeline(source_definition):
         pipeline_definitions[pipeline['id']] = deepcopy(source_definition)
         pipeline_definitions[pipeline['id']].update(pipeline)
 
-        # initialize the ETL classes, per pipeline
-        pipeline_extractors[pipeline['id']] = load_object(
-            pipeline_definitions[pipeline['id']]['extractor'])
+        # initialize the ETL classes, per pipeline. When replaying, the
+        # items are read from the latest recording of the pipeline instead
+        if pipeline_definitions[pipeline['id']].get('replay_segments'):
+            pipeline_definitions[pipeline['id']].setdefault(
+                'segments_source', pipeline['id'])
+            pipeline_extractors[pipeline['id']] = SegmentReplayExtractor
+        else:
+            pipeline_extractors[pipeline['id']] = load_object(
+                pipeline_definitions[pipeline['id']]['extractor'])
 
         pipeline_extensions[pipeline['id']] = [
             load_object(cls) for cls in
@@ -92,6 +119,21 @@ def setup_pipeline(source_definition):
         pipeline_transformers[pipeline['id']] = load_object(
             pipeline['transformer'])()
 
+        # Extensions, and transformers that override BaseTransformer.run,
+        # handle a single item, so they can't be used in combination with
+        # batches
+        if pipeline_definitions[pipeline['id']].get('batch_size', 1) > 1:
+            if pipeline_extensions[pipeline['id']]:
+                raise ConfigurationError("Pipeline %s: 'batch_size' can't be "
+                                         "used in combination with "
+                                         "extensions." % pipeline['id'])
+            if type(pipeline_transformers[pipeline['id']]).run.im_func \
+                    is not BaseTransformer.run.im_func:
+                raise ConfigurationError("Pipeline %s: 'batch_size' can't be "
+                                         "used with transformer %s."
+                                         % (pipeline['id'],
+                                            pipeline['transformer']))
+
         pipeline_enrichers[pipeline['id']] = [
             (load_object(enricher[0])(), enricher[1]) for enricher in
             pipeline_definitions[pipeline['id']].get('enrichers', [])]
@@ -103,12 +145,56 @@ def setup_pipeline(source_definition):
             ]
         ]
 
+        # Tasks are passed either the source definition of the pipeline, or
+        # a reference to it, which the tasks look up in source_definitions
+        if pipeline_definitions[pipeline['id']].get(
+                'definition_by_reference',
+                settings.SOURCE_DEFINITION_BY_REFERENCE):
+            pipeline_definition_params[pipeline['id']] = {
+                'pipeline_id': pipeline['id']}
+        else:
+            pipeline_definition_params[pipeline['id']] = {
+                'source_definition': pipeline_definitions[pipeline['id']]}
+
+    source_definitions.store(params['run_identifier'], {
+        pipeline_id: pipeline_definitions[pipeline_id]
+        for pipeline_id, definition_params
+        in pipeline_definition_params.iteritems()
+        if 'pipeline_id' in definition_params
+    })
+
     result = None
     for pipeline in pipelines:
         try:
             # The first extractor should be a generator instead of a task
-            for item in pipeline_extractors[pipeline['id']](
-                    source_definition=pipeline_definitions[pipeline['id']]).run():
+            items = pipeline_extractors[pipeline['id']](
+                source_definition=pipeline_definitions[pipeline['id']]).run()
+
+            # The extracted items can be recorded, so they can be processed
+            # again without extracting them (see SegmentReplayExtractor)
+            if pipeline_definitions[pipeline['id']].get('record_segments') \
+                    and not pipeline_definitions[pipeline['id']].get(
+                        'replay_segments'):
+                items = SegmentWriter(
+                    new_recording_path(settings.SEGMENTS_DIR, pipeline['id']),
+                    settings.SEGMENT_SIZE).tee(items)
+
+            # Items that are identical to an item that has already been
+            # loaded into the index are not processed again
+            if pipeline_definitions[pipeline['id']].get('skip_unchanged'):
+                items = skip_unchanged(items, params['new_index_name'])
+
+            # When a batch size is specified, each chain processes a list
+            # of items instead of a single item. Transformers, enrichers and
+            # loaders accept both.
+            batch_size = pipeline_definitions[pipeline['id']].get(
+                'batch_size', 1)
+            if batch_size > 1:
+                items = ((batch,) for batch in batches(items, batch_size))
+
+            definition_params = pipeline_definition_params[pipeline['id']]
+
+            for item in items:
 
                 step_chain = list()
 
@@ -121,8 +207,7 @@ def setup_pipeline(source_definition):
                 for extension in pipeline_extensions[pipeline['id']]:
                     step_chain.append(extension().s(
                         *item,
-                        source_definition=pipeline_definitions[pipeline['id']],
-                        **params
+                        **dict(params, **definition_params)
                         )
                     )
                     # Prevent old item being passed down to next steps
@@ -131,18 +216,15 @@ def setup_pipeline(source_definition):
                 # Transformers
                 step_chain.append(pipeline_transformers[pipeline['id']].s(
                     *item,
-                    source_definition=pipeline_definitions[pipeline['id']],
-                    **params))
+                    **dict(params, **definition_params)))
 
                 # Enrichers
                 for enricher_task, enricher_settings in pipeline_enrichers[
                     pipeline['id']
                 ]:
                     step_chain.append(enricher_task.s(
-                        source_definition=pipeline_definitions[
-                            pipeline['id']],
                         enricher_settings=enricher_settings,
-                        **params
+                        **dict(params, **definition_params)
                         )
                     )
 
@@ -151,12 +233,14 @@ def setup_pipeline(source_definition):
                 initialized_loaders = []
                 for loader in pipeline_loaders[pipeline['id']]:
                     initialized_loaders.append(loader.s(
-                        source_definition=pipeline_definitions[
-                            pipeline['id']],
-                        **params))
+                        **dict(params, **definition_params)))
                 step_chain.append(group(initialized_loaders))
 
                 result = chain(step_chain).delay()
+
+            # The pool usage of the extractor sessions helps to size the
+            # connection pools for the concurrency of a source
+            http_sessions.log_stats()
         except KeyboardInterrupt:
             logger.warn('KeyboardInterrupt received. Stopping the program.')
             exit()
@@ -3,6 +3,14 @@ import pickle
 
 from kombu.serialization import register
 
+from ocd_backend.utils.serializers import MsgpackSerializer
+
+# Task messages larger than TASK_COMPRESSION_THRESHOLD bytes are compressed
+# by the ocd_msgpack serializer with TASK_COMPRESSION: 'zlib', or 'lz4' or
+# 'zstd' when these are installed on all workers, or None
+TASK_COMPRESSION = 'zlib'
+TASK_COMPRESSION_THRESHOLD = 4096
+
 register('ocd_serializer', pickle.dumps, pickle.loads,
          content_encoding='binary',
          content_type='application/x-pickle2')
@@ -12,12 +20,11 @@ REDIS_PORT = "6379"
 
 CELERY_CONFIG = {
     'BROKER_URL': 'redis://%s:%s/0' % (REDIS_HOST, REDIS_PORT),
-    'CELERY_ACCEPT_CONTENT': ['ocd_serializer'],
-    'CELERY_TASK_SERIALIZER': 'ocd_serializer',
-    'CELERY_RESULT_SERIALIZER': 'ocd_serializer',
+    'CELERY_ACCEPT_CONTENT': ['ocd_msgpack', 'ocd_serializer'],
+    'CELERY_TASK_SERIALIZER': 'ocd_msgpack',
+    'CELERY_RESULT_SERIALIZER': 'ocd_msgpack',
     'CELERY_RESULT_BACKEND': 'ocd_backend.result_backends:OCDRedisBackend+redis://redis:6379/0',
     'CELERY_IGNORE_RESULT': False,
-    'CELERY_MESSAGE_COMPRESSION': 'gzip',
     'CELERYD_HIJACK_ROOT_LOGGER': False,
     'CELERY_DISABLE_RATE_LIMITS': True,
     # ACKS_LATE prevents two tasks triggered at the same time to hang
@@ -84,6 +91,13 @@ if os.path.exists('/var/log/backend.err'):
 ELASTICSEARCH_HOST = 'localhost'
 ELASTICSEARCH_PORT = 9200
 
+# Thresholds at which the ElasticsearchBulkLoader flushes its buffered
+# actions; the number of actions, the size in bytes and the number of
+# seconds since the oldest buffered action
+ES_BULK_MAX_ACTIONS = 500
+ES_BULK_MAX_BYTES = 10 * 1024 * 1024
+ES_BULK_FLUSH_INTERVAL = 10
+
 ROOT_PATH = os.path.dirname(os.path.abspath(__file__))
 
 # The path of the directory used to store temporary files
@@ -92,6 +106,44 @@ TEMP_DIR_PATH = os.path.join(ROOT_PATH, 'temp')
 # The path of the directory used to store static files
 DATA_DIR_PATH = os.path.join(ROOT_PATH, '../data')
 
+# The path of the directory used to store local copies of downloaded files,
+# which are reused when the remote file has not been modified. The copies
+# are limited to DOWNLOADS_MAX_SIZE bytes, after which the least recently
+# used copies are removed.
+DOWNLOADS_DIR_PATH = os.path.join(DATA_DIR_PATH, 'downloads')
+DOWNLOADS_MAX_SIZE = 10 * 1024 * 1024 * 1024
+
+# The path of the directory used to cache text extracted from files, set
+# to None to disable the cache. The cache is limited to TEXT_CACHE_MAX_SIZE
+# bytes, after which the least recently used entries are removed.
+TEXT_CACHE_DIR = os.path.join(DATA_DIR_PATH, 'text_cache')
+TEXT_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+
+# The directory to record the extracted items of pipelines in, when they
+# are run with 'record_segments', and the number of items per segment file
+SEGMENTS_DIR = os.path.join(DATA_DIR_PATH, 'segments')
+SEGMENT_SIZE = 10000
+
+# Whether tasks are passed a reference to the source definition of their
+# pipeline, which is stored once per run in Redis, instead of the definition
+# itself. Sources can override this with 'definition_by_reference'. Each
+# worker keeps up to SOURCE_DEFINITION_CACHE_SIZE definitions in memory.
+SOURCE_DEFINITION_BY_REFERENCE = True
+SOURCE_DEFINITION_CACHE_SIZE = 128
+
+# The path of the JSON file used to store the date up to which each source
+# has been extracted, and the position of feed extractors, used by
+# incremental extraction. Set to None to store these checkpoints in Redis
+# instead. Incremental runs start
+# INCREMENTAL_OVERLAP_DAYS days before the checkpoint, to pick up changes to
+# recent items.
+CHECKPOINT_FILE = None
+INCREMENTAL_OVERLAP_DAYS = 7
+
+# The number of date intervals extractors extract at the same time, unless
+# 'interval_concurrency' is specified in the source definition
+INTERVAL_CONCURRENCY = 1
+
 # The path of the JSON file containing the sources config
 SOURCES_CONFIG_FILE = os.path.join(ROOT_PATH, 'sources/*')
 
@@ -113,16 +165,86 @@ USER_AGENT = 'Open Raadsinformatie/0.1 (+http://www.openraadsinformatie.nl/)'
 # to download dumps from another API instance than the one hosted by OpenState
 API_URL = 'http://frontend:5000/v0/'
 
+# The number of frontend API search results that are cached per worker
+# process, and the number of seconds they stay valid
+FRONTEND_API_CACHE_SIZE = 256
+FRONTEND_API_CACHE_TTL = 3600
+
+# The path of the directory used to cache parsed WSDLs of SOAP services,
+# set to None to only cache them in memory. Cached WSDLs are reloaded after
+# SOAP_WSDL_CACHE_TTL seconds.
+SOAP_WSDL_CACHE_DIR = os.path.join(DATA_DIR_PATH, 'wsdl_cache')
+SOAP_WSDL_CACHE_TTL = 24 * 3600
+
+# The number of hosts to keep a connection pool for, and the number of
+# connections per host, of the HTTP sessions of extractors, items and
+# enrichers. Sources can override these with 'http_pool_connections' and
+# 'http_pool_maxsize'.
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 10
+
+# The number of requests per second and the burst size that HTTP requests
+# of extractors and items are limited to, per host in HTTP_RATE_LIMITS, i.e.
+# {'api.notubiz.nl': (10, 20)}, where None means the host is not limited.
+# Requests to other hosts are limited to HTTP_RATE_LIMIT, which defaults to
+# the one request per second that GO and iBabs sources used to wait for.
+# Set HTTP_RATE_LIMIT_REDIS to share the limits between workers.
+HTTP_RATE_LIMIT = (1, 1)
+HTTP_RATE_LIMITS = {
+    # Documents of iBabs sources, which were downloaded one per second
+    'www.mijnbabs.nl': (1, 1),
+}
+HTTP_RATE_LIMIT_REDIS = False
+
+# The number of times a request is retried when the server responds with
+# '429 Too Many Requests', the maximum number of seconds to wait for a
+# 'Retry-After' header, and the number of seconds to wait before the first
+# retry when there is no such header, which doubles with each retry
+HTTP_RATE_LIMIT_RETRIES = 3
+HTTP_RETRY_AFTER_MAX = 300
+HTTP_RATE_LIMIT_BACKOFF = 1
+
+# The number of pages and of details that extractors based on
+# ConcurrentHttpExtractor fetch at the same time when a source sets
+# 'concurrent', and the number of extracted items they buffer
+EXTRACTION_CONCURRENCY = 4
+EXTRACTION_QUEUE_SIZE = 100
+
+# The number of meeting details the Notubiz extractors fetch at the same
+# time, which is also the maximum number of connections to the Notubiz API
+NOTUBIZ_MEETING_CONCURRENCY = 4
+
 # The endpoint for the iBabs API
 IBABS_WSDL = u'https://www.mijnbabs.nl/iBabsWCFService/Public.svc?singleWsdl'
 
+# The number of concurrent calls iBabs extractors make per meeting or list
+# entry, and the maximum number of calls per second to a single site
+IBABS_CONCURRENCY = 4
+IBABS_REQUESTS_PER_SECOND = 10
+
+# The number of seconds the meeting types of an iBabs site are cached, and
+# whether they are also cached in Redis to share them between workers
+IBABS_MEETING_TYPES_TTL = 3600
+IBABS_MEETING_TYPES_REDIS = False
+
 # The endpoint for the CompanyWebcast API
 CWC_WSDL = u'https://services.companywebcast.com/meta/1.2/metaservice.svc?singleWsdl'
 
+# The size of the chunks in which static files are parsed by extractors in
+# streaming mode
+STATIC_FILE_STREAM_CHUNK_SIZE = 64 * 1024
+
 # define the location of pdftotext
 PDF_TO_TEXT = u'pdftotext'
 PDF_MAX_MEDIABOX_PIXELS = 5000000
 
+# The maximum number of processes used to extract the text of a single PDF
+# file, and the minimum number of pages each process handles. Set the
+# number of workers to 1 to extract all pages in the worker itself, which
+# is the default until parallel extraction has been benchmarked.
+PDF_EXTRACTION_WORKERS = 1
+PDF_PAGES_PER_WORKER = 20
+
 # Allow any settings to be defined in local_settings.py which should be
 # ignored in your version control system allowing for settings to be
 # defined per machine.
@@ -130,3 +252,13 @@ try:
     from local_settings import *
 except ImportError:
     pass
+
+# A compact serializer that keeps tuples, strings and datetimes intact, see
+# ocd_backend.utils.serializers. Messages serialized with ocd_serializer are
+# still accepted, so workers can be updated one at a time. It is registered
+# after the local settings, so these can change the compression.
+task_serializer = MsgpackSerializer(TASK_COMPRESSION,
+                                    TASK_COMPRESSION_THRESHOLD)
+register('ocd_msgpack', task_serializer.dumps, task_serializer.loads,
+         content_encoding='binary',
+         content_type='application/x-ocd-msgpack')
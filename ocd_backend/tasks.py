@@ -3,6 +3,10 @@ from ocd_backend import celery_app
 from ocd_backend import settings
 from ocd_backend.es import elasticsearch as es
 from ocd_backend.log import get_source_logger
+from ocd_backend.utils.api import api_cache
+from ocd_backend.utils.definitions import source_definitions
+from ocd_backend.utils.fingerprints import fingerprint_index
+from ocd_backend.utils.ibabs import meeting_type_registry
 
 
 log = get_source_logger('ocd_backend.tasks')
@@ -11,6 +15,10 @@ log = get_source_logger('ocd_backend.tasks')
 class BaseCleanup(celery_app.Task):
     ignore_result = True
 
+    # Cleanups can run after the source definitions of the run have been
+    # removed, i.e. for a failed loader
+    uses_source_definition = False
+
     def run(self, *args, **kwargs):
         run_identifier = kwargs.get('run_identifier')
         run_identifier_chains = '{}_chains'.format(run_identifier)
@@ -18,6 +26,12 @@ class BaseCleanup(celery_app.Task):
 
         if self.backend.get_set_cardinality(run_identifier_chains) < 1 and self.backend.get(run_identifier) == 'done':
             self.backend.remove(run_identifier_chains)
+
+            # Documents looked up during the run might be changed by it
+            api_cache.invalidate()
+            meeting_type_registry.invalidate()
+            source_definitions.remove(run_identifier)
+
             self.run_finished(**kwargs)
         else:
             # If the extractor is still running, extend the lifetime of the
@@ -70,6 +84,7 @@ class CleanupElasticsearch(BaseCleanup):
         # Remove old index
         if current_index_name != new_index_name:
             es.indices.delete(index=current_index_name)
+            fingerprint_index.remove(current_index_name)
 
         return result
 
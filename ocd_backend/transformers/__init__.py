@@ -2,13 +2,18 @@ import json
 from hashlib import sha1
 from lxml import etree
 
+from celery.exceptions import SoftTimeLimitExceeded
+
 from ocd_backend import celery_app
 from ocd_backend import settings
 from ocd_backend.exceptions import NoDeserializerAvailable
+from ocd_backend.log import get_source_logger
 from ocd_backend.mixins import OCDBackendTaskFailureMixin
 from ocd_backend.utils import json_encoder
 from ocd_backend.utils.misc import load_object
 
+log = get_source_logger('transformer')
+
 
 class BaseTransformer(OCDBackendTaskFailureMixin, celery_app.Task):
 
@@ -28,14 +33,51 @@ class BaseTransformer(OCDBackendTaskFailureMixin, celery_app.Task):
         :param source_definition: The configuration of a single source in
             the form of a dictionary (as defined in the settings).
         :type source_definition: dict.
-        :returns: the output of :py:meth:`~BaseTransformer.transform_item`
+        :returns: the output of :py:meth:`~BaseTransformer.transform_item`,
+            or a list of outputs when a batch of items is passed as a list
+            of ``(raw_item_content_type, raw_item)`` tuples.
         """
         self.source_definition = kwargs['source_definition']
         self.item_class = load_object(kwargs['source_definition']['item'])
 
+        if len(args) == 1 and type(args[0]) == list:
+            return self.transform_batch(args[0])
+
         item = self.deserialize_item(*args)
         return self.transform_item(*args, item=item)
 
+    def transform_batch(self, raw_items):
+        """Transforms a batch of items. Items that fail to transform are
+        skipped and logged, so they don't prevent the rest of the batch
+        from being loaded.
+
+        :type raw_items: list
+        :param raw_items: a list of ``(raw_item_content_type, raw_item)``
+            tuples.
+        :returns: a list containing the output of
+            :py:meth:`~BaseTransformer.transform_item` for each item.
+        """
+        results = list()
+        skipped = 0
+        for raw_item_content_type, raw_item in raw_items:
+            try:
+                item = self.deserialize_item(raw_item_content_type, raw_item)
+                results.append(self.transform_item(raw_item_content_type,
+                                                   raw_item, item=item))
+            except SoftTimeLimitExceeded:
+                # Not an error of the item, the task ran out of time
+                raise
+            except Exception:
+                skipped += 1
+                log.exception('Unexpected error, skipping transformation of '
+                              'item in batch')
+
+        if skipped:
+            log.error('%s: skipped %d of %d items in batch'
+                      % (self.source_definition['id'], skipped,
+                         len(raw_items)))
+        return results
+
     def deserialize_item(self, raw_item_content_type, raw_item):
         if raw_item_content_type == 'application/json':
             return json.loads(raw_item)
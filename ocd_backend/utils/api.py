@@ -1,8 +1,15 @@
 import json
+from copy import deepcopy
 
 import requests
 
 from ocd_backend import settings
+from ocd_backend.utils.cache import TTLCache
+
+#: Process-wide cache of frontend API search results, see
+#: :meth:`FrontendAPIMixin.cached_api_request`
+api_cache = TTLCache(settings.FRONTEND_API_CACHE_SIZE,
+                     settings.FRONTEND_API_CACHE_TTL)
 
 
 class FrontendAPIMixin(object):
@@ -61,6 +68,30 @@ class FrontendAPIMixin(object):
                 return None
         return r.json()
 
+    def cached_api_request(self, index_name, doc_type, query=None, *args,
+                           **kwargs):
+        """
+        Same as :meth:`api_request`, but the results are cached for the
+        lifetime of the worker process (bounded by
+        ``settings.FRONTEND_API_CACHE_TTL``). Use this for documents that
+        don't change during a run, like the council, committees, persons and
+        parties. Empty and failed responses are not cached.
+        """
+        key = (self.source_definition.get('frontend_api_url', settings.API_URL),
+               index_name, doc_type, json.dumps(query, sort_keys=True),
+               json.dumps(kwargs, sort_keys=True))
+
+        results = api_cache.get(key)
+        if results is None:
+            results = self.api_request(index_name, doc_type, query, *args,
+                                       **kwargs)
+            if not results:
+                return results
+            api_cache.set(key, results)
+
+        # Callers are free to modify the results
+        return deepcopy(results)
+
     def api_request_object(self, index_name, doc_type, object_id, *args,
                            **kwargs):
         api_url = u'%s%s/%s/%s' % (
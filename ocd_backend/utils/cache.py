@@ -0,0 +1,70 @@
+from collections import OrderedDict
+from threading import RLock
+from time import time
+
+
+class TTLCache(object):
+    """A thread-safe, size-bounded cache that evicts the least recently
+    used entry when it is full. Entries expire after ``ttl`` seconds.
+
+    :param maxsize: the maximum number of entries in the cache.
+    :type maxsize: int
+    :param ttl: the number of seconds an entry stays valid.
+    :type ttl: int
+    """
+
+    def __init__(self, maxsize=128, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self.lock = RLock()
+        self.store = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Returns the value for `key`, or `default` if the key is not in
+        the cache or has expired."""
+        with self.lock:
+            try:
+                expires, value = self.store.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+
+            if expires < time():
+                self.misses += 1
+                return default
+
+            # Re-insert to mark the entry as most recently used
+            self.store[key] = (expires, value)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Stores `value` under `key`, evicting the least recently used
+        entries if the cache is full."""
+        with self.lock:
+            self.store.pop(key, None)
+            self.store[key] = (time() + self.ttl, value)
+
+            while len(self.store) > self.maxsize:
+                self.store.popitem(last=False)
+
+    def invalidate(self, predicate=None):
+        """Removes all entries from the cache, or only the entries for
+        which `predicate(key)` is true when a predicate is given."""
+        with self.lock:
+            if predicate is None:
+                self.store.clear()
+                return
+
+            for key in [k for k in self.store if predicate(k)]:
+                del self.store[key]
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.store and self.store[key][0] >= time()
+
+    def __len__(self):
+        return len(self.store)
@@ -0,0 +1,129 @@
+import json
+import os
+from tempfile import NamedTemporaryFile
+from threading import Lock
+
+from dateutil.parser import parse
+
+from ocd_backend import settings
+
+
+class RedisCheckpointStore(object):
+    """Stores the extraction checkpoints of all sources in a Redis hash.
+
+    Besides a checkpoint date, a source can store its extraction state
+    (i.e. the cursor of a feed) as a JSON serializable dict in a second
+    hash.
+    """
+
+    key = 'extraction_checkpoints'
+    state_key = 'extraction_states'
+
+    @property
+    def redis(self):
+        from ocd_backend import celery_app
+        return celery_app.backend.client
+
+    def get(self, name):
+        """Returns the checkpoint of `name` as a datetime, or ``None`` if
+        there is no checkpoint."""
+        value = self.redis.hget(self.key, name)
+        if value is None:
+            return None
+        return parse(value)
+
+    def set(self, name, value):
+        self.redis.hset(self.key, name, value.isoformat())
+
+    def remove(self, name):
+        self.redis.hdel(self.key, name)
+
+    def get_state(self, name):
+        """Returns the extraction state of `name`, or ``None`` if there is
+        no state."""
+        value = self.redis.hget(self.state_key, name)
+        if value is None:
+            return None
+        return json.loads(value)
+
+    def set_state(self, name, state):
+        self.redis.hset(self.state_key, name, json.dumps(state))
+
+    def remove_state(self, name):
+        self.redis.hdel(self.state_key, name)
+
+
+class FileCheckpointStore(object):
+    """Stores the extraction checkpoints and states of all sources in a JSON
+    file.
+
+    :param path: the path of the JSON file.
+    :type path: str
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = Lock()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except IOError:
+            data = {}
+
+        data.setdefault('checkpoints', {})
+        data.setdefault('states', {})
+        return data
+
+    def _save(self, data):
+        directory = os.path.dirname(self.path)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # Write to a temporary file first, so the checkpoints are never
+        # left half-written
+        with NamedTemporaryFile(dir=directory, prefix='.tmp_',
+                                delete=False) as f:
+            json.dump(data, f)
+        os.rename(f.name, self.path)
+
+    def _update(self, section, name, value=None):
+        with self.lock:
+            data = self._load()
+            if value is None:
+                data[section].pop(name, None)
+            else:
+                data[section][name] = value
+            self._save(data)
+
+    def get(self, name):
+        """Returns the checkpoint of `name` as a datetime, or ``None`` if
+        there is no checkpoint."""
+        value = self._load()['checkpoints'].get(name)
+        if value is None:
+            return None
+        return parse(value)
+
+    def set(self, name, value):
+        self._update('checkpoints', name, value.isoformat())
+
+    def remove(self, name):
+        self._update('checkpoints', name)
+
+    def get_state(self, name):
+        """Returns the extraction state of `name`, or ``None`` if there is
+        no state."""
+        return self._load()['states'].get(name)
+
+    def set_state(self, name, state):
+        self._update('states', name, state)
+
+    def remove_state(self, name):
+        self._update('states', name)
+
+
+if settings.CHECKPOINT_FILE:
+    checkpoint_store = FileCheckpointStore(settings.CHECKPOINT_FILE)
+else:
+    checkpoint_store = RedisCheckpointStore()
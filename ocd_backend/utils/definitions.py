@@ -0,0 +1,77 @@
+from ocd_backend import settings
+from ocd_backend.utils.cache import TTLCache
+
+
+class SourceDefinitionRegistry(object):
+    """Stores the source definitions of the pipelines of a run in Redis, so
+    tasks can be passed a reference to their definition instead of the
+    definition itself.
+
+    Workers keep the definitions they have looked up in a size-bounded
+    cache. A definition is shared by all tasks of a pipeline in a worker,
+    so tasks should not modify it.
+
+    :param cache_size: the number of definitions a worker keeps.
+    :type cache_size: int
+    :param ttl: the number of seconds the definitions of a run are kept in
+                Redis, when the run is not cleaned up.
+    :type ttl: int
+    """
+
+    def __init__(self, cache_size=128, ttl=7 * 24 * 3600):
+        self.cache = TTLCache(maxsize=cache_size, ttl=ttl)
+        self.ttl = ttl
+
+    @property
+    def redis(self):
+        from ocd_backend import celery_app
+        return celery_app.backend.client
+
+    @staticmethod
+    def _key(run_identifier):
+        return '%s_definitions' % run_identifier
+
+    def store(self, run_identifier, definitions):
+        """Stores `definitions`, a dict of source definitions by pipeline
+        id, for the run `run_identifier`."""
+        if not definitions:
+            return
+
+        key = self._key(run_identifier)
+        pipe = self.redis.pipeline()
+        pipe.hmset(key, {
+            pipeline_id: settings.task_serializer.dumps(definition)
+            for pipeline_id, definition in definitions.iteritems()
+        })
+        pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def get(self, run_identifier, pipeline_id):
+        """Returns the source definition of `pipeline_id` in the run
+        `run_identifier`."""
+        cache_key = (run_identifier, pipeline_id)
+        definition = self.cache.get(cache_key)
+        if definition is None:
+            data = self.redis.hget(self._key(run_identifier), pipeline_id)
+            if data is None:
+                raise KeyError('No source definition of pipeline %s in run '
+                               '%s' % (pipeline_id, run_identifier))
+            definition = settings.task_serializer.loads(data)
+            self.cache.set(cache_key, definition)
+        return definition
+
+    def resolve(self, kwargs):
+        """Adds the ``source_definition`` to the keyword arguments of a
+        task that were passed a ``pipeline_id`` reference instead."""
+        if 'source_definition' not in kwargs and 'pipeline_id' in kwargs:
+            kwargs['source_definition'] = self.get(kwargs['run_identifier'],
+                                                   kwargs['pipeline_id'])
+        return kwargs
+
+    def remove(self, run_identifier):
+        self.redis.delete(self._key(run_identifier))
+        self.cache.invalidate(lambda key: key[0] == run_identifier)
+
+
+source_definitions = SourceDefinitionRegistry(
+    settings.SOURCE_DEFINITION_CACHE_SIZE)
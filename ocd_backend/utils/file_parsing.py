@@ -1,13 +1,46 @@
-import tempfile
 import magic
 from urllib2 import HTTPError
 
 import pdfparser.poppler as pdf
 import tika.parser as parser
 
+from ocd_backend import settings
+from ocd_backend.log import get_source_logger
+from ocd_backend.utils.http_cache import download_store
+from ocd_backend.utils.parallel_pdf import parallel_convert
+from ocd_backend.utils.text_cache import text_cache
+
+log = get_source_logger('file_parser')
+
+
+def poppler_page_count(fname):
+    return pdf.Document(fname).no_of_pages
+
+
+def poppler_pages_text(fname, first, last):
+    """Returns the text of pages `first` up to `last` (0-based, exclusive)
+    of a PDF file. Only these pages are read, so the ranges of a file can
+    be extracted at the same time."""
+    text_array = []
+    d = pdf.Document(fname)
+    for i in xrange(first, min(last, d.no_of_pages)):
+        p = d.get_page(i)
+        for f in p:
+            for b in f:
+                for l in b:
+                    text_array.append(l.text.encode('UTF-8'))
+    return '\n'.join(text_array)
+
 
 def file_parser(fname, pages=None):
     if magic.from_file(fname, mime=True) == 'application/pdf':
+        if settings.PDF_EXTRACTION_WORKERS > 1:
+            try:
+                return parallel_convert(fname, pages, 'poppler')
+            except Exception as e:
+                log.warning('Parallel extraction of %s failed, extracting '
+                            'it in a single process: %s' % (fname, e))
+
         try:
             text_array = []
             d = pdf.Document(fname)
@@ -53,17 +86,17 @@ class FileToTextMixin(object):
 
     def file_download(self, url):
         """
-        Downloads a given url to a tempfile.
+        Downloads a given url to a temporary file, or to a local copy that
+        is reused when the file has not been modified since the previous
+        download (see :class:`~ocd_backend.utils.http_cache.DownloadStore`).
         """
 
         print "Downloading %s" % (url,)
         try:
             # GO has no wildcard domain for SSL
-            r = self.http_session.get(url, verify=False)
-            tf = tempfile.NamedTemporaryFile()
-            tf.write(r.content)
-            tf.seek(0)
-            return tf
+            _, _, f = download_store.fetch(self.http_session, url,
+                                           verify=False)
+            return f
         except HTTPError as e:
             print "Something went wrong downloading %s" % (url,)
         except Exception as e:
@@ -75,7 +108,7 @@ class FileToTextMixin(object):
         """
 
         try:
-            content = file_parser(path, max_pages)
+            content = text_cache.extract(file_parser, path, max_pages)
             text = self.file_clean_text(content.decode('utf-8'))
             return unicode(text)
         except AttributeError:
@@ -0,0 +1,57 @@
+from hashlib import sha1
+
+
+def fingerprint(content_type, data):
+    """Returns the SHA-1 of an extracted item, as it is yielded by an
+    extractor and stored in the ``source_data`` of a document."""
+    if isinstance(data, unicode):
+        data = data.encode('utf-8')
+    return sha1('%s\0%s' % (content_type, data)).hexdigest()
+
+
+class FingerprintIndex(object):
+    """Keeps the fingerprints of the items that have been loaded into an
+    index, so items that did not change since they were loaded can be
+    skipped.
+
+    For each index, two Redis hashes are kept: one that maps fingerprints
+    to object ids, used to check whether an item is unchanged, and one
+    that maps object ids to fingerprints, used to remove the fingerprint
+    of the previous version of an item.
+    """
+
+    @property
+    def redis(self):
+        from ocd_backend import celery_app
+        return celery_app.backend.client
+
+    @staticmethod
+    def _keys(index_name):
+        return ('%s_fingerprints' % index_name,
+                '%s_fingerprint_ids' % index_name)
+
+    def contains(self, index_name, item_fingerprint):
+        """Returns whether an item with `item_fingerprint` has been loaded
+        into `index_name`."""
+        fingerprints, _ = self._keys(index_name)
+        return self.redis.hexists(fingerprints, item_fingerprint)
+
+    def add(self, index_name, object_id, item_fingerprint):
+        """Records that the item with `object_id` and `item_fingerprint`
+        has been loaded into `index_name`."""
+        fingerprints, fingerprint_ids = self._keys(index_name)
+
+        previous = self.redis.hget(fingerprint_ids, object_id)
+        pipe = self.redis.pipeline()
+        if previous and previous != item_fingerprint:
+            pipe.hdel(fingerprints, previous)
+        pipe.hset(fingerprints, item_fingerprint, object_id)
+        pipe.hset(fingerprint_ids, object_id, item_fingerprint)
+        pipe.execute()
+
+    def remove(self, index_name):
+        """Removes all fingerprints of `index_name`."""
+        self.redis.delete(*self._keys(index_name))
+
+
+fingerprint_index = FingerprintIndex()
@@ -0,0 +1,260 @@
+import json
+import os
+from hashlib import sha1
+from tempfile import NamedTemporaryFile
+
+from ocd_backend import settings
+from ocd_backend.log import get_source_logger
+
+log = get_source_logger('http_cache')
+
+
+class DownloadStore(object):
+    """Keeps local copies of downloaded files, together with the HTTP
+    validators (``ETag`` and ``Last-Modified``), the SHA-1 and the size
+    of each copy.
+
+    When a URL is fetched again, the validators are sent along as
+    ``If-None-Match`` and ``If-Modified-Since`` headers. If the server
+    responds with ``304 Not Modified``, the local copy is used instead of
+    downloading the file again.
+
+    Local copies are named after the SHA-1 of their URL, the validators
+    are stored as JSON in the ``.validators`` directory next to them.
+    Files without validators can't be revalidated, so they are fetched to
+    a temporary file instead, unless `keep_all` is set. When the total
+    size of the local copies exceeds `max_size` bytes, the least recently
+    used copies are removed.
+
+    :param files_dir: the directory to store the local copies in.
+    :type files_dir: str
+    :param max_size: the maximum size of the local copies in bytes, or
+        ``None`` to keep all copies.
+    :type max_size: int
+    :param keep_all: whether to keep a local copy of files without
+        validators as well.
+    :type keep_all: bool
+    """
+
+    chunk_size = 512 * 1024
+
+    def __init__(self, files_dir, max_size=None, keep_all=False):
+        self.files_dir = files_dir
+        self.validators_dir = os.path.join(files_dir, '.validators')
+        self.max_size = max_size
+        self.keep_all = keep_all
+
+        # Determined on the first write, see :meth:`_add_size`
+        self.size = None
+
+    def file_path(self, url):
+        return os.path.join(self.files_dir, sha1(url).hexdigest())
+
+    def _validators_path(self, url):
+        return os.path.join(self.validators_dir,
+                            '%s.json' % sha1(url).hexdigest())
+
+    @staticmethod
+    def _makedirs(path):
+        if not os.path.exists(path):
+            try:
+                os.makedirs(path)
+            except OSError:  # Guard against race condition
+                pass
+
+    def get_validators(self, url):
+        """Returns the stored validators of `url`, or ``None`` if there is
+        no (complete) local copy of it."""
+        try:
+            with open(self._validators_path(url), 'rb') as f:
+                validators = json.load(f)
+        except (IOError, ValueError):
+            return
+
+        # The local copy might have been removed or overwritten
+        try:
+            if os.path.getsize(self.file_path(url)) != validators['size']:
+                return
+        except OSError:
+            return
+
+        return validators
+
+    def set_validators(self, url, validators):
+        self._makedirs(self.validators_dir)
+
+        with NamedTemporaryFile(dir=self.validators_dir, prefix='.tmp_',
+                                delete=False) as f:
+            json.dump(validators, f)
+        os.rename(f.name, self._validators_path(url))
+
+    def remove_validators(self, url):
+        try:
+            os.remove(self._validators_path(url))
+        except OSError:
+            pass
+
+    def remove(self, url):
+        """Removes the local copy of `url` and its validators."""
+        self.remove_validators(url)
+        try:
+            os.remove(self.file_path(url))
+        except OSError:
+            pass
+
+    def _entries(self):
+        try:
+            names = os.listdir(self.files_dir)
+        except OSError:
+            return
+
+        for name in names:
+            path = os.path.join(self.files_dir, name)
+            if name.startswith('.') or not os.path.isfile(path):
+                continue
+
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            yield stat.st_mtime, stat.st_size, name
+
+    def _add_size(self, size):
+        if self.max_size is None:
+            return
+
+        if self.size is None:
+            self.size = sum(size for _, size, _ in self._entries())
+        else:
+            self.size += size
+
+        if self.size > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """Removes the least recently used local copies until their total
+        size is below 90% of the maximum size."""
+        entries = sorted(self._entries())
+        self.size = sum(size for _, size, _ in entries)
+
+        target_size = self.max_size * 0.9
+        removed = 0
+        for _, size, name in entries:
+            if self.size <= target_size:
+                break
+            try:
+                os.remove(os.path.join(self.files_dir, name))
+            except OSError:
+                continue
+            try:
+                os.remove(os.path.join(self.validators_dir,
+                                       '%s.json' % name))
+            except OSError:
+                pass
+            self.size -= size
+            removed += 1
+
+        log.debug('Evicted %d local copies from %s' % (removed,
+                                                       self.files_dir))
+
+    def _write(self, http_resp, f):
+        """Writes the content of `http_resp` to `f`, and returns its SHA-1
+        and size."""
+        checksum = sha1()
+        size = 0
+        for chunk in http_resp.iter_content(chunk_size=self.chunk_size):
+            if chunk:  # filter out keep-alive chunks
+                f.write(chunk)
+                checksum.update(chunk)
+                size += len(chunk)
+        return checksum.hexdigest(), size
+
+    @staticmethod
+    def conditional_headers(validators):
+        headers = {}
+        if validators and validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators and validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def fetch(self, http_session, url, **kwargs):
+        """Fetches `url` using `http_session`, unless the local copy is
+        still up-to-date.
+
+        :param http_session: the :class:`requests.Session` to use.
+        :param url: the URL of the file.
+        :type url: str
+        :param kwargs: additional arguments for ``http_session.get``.
+        :returns: a tuple with the ``content-type``, the size in bytes and
+            a file object of the local copy, opened for reading.
+        """
+        validators = self.get_validators(url)
+        headers = self.conditional_headers(validators)
+
+        http_resp = http_session.get(url, stream=True, headers=headers,
+                                     **kwargs)
+
+        if headers and http_resp.status_code == 304:
+            http_resp.close()
+            log.debug('Using local copy of %s, not modified' % url)
+
+            # Mark the local copy as recently used
+            try:
+                os.utime(self.file_path(url), None)
+            except OSError:
+                pass
+
+            return (
+                validators['content_type'],
+                validators['size'],
+                open(self.file_path(url), 'rb')
+            )
+
+        http_resp.raise_for_status()
+
+        etag = http_resp.headers.get('etag')
+        last_modified = http_resp.headers.get('last-modified')
+        if not (etag or last_modified or self.keep_all):
+            # The file can't be revalidated, so there is no use in keeping
+            # a local copy of it
+            self.remove(url)
+            f = NamedTemporaryFile(prefix='ocd_d_')
+            _, size = self._write(http_resp, f)
+            f.seek(0)
+            log.debug('Fetched %s [%s bytes]' % (url, size))
+            return http_resp.headers.get('content-type'), size, f
+
+        self._makedirs(self.files_dir)
+
+        # Write to a temporary file first, so a failed download never
+        # replaces a complete local copy
+        with NamedTemporaryFile(dir=self.files_dir, prefix='.tmp_',
+                                delete=False) as f:
+            checksum, size = self._write(http_resp, f)
+        os.rename(f.name, self.file_path(url))
+
+        if etag or last_modified:
+            self.set_validators(url, {
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'content_type': http_resp.headers.get('content-type'),
+                'sha1': checksum,
+                'size': size,
+            })
+        else:
+            self.remove_validators(url)
+
+        log.debug('Fetched %s [%s bytes]' % (url, size))
+        self._add_size(size)
+
+        return (
+            http_resp.headers.get('content-type'),
+            size,
+            open(self.file_path(url), 'rb')
+        )
+
+
+download_store = DownloadStore(settings.DOWNLOADS_DIR_PATH,
+                               settings.DOWNLOADS_MAX_SIZE)
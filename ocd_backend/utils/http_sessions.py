@@ -0,0 +1,151 @@
+from threading import Lock
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ocd_backend.log import get_source_logger
+from ocd_backend.settings import USER_AGENT
+
+log = get_source_logger('http_sessions')
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """An :class:`HTTPAdapter` that counts its requests, so the size of its
+    connection pools can be compared to the actual concurrency.
+
+    A request is active while it is being sent, which for streamed
+    responses does not include reading the body.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.counter_lock = Lock()
+        self.requests = 0
+        self.active = 0
+        self.peak_active = 0
+        super(CountingHTTPAdapter, self).__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        with self.counter_lock:
+            self.requests += 1
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+
+        try:
+            return super(CountingHTTPAdapter, self).send(request, **kwargs)
+        finally:
+            with self.counter_lock:
+                self.active -= 1
+
+    def pool_stats(self):
+        """Returns the request counters and, for each host, the number of
+        connections that have been opened and that are currently idle."""
+        hosts = {}
+        for key in self.poolmanager.pools.keys():
+            pool = self.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            hosts[pool.host] = {
+                'connections': pool.num_connections,
+                'idle': pool.pool.qsize() if pool.pool else 0
+            }
+
+        with self.counter_lock:
+            return {
+                'requests': self.requests,
+                'active': self.active,
+                'peak_active': self.peak_active,
+                'pool_connections': self._pool_connections,
+                'pool_maxsize': self._pool_maxsize,
+                'hosts': hosts
+            }
+
+
+def create_session(session_class=requests.Session, max_retries=0,
+                   pool_connections=10, pool_maxsize=10, pool_block=False):
+    """Returns a new session of `session_class`, with a
+    :class:`CountingHTTPAdapter` mounted for both HTTP and HTTPS.
+
+    :param max_retries: the number of retries or a
+                        :class:`~requests.packages.urllib3.util.retry.Retry`
+                        object.
+    :param pool_connections: the number of hosts to keep a connection pool
+                             for.
+    :type pool_connections: int
+    :param pool_maxsize: the number of connections to keep open per host.
+    :type pool_maxsize: int
+    :param pool_block: if set, at most `pool_maxsize` requests are made to
+                       a host at the same time.
+    :type pool_block: bool
+    """
+    session = session_class()
+    session.headers['User-Agent'] = USER_AGENT
+
+    for prefix in ('http://', 'https://'):
+        session.mount(prefix, CountingHTTPAdapter(
+            max_retries=max_retries, pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize, pool_block=pool_block))
+
+    return session
+
+
+class SessionRegistry(object):
+    """Keeps one :class:`requests.Session` per key for the lifetime of the
+    process, so connections are reused by all tasks and objects that use
+    the same key.
+
+    Sessions are shared between threads, so their headers should only be
+    changed in ways that are the same for every user of a key (e.g.
+    authentication for a source).
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.sessions = {}
+
+    def get(self, key, **options):
+        """Returns the session for `key`, which is created by
+        :func:`create_session` with `options` if it does not exist yet."""
+        with self.lock:
+            if key not in self.sessions:
+                log.debug('Creating HTTP session %s' % (key,))
+                self.sessions[key] = create_session(**options)
+            return self.sessions[key]
+
+    def stats(self):
+        """Returns the pool statistics of the adapters of each session, by
+        key and URL prefix."""
+        with self.lock:
+            sessions = self.sessions.items()
+
+        stats = {}
+        for key, session in sessions:
+            stats[key] = {
+                prefix: adapter.pool_stats()
+                for prefix, adapter in session.adapters.items()
+                if isinstance(adapter, CountingHTTPAdapter)
+            }
+        return stats
+
+    def log_stats(self):
+        for key, adapters in self.stats().items():
+            for prefix, stats in adapters.items():
+                if not stats['requests']:
+                    continue
+                log.info(
+                    'HTTP session %s (%s): %d requests, at most %d active, '
+                    '%d hosts, pool size %d, connections opened %s' % (
+                        key, prefix, stats['requests'], stats['peak_active'],
+                        len(stats['hosts']), stats['pool_maxsize'],
+                        sum(h['connections']
+                            for h in stats['hosts'].values())))
+
+    def close(self):
+        """Closes and forgets all sessions."""
+        with self.lock:
+            sessions, self.sessions = self.sessions, {}
+
+        for session in sessions.values():
+            session.close()
+
+
+http_sessions = SessionRegistry()
@@ -1,8 +1,15 @@
 import re
 import datetime
+import json
 
 from pprint import pprint
 
+from ocd_backend import settings
+from ocd_backend.log import get_source_logger
+from ocd_backend.utils.cache import TTLCache
+
+log = get_source_logger('ibabs')
+
 
 def _ibabs_to_dict(o, fields, excludes=[]):
     """
@@ -161,3 +168,87 @@ def list_entry_response_to_dict(m):
             unicode(y.Key): unicode(y.Value) if y.Value is not None else None for y in x[0]}
     }
     return _ibabs_to_dict(m, fields)
+
+
+class MeetingTypeRegistry(object):
+    """Keeps the meeting types of iBabs sites, so they are fetched with
+    ``GetMeetingtypes`` only once per site instead of once per extracted
+    interval, and are shared by all iBabs extractors in the process.
+
+    Meeting types are kept in memory for `ttl` seconds, or until
+    :meth:`invalidate` is called at the end of a run. When `use_redis` is
+    set, they are also stored in Redis for `ttl` seconds, so they are
+    shared by all worker processes.
+
+    :param ttl: the number of seconds the meeting types stay valid.
+    :type ttl: int
+    :param use_redis: whether to store meeting types in Redis.
+    :type use_redis: bool
+    """
+
+    redis_key = 'ibabs_meetingtypes_%s'
+
+    def __init__(self, ttl=3600, use_redis=False):
+        self.ttl = ttl
+        self.use_redis = use_redis
+        self.cache = TTLCache(maxsize=1024, ttl=ttl)
+
+    @property
+    def redis(self):
+        from ocd_backend import celery_app
+        return celery_app.backend.client
+
+    def get(self, client, sitename):
+        """Returns the meeting types of `sitename` as a list of dicts (see
+        :func:`meeting_type_to_dict`, with an extra ``Description``), or
+        ``None`` if the SOAP service returned an error.
+
+        :param client: the suds client used if the meeting types are not
+                       cached.
+        """
+        meeting_types = self.cache.get(sitename)
+        if meeting_types is not None:
+            return meeting_types
+
+        if self.use_redis:
+            cached = self.redis.get(self.redis_key % sitename)
+            if cached is not None:
+                meeting_types = json.loads(cached)
+
+        if meeting_types is None:
+            response = client.service.GetMeetingtypes(sitename)
+            if not response.Meetingtypes:
+                log.warn('SOAP service error for %s: %s' % (
+                    sitename, response.Message))
+                return None
+
+            meeting_types = []
+            for mt in response.Meetingtypes[0]:
+                meeting_type = meeting_type_to_dict(mt)
+                meeting_type['Description'] = mt.Description
+                meeting_types.append(meeting_type)
+
+            if self.use_redis:
+                self.redis.setex(self.redis_key % sitename, self.ttl,
+                                 json.dumps(meeting_types))
+
+        self.cache.set(sitename, meeting_types)
+        return meeting_types
+
+    def as_dict(self, client, sitename):
+        """Returns the descriptions of the meeting types of `sitename` by
+        meeting type id."""
+        return {mt['Id']: mt['Description']
+                for mt in self.get(client, sitename) or []}
+
+    def invalidate(self, sitename=None):
+        """Removes the meeting types of `sitename`, or of all sites, from
+        memory."""
+        if sitename is None:
+            self.cache.invalidate()
+        else:
+            self.cache.invalidate(lambda key: key == sitename)
+
+
+meeting_type_registry = MeetingTypeRegistry(settings.IBABS_MEETING_TYPES_TTL,
+                                    settings.IBABS_MEETING_TYPES_REDIS)
@@ -0,0 +1,72 @@
+import os
+import sqlite3
+import tempfile
+from itertools import groupby
+
+
+class JoinTable(object):
+    """Groups the items of several datasets by key in a temporary SQLite
+    database, so items can be matched without keeping the datasets in
+    memory.
+
+    A group is complete, and removed from the table, as soon as it has
+    an item of each dataset.
+
+    :param datasets: the ids of the datasets.
+    :type datasets: list
+    :param directory: the directory to create the database in.
+    :type directory: str
+    """
+
+    def __init__(self, datasets, directory=None):
+        self.datasets = set(datasets)
+
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        fd, self.path = tempfile.mkstemp(prefix='ocd_join_',
+                                         suffix='.sqlite', dir=directory)
+        os.close(fd)
+
+        self.db = sqlite3.connect(self.path)
+        # The database is thrown away afterwards, so it does not have to
+        # survive a crash
+        self.db.execute('PRAGMA journal_mode = OFF')
+        self.db.execute('PRAGMA synchronous = OFF')
+        self.db.execute('CREATE TABLE items (key TEXT, dataset TEXT, '
+                        'content_type TEXT, data BLOB, '
+                        'PRIMARY KEY (key, dataset))')
+
+    @staticmethod
+    def _group(rows):
+        return {dataset: (content_type,
+                          str(data) if isinstance(data, buffer) else data)
+                for dataset, content_type, data in rows}
+
+    def add(self, key, dataset, content_type, data):
+        """Adds an item of `dataset`, replacing an earlier item with the
+        same key. Returns the group of `key` as a dict of ``(content_type,
+        data)`` tuples by dataset if it is complete, or ``None``."""
+        if isinstance(data, str):
+            data = sqlite3.Binary(data)
+
+        self.db.execute('INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?)',
+                        (key, dataset, content_type, data))
+
+        rows = self.db.execute('SELECT dataset, content_type, data '
+                               'FROM items WHERE key = ?', (key,)).fetchall()
+        if len(rows) < len(self.datasets):
+            return None
+
+        self.db.execute('DELETE FROM items WHERE key = ?', (key,))
+        return self._group(rows)
+
+    def remaining(self):
+        """Yields the groups that are not complete."""
+        rows = self.db.execute('SELECT key, dataset, content_type, data '
+                               'FROM items ORDER BY key')
+        for _, group_rows in groupby(rows, lambda row: row[0]):
+            yield self._group(row[1:] for row in group_rows)
+
+    def close(self):
+        self.db.close()
+        os.remove(self.path)
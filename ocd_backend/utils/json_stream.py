@@ -0,0 +1,128 @@
+"""Incremental parsing of large JSON arrays.
+
+Only the elements of the array are decoded, one at a time, so memory use
+is bounded by the size of the largest element instead of the size of the
+whole document.
+"""
+import codecs
+import json
+
+WHITESPACE = ' \t\n\r'
+
+
+class JSONStreamReader(object):
+    """Reads JSON values from an iterable of (byte string) chunks, such as
+    the one returned by :meth:`requests.Response.iter_content`."""
+
+    def __init__(self, chunks, encoding='utf-8'):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.json_decoder = json.JSONDecoder()
+        self.buffer = u''
+        self.pos = 0
+        self.exhausted = False
+
+    def _fill(self):
+        """Appends the next chunk to the buffer. Returns False if there is
+        no more data."""
+        if self.exhausted:
+            return False
+
+        # Discard the consumed part of the buffer
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+
+        try:
+            chunk = next(self.chunks)
+        except StopIteration:
+            self.exhausted = True
+            self.buffer += self.decoder.decode('', final=True)
+            return False
+
+        self.buffer += self.decoder.decode(chunk)
+        return True
+
+    def peek(self):
+        """Returns the next non-whitespace character without consuming it,
+        or ``None`` at the end of the stream."""
+        while True:
+            while self.pos < len(self.buffer):
+                if self.buffer[self.pos] not in WHITESPACE:
+                    return self.buffer[self.pos]
+                self.pos += 1
+
+            if not self._fill():
+                return None
+
+    def expect(self, char):
+        """Consumes the next non-whitespace character, which must be
+        `char`."""
+        found = self.peek()
+        if found != char:
+            raise ValueError('Expected %r in JSON stream, found %r' % (
+                char, found))
+        self.pos += 1
+
+    def value(self):
+        """Decodes and consumes the next JSON value."""
+        self.peek()
+        while True:
+            # A value at the very end of the buffer may be truncated (i.e.
+            # a number), so it is only accepted when followed by another
+            # character or the end of the stream
+            if self.pos < len(self.buffer):
+                try:
+                    value, end = self.json_decoder.raw_decode(self.buffer,
+                                                              self.pos)
+                    if end < len(self.buffer) or self.exhausted:
+                        self.pos = end
+                        return value
+                except ValueError:
+                    if self.exhausted:
+                        raise
+
+            # Read at least as much data as is currently buffered before
+            # trying again, so large values are not decoded over and over
+            required = 2 * (len(self.buffer) - self.pos)
+            while self._fill() and len(self.buffer) - self.pos < required:
+                pass
+
+            if self.exhausted and self.pos >= len(self.buffer):
+                raise ValueError('Unexpected end of JSON stream')
+
+
+def iter_json_array(chunks, key=None):
+    """Yields the elements of the JSON array in the stream of `chunks`.
+
+    :param key: if given, the document is an object and the array is the
+                value of its member `key` (e.g. ``value`` for OData
+                feeds). Other members of the object are skipped.
+    """
+    reader = JSONStreamReader(chunks)
+
+    if key is not None:
+        reader.expect('{')
+        while True:
+            if reader.peek() == '}':
+                return
+
+            member = reader.value()
+            reader.expect(':')
+            if member == key:
+                break
+
+            reader.value()
+            if reader.peek() == ',':
+                reader.expect(',')
+
+    reader.expect('[')
+    if reader.peek() == ']':
+        return
+
+    while True:
+        yield reader.value()
+
+        if reader.peek() == ']':
+            return
+        reader.expect(',')
@@ -2,8 +2,10 @@ import datetime
 import glob
 import json
 import re
+import threading
 import translitcodec
 from lxml import etree
+from multiprocessing.pool import ThreadPool
 from string import Formatter
 
 from ocd_backend.exceptions import MissingTemplateTag
@@ -184,14 +186,26 @@ def load_sources_config(path):
     return result
 
 
+# The objects loaded by load_object, by path
+_loaded_objects = {}
+
+
 def load_object(path):
     """Load an object given it's absolute object path, and return it.
 
     The object can be a class, function, variable or instance.
 
+    Loaded objects are cached, so tasks can look up their classes for each
+    item.
+
     :param path: absolute object path (i.e. 'ocd_backend.extractor.BaseExtractor')
     :type path: str.
     """
+    try:
+        return _loaded_objects[path]
+    except KeyError:
+        pass
+
     try:
         dot = path.rindex('.')
     except ValueError:
@@ -209,6 +223,7 @@ def load_object(path):
         raise NameError, "Module '%s' doesn't define any object named '%s'" % (
             module, name)
 
+    _loaded_objects[path] = obj
     return obj
 
 
@@ -285,33 +300,46 @@ def slugify(text, delim=u'-'):
     return unicode(delim.join(result))
 
 
+# Copies an XML document, leaving out the namespaces of its elements and
+# attributes
+STRIP_NAMESPACES_XSLT = '''
+<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
+<xsl:output method="xml" indent="no"/>
+
+<xsl:template match="/|comment()|processing-instruction()">
+    <xsl:copy>
+      <xsl:apply-templates/>
+    </xsl:copy>
+</xsl:template>
+
+<xsl:template match="*">
+    <xsl:element name="{local-name()}">
+      <xsl:apply-templates select="@*|node()"/>
+    </xsl:element>
+</xsl:template>
+
+<xsl:template match="@*">
+    <xsl:attribute name="{local-name()}">
+      <xsl:value-of select="."/>
+    </xsl:attribute>
+</xsl:template>
+</xsl:stylesheet>
+'''
+
+# The compiled stylesheets of the threads that strip namespaces
+_strip_namespaces_local = threading.local()
+
+
 def strip_namespaces(item):
-    xslt = '''
-    <xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
-    <xsl:output method="xml" indent="no"/>
-
-    <xsl:template match="/|comment()|processing-instruction()">
-        <xsl:copy>
-          <xsl:apply-templates/>
-        </xsl:copy>
-    </xsl:template>
-
-    <xsl:template match="*">
-        <xsl:element name="{local-name()}">
-          <xsl:apply-templates select="@*|node()"/>
-        </xsl:element>
-    </xsl:template>
-
-    <xsl:template match="@*">
-        <xsl:attribute name="{local-name()}">
-          <xsl:value-of select="."/>
-        </xsl:attribute>
-    </xsl:template>
-    </xsl:stylesheet>
-    '''
-
-    xslt_root = etree.XML(xslt)
-    transform = etree.XSLT(xslt_root)
+    """Returns a copy of the XML document `item` without namespaces.
+
+    The stylesheet is compiled once per thread, as sharing a compiled
+    stylesheet between threads is not safe in all versions of lxml.
+    """
+    transform = getattr(_strip_namespaces_local, 'transform', None)
+    if transform is None:
+        transform = etree.XSLT(etree.XML(STRIP_NAMESPACES_XSLT))
+        _strip_namespaces_local.transform = transform
 
     return transform(item)
 
@@ -340,6 +368,46 @@ def get_secret(item_id):
                           "secrets.py" % item_id)
 
 
+def batches(iterable, size):
+    """Splits an iterable into lists of at most `size` elements.
+
+    :param iterable: the iterable (i.e. a generator) to split.
+    :param size: the maximum number of elements in a batch.
+    :type size: int.
+    """
+    batch = []
+    for element in iterable:
+        batch.append(element)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def concurrent_map(func, iterable, concurrency):
+    """Calls `func` for each element of `iterable` using up to `concurrency`
+    threads, and yields the results in the order of `iterable`. Exceptions
+    raised by `func` are raised when their result is reached.
+
+    :param concurrency: the maximum number of threads; when 1, `func` is
+        called in the current thread.
+    :type concurrency: int.
+    """
+    if concurrency <= 1:
+        for element in iterable:
+            yield func(element)
+        return
+
+    pool = ThreadPool(concurrency)
+    try:
+        for result in pool.imap(func, iterable):
+            yield result
+    finally:
+        pool.terminate()
+
+
 def propagate_chain_get(terminal_node, timeout=None):
     for node in reversed(list(terminal_node._parents())):
         try:
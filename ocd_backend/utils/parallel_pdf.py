@@ -0,0 +1,125 @@
+"""Parallel, page-level text extraction of PDF files.
+
+Celery workers are daemonic processes, which are not allowed to start a
+:mod:`multiprocessing` pool. Instead, each range of pages is extracted by
+a separate Python process running this module::
+
+    python -m ocd_backend.utils.parallel_pdf <engine> <file> <first> <last>
+
+which writes the text of pages ``first`` up to ``last`` (0-based,
+exclusive) to stdout.
+"""
+import os
+import subprocess
+import sys
+from tempfile import TemporaryFile
+
+from ocd_backend import settings
+from ocd_backend.log import get_source_logger
+
+log = get_source_logger('parallel_pdf')
+
+#: Separator used to join the text of page ranges, per engine
+SEPARATORS = {
+    'poppler': '\n',
+    'pdfminer': '',
+}
+
+
+def _engine_functions(engine):
+    """Returns the page count and page range extraction functions of an
+    engine. Imported lazily, as each engine depends on another PDF
+    library."""
+    if engine == 'poppler':
+        from ocd_backend.utils.file_parsing import (poppler_page_count,
+                                                    poppler_pages_text)
+        return poppler_page_count, poppler_pages_text
+    elif engine == 'pdfminer':
+        from ocd_backend.utils.pdf import pdfminer_page_count, convert
+
+        def pdfminer_pages_text(fname, first, last):
+            return convert(fname, range(first, last))
+
+        return pdfminer_page_count, pdfminer_pages_text
+
+    raise ValueError('Unknown PDF extraction engine %s' % engine)
+
+
+def page_ranges(num_pages, workers, min_pages):
+    """Splits `num_pages` pages into at most `workers` contiguous
+    ``(first, last)`` ranges of at least `min_pages` pages each."""
+    if num_pages < 1:
+        return []
+
+    num_ranges = max(1, min(workers, num_pages // max(min_pages, 1)))
+    size, remainder = divmod(num_pages, num_ranges)
+
+    ranges = []
+    first = 0
+    for i in range(num_ranges):
+        last = first + size + (1 if i < remainder else 0)
+        ranges.append((first, last))
+        first = last
+    return ranges
+
+
+def parallel_convert(fname, max_pages=0, engine='poppler',
+                     workers=settings.PDF_EXTRACTION_WORKERS,
+                     min_pages=settings.PDF_PAGES_PER_WORKER):
+    """Extracts the text of the first `max_pages` pages (or all pages if
+    `max_pages` is 0 or ``None``) of a PDF file, using up to `workers`
+    processes. The text of the page ranges is reassembled in page order.
+
+    :returns: the text as an UTF-8 encoded string.
+    """
+    page_count, pages_text = _engine_functions(engine)
+
+    num_pages = page_count(fname)
+    if max_pages and max_pages < num_pages:
+        num_pages = max_pages
+
+    ranges = page_ranges(num_pages, workers, min_pages)
+    if len(ranges) <= 1:
+        return pages_text(fname, 0, num_pages)
+
+    # Output is written to temporary files instead of pipes, so processes
+    # never block on a full pipe buffer
+    cwd = os.path.dirname(settings.ROOT_PATH)
+    processes = []
+    for first, last in ranges:
+        output = TemporaryFile()
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'ocd_backend.utils.parallel_pdf', engine,
+             fname, str(first), str(last)], stdout=output, cwd=cwd)
+        processes.append((process, output, first, last))
+
+    texts = []
+    try:
+        for process, output, first, last in processes:
+            if process.wait() != 0:
+                raise RuntimeError('Extracting pages %d-%d of %s failed with '
+                                   'exit code %d' % (first, last, fname,
+                                                     process.returncode))
+            output.seek(0)
+            texts.append(output.read())
+    finally:
+        for process, output, _, _ in processes:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            output.close()
+
+    log.debug('Extracted %d pages of %s using %d processes' % (
+        num_pages, fname, len(ranges)))
+
+    return SEPARATORS[engine].join(texts)
+
+
+if __name__ == '__main__':
+    engine, fname, first, last = sys.argv[1:5]
+    _, pages_text = _engine_functions(engine)
+
+    # The extraction functions print progress, which should not end up
+    # in the extracted text
+    stdout, sys.stdout = sys.stdout, sys.stderr
+    stdout.write(pages_text(fname, int(first), int(last)))
@@ -8,11 +8,19 @@ from urllib2 import HTTPError
 from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
 from pdfminer.converter import TextConverter
 from pdfminer.layout import LAParams
+from pdfminer.pdfdocument import PDFDocument
 from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
 
 import requests
 
 from ocd_backend import settings
+from ocd_backend.log import get_source_logger
+from ocd_backend.utils.parallel_pdf import parallel_convert
+from ocd_backend.utils.text_cache import text_cache
+
+log = get_source_logger('pdf')
 
 def convert(fname, pages=None):
     if not pages:
@@ -53,6 +61,27 @@ def convert(fname, pages=None):
     return text
 
 
+def pdfminer_page_count(fname):
+    with open(fname, 'rb') as infile:
+        document = PDFDocument(PDFParser(infile))
+        return resolve1(document.catalog['Pages'])['Count']
+
+
+def convert_max_pages(fname, max_pages=0):
+    """Converts the first `max_pages` pages of a PDF file to text, or all
+    pages if `max_pages` is 0."""
+    if settings.PDF_EXTRACTION_WORKERS > 1:
+        try:
+            return parallel_convert(fname, max_pages, 'pdfminer')
+        except Exception as e:
+            log.warning('Parallel extraction of %s failed, extracting it in '
+                        'a single process: %s' % (fname, e))
+
+    if max_pages > 0:
+        return convert(fname, range(0, max_pages))
+    return convert(fname)
+
+
 class PDFToTextMixin(object):
     """
     Interface for converting a PDF file into text format using pdftotext
@@ -95,9 +124,6 @@ class PDFToTextMixin(object):
         Method to convert a given PDF file into text file using a subprocess
         """
 
-        if max_pages > 0:
-            content = convert(path, range(0, max_pages))
-        else:
-            content = convert(path)
+        content = text_cache.extract(convert_max_pages, path, max_pages)
 
         return unicode(self.pdf_clean_text(content.decode('utf-8')))
@@ -0,0 +1,208 @@
+import time
+from email.utils import parsedate_tz, mktime_tz
+from threading import Lock
+from urlparse import urlparse
+
+import requests
+
+from ocd_backend import settings
+from ocd_backend.log import get_source_logger
+
+log = get_source_logger('rate_limit')
+
+
+class TokenBucket(object):
+    """Limits the number of calls per second, shared by all threads that use
+    the same bucket.
+
+    The bucket holds up to `burst` tokens and is refilled with `rate`
+    tokens per second. Each call takes a token, and waits for one if the
+    bucket is empty. With a `burst` of 1, calls are spaced evenly at
+    ``1 / rate`` seconds.
+
+    :param rate: the maximum number of calls per second, or ``None`` (or 0)
+                 for no limit.
+    :type rate: float
+    :param burst: the number of calls that can be made at once after the
+                  bucket has been idle.
+    :type burst: int
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.lock = Lock()
+        self.tokens = burst
+        self.updated = time.time()
+        self.blocked_until = 0
+
+    def reserve(self):
+        """Takes a token and returns the number of seconds to wait before
+        it may be used."""
+        with self.lock:
+            now = time.time()
+            delay = self.blocked_until - now
+
+            if self.rate:
+                self.tokens = min(self.burst, self.tokens +
+                                  (now - self.updated) * self.rate) - 1
+                delay = max(delay, -self.tokens / float(self.rate))
+            self.updated = now
+
+        return max(delay, 0)
+
+    def wait(self):
+        """Blocks until the next call is allowed."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def defer(self, seconds):
+        """Blocks all calls for `seconds` seconds, i.e. when a server sent a
+        ``Retry-After`` header."""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.time() + seconds)
+
+
+class RedisTokenBucket(TokenBucket):
+    """A :class:`TokenBucket` that is stored in Redis, so the limit is shared
+    by all worker processes.
+
+    :param key: the Redis key of the bucket.
+    :type key: str
+    """
+
+    reserve_script = """
+        local rate = tonumber(ARGV[1])
+        local burst = tonumber(ARGV[2])
+        local now = tonumber(ARGV[3])
+        local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated',
+                                 'blocked_until')
+        local tokens = tonumber(state[1]) or burst
+        local updated = tonumber(state[2]) or now
+        local blocked_until = tonumber(state[3]) or 0
+        local delay = blocked_until - now
+
+        if rate > 0 then
+            tokens = math.min(burst, tokens +
+                              math.max(now - updated, 0) * rate) - 1
+            delay = math.max(delay, -tokens / rate)
+        end
+
+        redis.call('HMSET', KEYS[1], 'tokens', tokens, 'updated', now,
+                   'blocked_until', blocked_until)
+        redis.call('EXPIRE', KEYS[1], 3600)
+        return tostring(math.max(delay, 0))
+    """
+
+    defer_script = """
+        local blocked_until = tonumber(
+            redis.call('HGET', KEYS[1], 'blocked_until')) or 0
+        if tonumber(ARGV[1]) > blocked_until then
+            redis.call('HSET', KEYS[1], 'blocked_until', ARGV[1])
+            redis.call('EXPIRE', KEYS[1], 3600)
+        end
+    """
+
+    def __init__(self, key, rate, burst=1):
+        super(RedisTokenBucket, self).__init__(rate, burst)
+        self.key = key
+
+    @property
+    def redis(self):
+        from ocd_backend import celery_app
+        return celery_app.backend.client
+
+    def reserve(self):
+        return float(self.redis.eval(self.reserve_script, 1, self.key,
+                                     self.rate or 0, self.burst, time.time()))
+
+    def defer(self, seconds):
+        self.redis.eval(self.defer_script, 1, self.key, time.time() + seconds)
+
+
+_rate_limiters = {}
+_rate_limiters_lock = Lock()
+
+
+def get_rate_limiter(key, rate, burst=1):
+    """Returns the process-wide rate limiter for `key` (e.g. an iBabs site
+    name), creating it with `rate` and `burst` if it does not exist yet."""
+    with _rate_limiters_lock:
+        if key not in _rate_limiters:
+            _rate_limiters[key] = TokenBucket(rate, burst)
+        return _rate_limiters[key]
+
+
+def get_host_limiter(host):
+    """Returns the rate limiter for requests to `host`, configured by
+    ``HTTP_RATE_LIMITS`` or ``HTTP_RATE_LIMIT``. When
+    ``HTTP_RATE_LIMIT_REDIS`` is set, the limit is shared by all workers.
+    """
+    key = u'host-%s' % host
+    with _rate_limiters_lock:
+        if key not in _rate_limiters:
+            # Without a limit, the bucket still blocks the host when it
+            # sends a 'Retry-After' header
+            rate, burst = settings.HTTP_RATE_LIMITS.get(
+                host, settings.HTTP_RATE_LIMIT) or (None, 1)
+            if settings.HTTP_RATE_LIMIT_REDIS:
+                _rate_limiters[key] = RedisTokenBucket(
+                    'rate_limit_%s' % host, rate, burst)
+            else:
+                _rate_limiters[key] = TokenBucket(rate, burst)
+        return _rate_limiters[key]
+
+
+def parse_retry_after(value):
+    """Returns the number of seconds in a ``Retry-After`` header, which is
+    either a number of seconds or a date, or ``None`` if it is invalid."""
+    if not value:
+        return None
+
+    try:
+        seconds = float(value)
+    except ValueError:
+        date = parsedate_tz(value)
+        if date is None:
+            return None
+        seconds = mktime_tz(date) - time.time()
+
+    return min(max(seconds, 0), settings.HTTP_RETRY_AFTER_MAX)
+
+
+class RateLimitedSession(requests.Session):
+    """A :class:`requests.Session` that waits for the rate limiter of the
+    host before each request.
+
+    A ``Retry-After`` header in a response blocks further requests to the
+    host for the given time. Responses with status ``429 Too Many
+    Requests`` are retried up to ``HTTP_RATE_LIMIT_RETRIES`` times, after
+    an exponential backoff when they have no ``Retry-After`` header.
+    """
+
+    def send(self, request, **kwargs):
+        limiter = get_host_limiter(urlparse(request.url).hostname)
+
+        attempt = 0
+        while True:
+            limiter.wait()
+            response = super(RateLimitedSession, self).send(request, **kwargs)
+
+            retry_after = parse_retry_after(
+                response.headers.get('Retry-After'))
+            if retry_after is None:
+                if response.status_code != 429:
+                    return response
+                retry_after = settings.HTTP_RATE_LIMIT_BACKOFF * 2 ** attempt
+
+            limiter.defer(retry_after)
+
+            if response.status_code != 429 or \
+                    attempt >= settings.HTTP_RATE_LIMIT_RETRIES:
+                return response
+
+            attempt += 1
+            log.info('Rate limited by %s, retrying in %s seconds' % (
+                request.url, retry_after))
+            response.close()
@@ -0,0 +1,142 @@
+"""Recording of extracted items to segment files, so they can be replayed
+through a pipeline without extracting them again.
+
+A recording is a directory with gzipped segment files, each holding up to
+a fixed number of pickled items, and an ``index.json`` that lists the
+segments and their number of items. The index is rewritten whenever a
+segment is completed, so the recording of a crashed process can still be
+replayed up to its last completed segment.
+"""
+import cPickle as pickle
+import gzip
+import json
+import os
+from datetime import datetime
+from tempfile import NamedTemporaryFile
+from uuid import uuid4
+
+from ocd_backend.exceptions import ConfigurationError
+from ocd_backend.log import get_source_logger
+
+log = get_source_logger('segments')
+
+INDEX_FILE = 'index.json'
+
+
+class SegmentWriter(object):
+    """Appends items to the segment files of a recording in `path`.
+
+    :param path: the directory of the recording, which is created.
+    :type path: str
+    :param segment_size: the number of items per segment.
+    :type segment_size: int
+    """
+
+    def __init__(self, path, segment_size=10000):
+        self.path = path
+        self.segment_size = segment_size
+        self.segments = []
+        self.segment = None
+        self.segment_items = 0
+
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+    def _write_index(self, complete):
+        # Write to a temporary file first, so the index is never left
+        # half-written
+        with NamedTemporaryFile(dir=self.path, prefix='.tmp_',
+                                delete=False) as f:
+            json.dump({'segments': self.segments, 'complete': complete}, f)
+        os.rename(f.name, os.path.join(self.path, INDEX_FILE))
+
+    def _close_segment(self):
+        if self.segment is None:
+            return
+
+        self.segment.close()
+        self.segments.append({
+            'name': os.path.basename(self.segment.name),
+            'items': self.segment_items
+        })
+        self.segment = None
+        self.segment_items = 0
+
+    def write(self, item):
+        if self.segment is None:
+            name = 'segment-%05d.pickle.gz' % len(self.segments)
+            self.segment = gzip.open(os.path.join(self.path, name), 'wb')
+
+        pickle.dump(item, self.segment, pickle.HIGHEST_PROTOCOL)
+        self.segment_items += 1
+
+        if self.segment_items >= self.segment_size:
+            self._close_segment()
+            self._write_index(complete=False)
+
+    def close(self, complete=True):
+        """Completes the last segment and the index. `complete` tells if
+        all items were recorded."""
+        self._close_segment()
+        self._write_index(complete)
+
+    def tee(self, items):
+        """Yields `items`, writing each to the recording. The recording is
+        only marked complete when all items have been consumed."""
+        complete = False
+        try:
+            for item in items:
+                self.write(item)
+                yield item
+            complete = True
+        finally:
+            self.close(complete)
+            log.info('Recorded %d items in %s' % (
+                sum(s['items'] for s in self.segments), self.path))
+
+
+def read_segments(path, start=0):
+    """Yields the items of the recording in `path`, starting at the item
+    with number `start`. Segments before `start` are skipped without
+    reading them."""
+    with open(os.path.join(path, INDEX_FILE)) as f:
+        index = json.load(f)
+
+    offset = 0
+    for segment in index['segments']:
+        if offset + segment['items'] <= start:
+            offset += segment['items']
+            continue
+
+        with gzip.open(os.path.join(path, segment['name']), 'rb') as f:
+            for _ in xrange(segment['items']):
+                item = pickle.load(f)
+                if offset >= start:
+                    yield item
+                offset += 1
+
+
+def new_recording_path(directory, name):
+    """Returns the path of a new recording of `name` in `directory`. The
+    recordings of a name sort by the time they were started, and runs that
+    start at the same time get a recording each."""
+    return os.path.join(directory, name, '%s_%s' % (
+        datetime.utcnow().strftime('%Y%m%d%H%M%S%f'), uuid4().hex[:8]))
+
+
+def latest_recording_path(directory, name):
+    """Returns the path of the latest complete recording of `name` in
+    `directory`."""
+    recordings_path = os.path.join(directory, name)
+    if os.path.isdir(recordings_path):
+        for recording in sorted(os.listdir(recordings_path), reverse=True):
+            path = os.path.join(recordings_path, recording)
+            try:
+                with open(os.path.join(path, INDEX_FILE)) as f:
+                    if json.load(f)['complete']:
+                        return path
+            except IOError:
+                continue
+
+    raise ConfigurationError('No complete recording of %s in %s' % (
+        name, directory))
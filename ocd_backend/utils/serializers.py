@@ -0,0 +1,124 @@
+"""A compact serializer for task messages, based on msgpack.
+
+Unlike plain msgpack, the serializer keeps tuples, byte strings and
+unicode strings apart, and supports dates and datetimes, so task
+arguments are decoded as they were sent. Messages larger than a threshold
+are compressed by the serializer itself, with zstd or lz4 when installed.
+The first byte of a message tells how it is compressed.
+"""
+import datetime
+import zlib
+
+import msgpack
+from dateutil.parser import parse
+
+from ocd_backend.exceptions import ConfigurationError
+
+try:
+    import lz4.frame as lz4
+except ImportError:
+    lz4 = None
+
+try:
+    import zstd
+except ImportError:
+    zstd = None
+
+# msgpack extension types
+EXT_TUPLE = 1
+EXT_DATETIME = 2
+EXT_DATE = 3
+
+#: The compressions by name, as (header byte, compress, decompress)
+COMPRESSIONS = {
+    None: ('\x00', None, None),
+    'zlib': ('\x01', lambda data: zlib.compress(data, 1), zlib.decompress),
+}
+if lz4:
+    COMPRESSIONS['lz4'] = ('\x02', lz4.compress, lz4.decompress)
+if zstd:
+    COMPRESSIONS['zstd'] = ('\x03', zstd.compress, zstd.decompress)
+
+_decompressors = {header: decompress
+                  for header, _, decompress in COMPRESSIONS.values()}
+
+
+def best_compression():
+    """Returns the name of the fastest installed compression."""
+    for name in ('zstd', 'lz4', 'zlib'):
+        if name in COMPRESSIONS:
+            return name
+
+
+def _default(obj):
+    if isinstance(obj, datetime.datetime):
+        return msgpack.ExtType(EXT_DATETIME, obj.isoformat())
+    if isinstance(obj, datetime.date):
+        return msgpack.ExtType(EXT_DATE, obj.isoformat())
+    raise TypeError('Can not serialize %r' % (obj,))
+
+
+def _mark_tuples(obj):
+    """Returns `obj` with its tuples replaced by extension types, which
+    msgpack would otherwise pack as lists."""
+    if isinstance(obj, dict):
+        return {key: _mark_tuples(value) for key, value in obj.iteritems()}
+    if isinstance(obj, list):
+        return [_mark_tuples(value) for value in obj]
+    if isinstance(obj, tuple):
+        return msgpack.ExtType(EXT_TUPLE, _pack(list(obj)))
+    return obj
+
+
+def _pack(obj):
+    return msgpack.packb(_mark_tuples(obj), default=_default,
+                         use_bin_type=True)
+
+
+def _ext_hook(code, data):
+    if code == EXT_TUPLE:
+        return tuple(_unpack(data))
+    if code == EXT_DATETIME:
+        return parse(data)
+    if code == EXT_DATE:
+        return parse(data).date()
+    return msgpack.ExtType(code, data)
+
+
+def _unpack(data):
+    return msgpack.unpackb(data, ext_hook=_ext_hook, encoding='utf-8')
+
+
+class MsgpackSerializer(object):
+    """Encodes and decodes task messages.
+
+    :param compression: the name of the compression to use for messages
+                        larger than `threshold` bytes, or ``None``.
+    :type compression: str
+    :param threshold: the size in bytes above which messages are
+                      compressed.
+    :type threshold: int
+    """
+
+    def __init__(self, compression='zlib', threshold=4096):
+        if compression not in COMPRESSIONS:
+            raise ConfigurationError('Compression %s is not available, use '
+                                     'one of %s' % (compression,
+                                                    COMPRESSIONS.keys()))
+        self.header, self.compress, _ = COMPRESSIONS[compression]
+        self.threshold = threshold
+
+    def dumps(self, obj):
+        data = _pack(obj)
+        if self.compress and len(data) > self.threshold:
+            return self.header + self.compress(data)
+        return '\x00' + data
+
+    def loads(self, data):
+        data = str(data)
+        decompress = _decompressors.get(data[0], False)
+        if decompress is False:
+            raise ValueError('Unknown compression of message')
+        if decompress is None:
+            return _unpack(data[1:])
+        return _unpack(decompress(data[1:]))
@@ -0,0 +1,61 @@
+from threading import Lock
+from time import time
+
+from suds.cache import ObjectCache
+from suds.client import Client
+
+from ocd_backend import settings
+from ocd_backend.log import get_source_logger
+
+log = get_source_logger('soap')
+
+
+class SoapClientFactory(object):
+    """Creates suds clients that share a parsed WSDL.
+
+    The first client for a WSDL is kept for the lifetime of the process (or
+    until it is older than `ttl` seconds), and every requested client is a
+    clone of it, which only shares the parsed WSDL and not the options.
+    The parsed WSDL is also pickled to `cache_dir`, so new processes do not
+    have to fetch and parse it again.
+
+    :param cache_dir: the directory to store parsed WSDLs in, or ``None``
+                      to only keep them in memory.
+    :type cache_dir: str
+    :param ttl: the number of seconds a parsed WSDL stays valid.
+    :type ttl: int
+    """
+
+    def __init__(self, cache_dir=None, ttl=86400):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+        self.lock = Lock()
+        self.clients = {}
+
+    def _create_client(self, wsdl):
+        if self.cache_dir:
+            cache = ObjectCache(self.cache_dir, seconds=self.ttl)
+        else:
+            cache = None
+
+        return Client(wsdl, cache=cache)
+
+    def get_client(self, wsdl, **options):
+        """Returns a client for `wsdl`, with the given suds `options` (e.g.
+        ``port``) set."""
+        with self.lock:
+            created, client = self.clients.get(wsdl, (None, None))
+            if client is None or created + self.ttl < time():
+                log.debug('Loading WSDL %s' % wsdl)
+                client = self._create_client(wsdl)
+                self.clients[wsdl] = (time(), client)
+
+        client = client.clone()
+        if options:
+            client.set_options(**options)
+        return client
+
+
+soap_clients = SoapClientFactory(settings.SOAP_WSDL_CACHE_DIR,
+                                 settings.SOAP_WSDL_CACHE_TTL)
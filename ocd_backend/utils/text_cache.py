@@ -0,0 +1,158 @@
+import os
+from hashlib import sha1
+from tempfile import NamedTemporaryFile
+
+from ocd_backend import settings
+from ocd_backend.log import get_source_logger
+
+log = get_source_logger('text_cache')
+
+
+class TextExtractionCache(object):
+    """An on-disk cache of the text extracted from files.
+
+    Entries are addressed by the SHA-1 of the file content, the name of
+    the extraction function and the maximum number of pages, so a
+    document that didn't change is only parsed once, regardless of the
+    URL it was downloaded from. When the total size of the cache exceeds
+    ``max_size`` bytes, the least recently used entries are removed.
+
+    :param cache_dir: the directory to store the extracted text in. The
+        cache is disabled when ``None``.
+    :type cache_dir: str
+    :param max_size: the maximum size of the cache in bytes.
+    :type max_size: int
+    """
+
+    def __init__(self, cache_dir, max_size):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+        # Determined on the first write, see :meth:`set`
+        self.size = None
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def checksum_file(path):
+        checksum = sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(32768), b''):
+                checksum.update(chunk)
+        return checksum.hexdigest()
+
+    def key(self, path, name, max_pages):
+        return '%s_%s_%s' % (self.checksum_file(path), name, max_pages)
+
+    def _entry_path(self, key):
+        # Use a two level directory structure to keep directories small
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(self, key):
+        """Returns the cached text (an UTF-8 encoded string) for `key`, or
+        ``None`` if it is not cached."""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as f:
+                text = f.read()
+        except IOError:
+            self.misses += 1
+            return
+
+        # Mark the entry as recently used
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return text
+
+    def set(self, key, text):
+        """Stores `text` (an UTF-8 encoded string) under `key`."""
+        entry_path = self._entry_path(key)
+        entry_dir = os.path.dirname(entry_path)
+        if not os.path.exists(entry_dir):
+            try:
+                os.makedirs(entry_dir)
+            except OSError:  # Guard against race condition
+                pass
+
+        # Write to a temporary file first, so other processes never read
+        # a partially written entry
+        with NamedTemporaryFile(dir=entry_dir, prefix='.tmp_',
+                                delete=False) as f:
+            f.write(text)
+        os.rename(f.name, entry_path)
+
+        if self.size is None:
+            self.size = self._entries_size()
+        else:
+            self.size += len(text)
+
+        if self.size > self.max_size:
+            self.evict()
+
+    def _entries(self):
+        for root, dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.startswith('.tmp_'):
+                    continue
+
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield stat.st_mtime, stat.st_size, path
+
+    def _entries_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Removes the least recently used entries until the cache is
+        below 90% of its maximum size."""
+        entries = sorted(self._entries())
+        self.size = sum(size for _, size, _ in entries)
+
+        target_size = self.max_size * 0.9
+        removed = 0
+        for _, size, path in entries:
+            if self.size <= target_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.size -= size
+            removed += 1
+
+        log.debug('Evicted %d entries from text extraction cache' % removed)
+
+    def extract(self, extract_func, path, max_pages):
+        """Returns the text of the file at `path` as returned by
+        ``extract_func(path, max_pages)``, using the cached text if the
+        same content has been extracted before.
+
+        :param extract_func: a function that returns the text of a file as
+            an UTF-8 encoded string, or ``None`` when extraction failed.
+        """
+        if not self.cache_dir:
+            return extract_func(path, max_pages)
+
+        key = self.key(path, extract_func.__name__, max_pages)
+        text = self.get(key)
+        if text is not None:
+            log.debug('Using cached text for %s (hits: %d, misses: %d)' % (
+                path, self.hits, self.misses))
+            return text
+
+        text = extract_func(path, max_pages)
+        if text is not None:
+            self.set(key, text)
+        return text
+
+
+text_cache = TextExtractionCache(settings.TEXT_CACHE_DIR,
+                                 settings.TEXT_CACHE_MAX_SIZE)
@@ -3,3 +3,4 @@ from .items import *
 from .transformers import *
 from .loaders import *
 from .misc import *
+from .utils import *
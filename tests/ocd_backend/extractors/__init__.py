@@ -21,6 +21,14 @@ class ExtractorTestCase(TestCase):
 
 # Import test modules here so the noserunner can pick them up, and the
 # ExtractorTestCase is parsed. Add additional testcases when required
+from .base import IntervalCheckpointTestCase, ExtractIntervalsTestCase
+from .concurrent import ConcurrentHttpExtractorTestCase
+from .data_sync import DataSyncExtractorTestCase
+from .ggm import GegevensmagazijnFeedExtractorTestCase
+from .ibabs import IBabsBaseExtractorTestCase
+from .notubiz import NotubizExtractorTestCase
 from .staticfile import (
-    StaticfileExtractorTestCase, StaticJSONExtractorTestCase
+    StaticfileExtractorTestCase, StaticJSONExtractorTestCase,
+    JSONStreamTestCase, ODataExtractorTestCase, StaticXmlExtractorTestCase,
+    SegmentReplayExtractorTestCase
 )
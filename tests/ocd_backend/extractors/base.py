@@ -0,0 +1,140 @@
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+import mock
+
+from ocd_backend.extractors import BaseExtractor
+from ocd_backend.utils.checkpoints import FileCheckpointStore
+
+from . import ExtractorTestCase
+
+
+class CheckpointStoreTestCase(ExtractorTestCase):
+    def setUp(self):
+        super(CheckpointStoreTestCase, self).setUp()
+        self.checkpoint_dir = tempfile.mkdtemp()
+        self.store = FileCheckpointStore(
+            os.path.join(self.checkpoint_dir, 'checkpoints.json'))
+        patcher = mock.patch('ocd_backend.extractors.checkpoint_store',
+                             self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.checkpoint_dir)
+
+
+class IntervalCheckpointTestCase(CheckpointStoreTestCase):
+    def setUp(self):
+        super(IntervalCheckpointTestCase, self).setUp()
+        self.source_definition.update({
+            'start_date': '2018-01-01',
+            'end_date': '2018-03-01',
+            'months_interval': 2,
+            'incremental': True,
+        })
+
+    def intervals(self):
+        return list(BaseExtractor(self.source_definition)
+                    .interval_generator())
+
+    def test_checkpoint_stored(self):
+        self.assertEqual(self.intervals(), [
+            (datetime(2018, 1, 1), datetime(2018, 3, 1))])
+        self.assertEqual(self.store.get('test_definition'),
+                         datetime(2018, 3, 1))
+
+    def test_checkpoint_not_stored_for_unfinished_interval(self):
+        BaseExtractor(self.source_definition).interval_generator().next()
+
+        self.assertIsNone(self.store.get('test_definition'))
+
+    def test_incremental_resumes_from_checkpoint(self):
+        self.store.set('test_definition', datetime(2018, 2, 10))
+        self.source_definition['incremental_overlap_days'] = 2
+
+        self.assertEqual(self.intervals(), [
+            (datetime(2018, 2, 8), datetime(2018, 3, 1))])
+
+    def test_checkpoint_not_used_without_incremental(self):
+        self.source_definition['incremental'] = False
+        self.store = mock.Mock()
+
+        with mock.patch('ocd_backend.extractors.checkpoint_store',
+                        self.store):
+            self.assertEqual(self.intervals(), [
+                (datetime(2018, 1, 1), datetime(2018, 3, 1))])
+
+        self.assertFalse(self.store.get.called)
+        self.assertFalse(self.store.set.called)
+
+    def test_checkpoint_not_moved_over_gap(self):
+        self.store.set('test_definition', datetime(2017, 6, 1))
+
+        self.intervals()
+
+        self.assertEqual(self.store.get('test_definition'),
+                         datetime(2017, 6, 1))
+
+    def test_checkpoint_capped_at_start_of_run(self):
+        self.source_definition['end_date'] = '2100-01-01'
+        self.source_definition['months_interval'] = 12 * 100
+
+        self.intervals()
+
+        self.assertLess(self.store.get('test_definition'), datetime.today())
+
+
+class ExtractIntervalsTestCase(CheckpointStoreTestCase):
+    def setUp(self):
+        super(ExtractIntervalsTestCase, self).setUp()
+        self.source_definition.update({
+            'start_date': '2018-01-01',
+            'end_date': '2018-12-31',
+            'months_interval': 2,
+            'interval_concurrency': 3,
+            'incremental': True,
+        })
+        self.extractor = BaseExtractor(self.source_definition)
+
+    def test_items_in_interval_order(self):
+        def extract_interval(start_date, end_date):
+            # Make later intervals finish first
+            time.sleep((12 - start_date.month) / 1000.0)
+            yield start_date.month
+            yield end_date.month
+
+        items = list(self.extractor.extract_intervals(extract_interval))
+
+        self.assertEqual(items, [1, 3, 3, 5, 5, 7, 7, 9, 9, 11, 11, 12])
+        self.assertEqual(self.store.get('test_definition'),
+                         datetime(2018, 12, 31))
+
+    def test_checkpoint_set_after_items_yielded(self):
+        items = self.extractor.extract_intervals(
+            lambda start_date, end_date: [start_date])
+
+        self.assertEqual(items.next(), datetime(2018, 1, 1))
+        self.assertIsNone(self.store.get('test_definition'))
+        items.next()
+        self.assertEqual(self.store.get('test_definition'),
+                         datetime(2018, 3, 1))
+
+    def test_errors_raised(self):
+        def extract_interval(start_date, end_date):
+            raise ValueError(start_date)
+
+        with self.assertRaises(ValueError):
+            list(self.extractor.extract_intervals(extract_interval))
+        self.assertIsNone(self.store.get('test_definition'))
+
+    def test_serial(self):
+        self.source_definition['interval_concurrency'] = 1
+
+        items = list(self.extractor.extract_intervals(
+            lambda start_date, end_date: [start_date.month]))
+
+        self.assertEqual(items, [1, 3, 5, 7, 9, 11])
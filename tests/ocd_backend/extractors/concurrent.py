@@ -0,0 +1,83 @@
+import itertools
+import threading
+import time
+
+from ocd_backend.extractors.concurrent import ConcurrentHttpExtractor
+
+from . import ExtractorTestCase
+
+
+class PagedExtractor(ConcurrentHttpExtractor):
+    """Serves 3 pages of 5 details each, and fails on the detail 'fail'."""
+
+    def __init__(self, *args, **kwargs):
+        super(PagedExtractor, self).__init__(*args, **kwargs)
+        self.fetched_pages = []
+        self.fetched_details = []
+
+    def pages(self):
+        return itertools.count(1)
+
+    def fetch_page(self, page):
+        self.fetched_pages.append(page)
+        if page > 3:
+            return None
+        return [(page, i) for i in range(5)]
+
+    def fetch_detail(self, ref):
+        if ref == 'fail':
+            raise ValueError('Detail failed')
+        self.fetched_details.append(ref)
+        time.sleep(.001)
+        yield 'application/json', ref
+
+
+class ConcurrentHttpExtractorTestCase(ExtractorTestCase):
+    def setUp(self):
+        super(ConcurrentHttpExtractorTestCase, self).setUp()
+        self.source_definition.update({
+            'concurrency': 3,
+            'queue_size': 2,
+        })
+        self.expected = [('application/json', (page, i))
+                         for page in range(1, 4) for i in range(5)]
+
+    def test_serial(self):
+        extractor = PagedExtractor(self.source_definition)
+
+        self.assertFalse(extractor.concurrent)
+        self.assertEqual(list(extractor.run()), self.expected)
+        self.assertEqual(extractor.fetched_pages, [1, 2, 3, 4])
+
+    def test_concurrent(self):
+        self.source_definition['concurrent'] = True
+        extractor = PagedExtractor(self.source_definition)
+
+        self.assertEqual(extractor.http_pool_maxsize, 3)
+        self.assertEqual(sorted(extractor.run()), self.expected)
+        # Pages are fetched until the first page beyond the last one
+        self.assertLessEqual(len(extractor.fetched_pages), 3 + 3)
+
+    def test_backpressure(self):
+        self.source_definition['concurrent'] = True
+        extractor = PagedExtractor(self.source_definition)
+        threads = threading.active_count()
+
+        items = extractor.run()
+        next(items)
+        time.sleep(.05)
+
+        # The consumed item, the buffered items and an item per thread
+        # waiting to be buffered
+        self.assertLessEqual(len(extractor.fetched_details), 1 + 2 + 3)
+
+        items.close()
+        self.assertEqual(threading.active_count(), threads)
+
+    def test_failure(self):
+        self.source_definition['concurrent'] = True
+        extractor = PagedExtractor(self.source_definition)
+        extractor.fetch_page = lambda page: ['fail'] if page == 1 else None
+
+        with self.assertRaises(ValueError):
+            list(extractor.run())
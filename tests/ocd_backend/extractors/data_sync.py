@@ -0,0 +1,78 @@
+import json
+
+import mock
+
+from ocd_backend.extractors import BaseExtractor
+from ocd_backend.extractors.data_sync import DataSyncBaseExtractor
+
+from . import ExtractorTestCase
+
+
+class ListExtractor(BaseExtractor):
+    def run(self):
+        for item in self.source_definition['items']:
+            yield 'application/json', json.dumps(item)
+
+
+def item_id(dataset_id, item):
+    return json.loads(item[1]).get('id')
+
+
+class SyncExtractor(DataSyncBaseExtractor):
+    def select_data_item(self, data_items):
+        return 'application/json', sorted(
+            (dataset_id, json.loads(data))
+            for dataset_id, (_, data) in data_items.items())
+
+
+class DataSyncExtractorTestCase(ExtractorTestCase):
+    def setUp(self):
+        super(DataSyncExtractorTestCase, self).setUp()
+        self.source_definition.update({
+            'sources_config': 'sources.json',
+            'sources': ['a', 'b'],
+            'streaming': True,
+            'key_function': 'tests.ocd_backend.extractors.data_sync.item_id',
+        })
+
+        sources = [{
+            'id': 'a',
+            'extractor': 'tests.ocd_backend.extractors.data_sync.'
+                         'ListExtractor',
+            'items': [{'id': i, 'source': 'a'} for i in range(50)],
+        }, {
+            'id': 'b',
+            'extractor': 'tests.ocd_backend.extractors.data_sync.'
+                         'ListExtractor',
+            'items': [{'id': i, 'source': 'b'} for i in range(49, -1, -2)] +
+                     [{'source': 'b'}],
+        }]
+
+        patcher = mock.patch(
+            'ocd_backend.extractors.data_sync.load_sources_config',
+            return_value=sources)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_streaming(self):
+        items = [data for _, data in SyncExtractor(self.source_definition)
+                 .run()]
+
+        self.assertEqual(len(items), 51)
+
+        matched = [item for item in items if len(item) == 2]
+        self.assertEqual(sorted(a['id'] for (_, a), _ in matched),
+                         range(1, 50, 2))
+        for (_, a), (_, b) in matched:
+            self.assertEqual(a['id'], b['id'])
+
+        # Unmatched items are yielded when all datasets are extracted
+        self.assertEqual(sorted(a['id'] for [(_, a)] in items[-25:]),
+                         range(0, 50, 2))
+        self.assertIn([('b', {'source': 'b'})], items)
+
+    def test_streaming_requires_key(self):
+        del self.source_definition['key_function']
+
+        with self.assertRaises(NotImplementedError):
+            list(SyncExtractor(self.source_definition).run())
@@ -0,0 +1,106 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import mock
+
+from ocd_backend.extractors.ggm import GegevensmagazijnFeedExtractor
+from ocd_backend.utils.checkpoints import FileCheckpointStore
+
+from . import ExtractorTestCase
+
+
+class GegevensmagazijnFeedExtractorTestCase(ExtractorTestCase):
+    def setUp(self):
+        super(GegevensmagazijnFeedExtractorTestCase, self).setUp()
+        self.source_definition.update({
+            'base_url': 'http://feed.example.org/',
+            'feed_query': 'feed?category=Zaak',
+        })
+
+        self.checkpoint_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.checkpoint_dir)
+        self.store = FileCheckpointStore(
+            os.path.join(self.checkpoint_dir, 'checkpoints.json'))
+
+        for name, value in [('checkpoint_store', self.store),
+                            ('get_secret', lambda _: ('user', 'secret'))]:
+            patcher = mock.patch('ocd_backend.extractors.ggm.%s' % name,
+                                 value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.requested = []
+
+    def extractor(self):
+        extractor = GegevensmagazijnFeedExtractor(self.source_definition)
+        extractor._http_session = mock.Mock()
+        extractor._http_session.get.side_effect = self.get
+        return extractor
+
+    def get(self, url):
+        self.requested.append(url)
+        page = int(url.split('piket=')[1]) if 'piket=' in url else 1
+
+        if page < 3:
+            links = [{'rel': 'next',
+                      'href': 'http://feed.example.org/feed?piket=%d' % (
+                          page + 1)}]
+        else:
+            links = [{'rel': 'resume',
+                      'href': 'http://feed.example.org/feed?piket=4'}]
+
+        response = mock.Mock(status_code=200)
+        response.content = json.dumps({
+            'links': links,
+            'entries': [{'content': {'src': u'%d-%d' % (page, i)}}
+                        for i in range(2)]
+        })
+        return response
+
+    def test_run(self):
+        items = list(self.extractor().run())
+
+        self.assertEqual(items, [(u'%d-%d' % (page, i),)
+                                 for page in range(1, 4) for i in range(2)])
+        self.assertEqual(self.store.get_state('test_definition'),
+                         {'piket': '4', 'entries': 6})
+
+    def test_checkpoint_after_each_page(self):
+        items = self.extractor().run()
+        for _ in range(3):
+            next(items)
+
+        self.assertEqual(self.store.get_state('test_definition'),
+                         {'piket': '2', 'entries': 2})
+
+    def test_prefetch(self):
+        items = self.extractor().run()
+        next(items)
+
+        # The second page is fetched while the first one is processed
+        deadline = time.time() + 5
+        while len(self.requested) < 2 and time.time() < deadline:
+            time.sleep(.01)
+        self.assertEqual(self.requested[1],
+                         'http://feed.example.org/feed?category=Zaak&piket=2')
+        items.close()
+
+    def test_full_run_ignores_checkpoint(self):
+        self.store.set_state('test_definition', {'piket': '3', 'entries': 4})
+
+        self.assertEqual(len(list(self.extractor().run())), 6)
+
+    def test_resume(self):
+        self.store.set_state('test_definition', {'piket': '3', 'entries': 4})
+        self.source_definition['incremental'] = True
+
+        items = list(self.extractor().run())
+
+        self.assertEqual(items, [(u'3-0',), (u'3-1',)])
+        self.assertEqual(self.store.get_state('test_definition'),
+                         {'piket': '4', 'entries': 6})
+        self.assertEqual(self.requested,
+                         ['http://feed.example.org/feed?category=Zaak&piket=3'])
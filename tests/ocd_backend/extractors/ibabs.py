@@ -0,0 +1,59 @@
+import time
+from threading import current_thread
+from unittest import TestCase
+
+import mock
+
+from ocd_backend.extractors.ibabs import IBabsBaseExtractor
+
+from . import ExtractorTestCase
+
+
+class IBabsBaseExtractorTestCase(ExtractorTestCase):
+    def setUp(self):
+        super(IBabsBaseExtractorTestCase, self).setUp()
+        self.source_definition['sitename'] = 'test'
+        self.source_definition['requests_per_second'] = None
+
+        with mock.patch('ocd_backend.extractors.ibabs.soap_clients'):
+            self.extractor = IBabsBaseExtractor(self.source_definition)
+
+    def test_concurrent_map_keeps_order(self):
+        self.extractor.concurrency = 4
+
+        def call(client, item):
+            # Make later items finish first
+            time.sleep((10 - item) / 1000.0)
+            return item * 2
+
+        self.assertEqual(list(self.extractor.concurrent_map(call, range(10))),
+                         [i * 2 for i in range(10)])
+
+    def test_concurrent_map_uses_client_per_thread(self):
+        self.extractor.concurrency = 4
+        self.extractor.client.clone.side_effect = lambda: mock.Mock()
+
+        clients = list(self.extractor.concurrent_map(
+            lambda client, item: (current_thread().ident, client), range(20)))
+
+        for ident, client in clients:
+            self.assertIsNot(client, self.extractor.client)
+        self.assertEqual(len(set(ident for ident, _ in clients)),
+                         len(set(id(client) for _, client in clients)))
+
+    def test_serial_map(self):
+        self.extractor.concurrency = 1
+
+        results = list(self.extractor.concurrent_map(
+            lambda client, item: client, range(2)))
+
+        self.assertEqual(results, [self.extractor.client] * 2)
+
+    def test_concurrent_map_raises(self):
+        self.extractor.concurrency = 2
+
+        def call(client, item):
+            raise ValueError(item)
+
+        with self.assertRaises(ValueError):
+            list(self.extractor.concurrent_map(call, range(3)))
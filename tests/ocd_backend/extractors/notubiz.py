@@ -0,0 +1,51 @@
+import json
+import time
+
+import mock
+
+from ocd_backend.extractors.notubiz import NotubizMeetingExtractor
+
+from . import ExtractorTestCase
+
+
+class NotubizExtractorTestCase(ExtractorTestCase):
+    def setUp(self):
+        super(NotubizExtractorTestCase, self).setUp()
+        self.source_definition.update({
+            'base_url': 'http://api.example.org',
+            'organisation_id': 1,
+            'doc_type': 'events',
+            'meeting_concurrency': 4,
+        })
+        self.extractor = NotubizMeetingExtractor(self.source_definition)
+        self.extractor._http_session = mock.Mock()
+        self.extractor._http_session.get.side_effect = self.get
+
+    def get(self, url):
+        response = mock.Mock()
+        if '/events?' in url:
+            page = int(url.split('page=')[1])
+            events = [{'id': i} for i in range(10)] if page == 1 else []
+            response.json.return_value = {'events': events}
+        else:
+            meeting_id = int(url.split('/')[-1].split('?')[0])
+            # Make later meetings return first
+            time.sleep((10 - meeting_id) / 1000.0)
+            response.json.return_value = {
+                'meeting': {'id': meeting_id, 'attributes': []}}
+        return response
+
+    def test_meetings_in_order(self):
+        items = list(self.extract())
+
+        self.assertEqual([json.loads(doc)['id'] for _, doc in items],
+                         range(10))
+
+    def extract(self):
+        start = mock.Mock()
+        start.strftime.return_value = '2018-01-01 00:00:00'
+        return self.extractor.extract_interval(start, start)
+
+    def test_connection_pool_limited(self):
+        self.assertEqual(self.extractor.http_pool_maxsize, 4)
+        self.assertTrue(self.extractor.http_pool_block)
@@ -1,10 +1,21 @@
 import gzip
 import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from lxml import etree
+import mock
 
 from ocd_backend.exceptions import ConfigurationError
+from ocd_backend.extractors.odata import ODataExtractor
 from ocd_backend.extractors.staticfile import (
-    StaticJSONDumpExtractor, StaticJSONExtractor
+    StaticJSONDumpExtractor, StaticJSONExtractor, StaticXmlExtractor,
+    SegmentReplayExtractor
 )
+from ocd_backend.utils.json_stream import iter_json_array
+from ocd_backend.utils.segments import SegmentWriter
 
 from . import ExtractorTestCase
 
@@ -61,3 +72,127 @@ class StaticJSONExtractorTestCase(ExtractorTestCase):
         self.assertEqual(content_type, 'application/json')
         # Doc is a serialized JSON document, so a string
         self.assertEqual(type(doc), str)
+
+    def test_extract_items_stream(self):
+        items = [{'field': 1}, {'field': u'\u20ac [1, 2]'}, 3, None, []]
+        content = json.dumps(items)
+        chunks = [content[i:i + 3] for i in range(0, len(content), 3)]
+
+        docs = [json.loads(doc) for content_type, doc
+                in self.extractor.extract_items_stream(chunks)]
+        self.assertEqual(docs, items)
+
+
+def chunked(content, size=5):
+    return [content[i:i + size] for i in range(0, len(content), size)]
+
+
+class JSONStreamTestCase(TestCase):
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array([' [ ] '])), [])
+
+    def test_numbers_split_across_chunks(self):
+        self.assertEqual(list(iter_json_array(chunked('[12345,678901]', 3))),
+                         [12345, 678901])
+
+    def test_multibyte_characters_split_across_chunks(self):
+        content = json.dumps([u'\u20ac'], ensure_ascii=False).encode('utf-8')
+        self.assertEqual(list(iter_json_array(chunked(content, 1))),
+                         [u'\u20ac'])
+
+    def test_array_member_of_object(self):
+        content = json.dumps({'odata.metadata': {'a': [1]}, 'value': [1, 2]})
+        self.assertEqual(list(iter_json_array(chunked(content), key='value')),
+                         [1, 2])
+
+    def test_truncated_stream(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array(chunked('[{"a": 1}, {"b"')))
+
+
+class ODataExtractorTestCase(ExtractorTestCase):
+    def setUp(self):
+        super(ODataExtractorTestCase, self).setUp()
+        self.source_definition['file_url'] = 'http://example.org/odata'
+        self.source_definition['filter'] = {'type': 'a'}
+        self.extractor = ODataExtractor(self.source_definition)
+
+    def test_extract_items_stream(self):
+        content = json.dumps({'value': [{'type': 'a', 'id': 1},
+                                        {'type': 'b', 'id': 2}]})
+        docs = [json.loads(doc) for content_type, doc
+                in self.extractor.extract_items_stream(chunked(content))]
+        self.assertEqual(docs, [{'type': 'a', 'id': 1}])
+
+
+class StaticXmlExtractorTestCase(ExtractorTestCase):
+    content = (
+        '<feed xmlns="http://example.org/ns"><title>Feed</title>'
+        '<entry><id>1</id></entry><entry><id>2</id></entry></feed>'
+    )
+
+    def setUp(self):
+        super(StaticXmlExtractorTestCase, self).setUp()
+        self.source_definition['file_url'] = 'http://example.org/feed.xml'
+        self.source_definition['streaming'] = True
+        self.source_definition['item_tag'] = '{http://example.org/ns}entry'
+        self.extractor = StaticXmlExtractor(self.source_definition)
+
+    def test_no_item_tag_set(self):
+        self.source_definition.pop('item_tag')
+        with self.assertRaises(ConfigurationError):
+            StaticXmlExtractor(self.source_definition)
+
+    def test_extract_items_stream(self):
+        items = list(self.extractor.extract_items_stream(
+            chunked(self.content)))
+
+        self.assertEqual(len(items), 2)
+        for i, (content_type, doc) in enumerate(items, start=1):
+            self.assertEqual(content_type, 'application/xml')
+            self.assertEqual(
+                etree.fromstring(doc).findtext('{http://example.org/ns}id'),
+                str(i))
+
+    def test_run_streams_response(self):
+        response = mock.MagicMock()
+        response.iter_content.return_value = chunked(self.content)
+        self.extractor._http_session = mock.MagicMock()
+        self.extractor._http_session.get.return_value = response
+
+        self.assertEqual(len(list(self.extractor.run())), 2)
+        self.extractor.http_session.get.assert_called_once_with(
+            'http://example.org/feed.xml', verify=False, stream=True)
+        response.iter_content.assert_called_once_with(
+            self.extractor.stream_chunk_size)
+        response.close.assert_called_once_with()
+
+
+class SegmentReplayExtractorTestCase(ExtractorTestCase):
+    def setUp(self):
+        super(SegmentReplayExtractorTestCase, self).setUp()
+        self.segments_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.segments_dir)
+
+        self.items = [('application/json', '{"id": %d}' % i) for i in range(5)]
+        writer = SegmentWriter(
+            os.path.join(self.segments_dir, 'test_definition', '1'),
+            segment_size=2)
+        list(writer.tee(self.items))
+
+    def test_replay_latest_recording(self):
+        with mock.patch('ocd_backend.settings.SEGMENTS_DIR',
+                        self.segments_dir):
+            extractor = SegmentReplayExtractor(self.source_definition)
+
+        self.assertEqual(list(extractor.run()), self.items)
+
+    def test_replay_start(self):
+        self.source_definition.update({
+            'segments_path': os.path.join(self.segments_dir,
+                                          'test_definition', '1'),
+            'replay_start': 3
+        })
+
+        self.assertEqual(list(SegmentReplayExtractor(self.source_definition)
+                              .run()), self.items[3:])
@@ -27,3 +27,4 @@ from .localdump import LocalDumpItemTestCase
 from .go_meeting import MeetingItemTestCase
 from .go_resolution import ResolutionItemTestCase
 from .go_report import ReportItemTestCase
+from .strict_record import StrictRecordTestCase
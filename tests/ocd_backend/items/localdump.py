@@ -1,6 +1,8 @@
 import json
 import os
 
+import mock
+
 from ocd_backend.items import LocalDumpItem
 
 from . import ItemTestCase
@@ -81,3 +83,18 @@ class LocalDumpItemTestCase(ItemTestCase):
         for field, field_type in item.combined_index_fields.iteritems():
             self.assertIn(field, data)
             self.assertIsInstance(data[field], field_type)
+
+    def test_documents_built_once(self):
+        item = LocalDumpItem(self.source_definition, 'application/json',
+                             self.raw_item, self.item, None)
+
+        with mock.patch.object(item, 'get_all_text',
+                               wraps=item.get_all_text) as get_all_text:
+            combined_index_doc = item.get_combined_index_doc()
+            index_doc = item.get_index_doc()
+
+        self.assertEqual(get_all_text.call_count, 1)
+        self.assertIs(item.get_combined_index_doc(), combined_index_doc)
+        self.assertIs(item.get_index_doc(), index_doc)
+        self.assertEqual(json.loads(index_doc['combined_index_data'])['all_text'],
+                         combined_index_doc['all_text'])
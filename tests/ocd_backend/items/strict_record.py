@@ -0,0 +1,53 @@
+from datetime import datetime
+from unittest import TestCase
+
+from ocd_backend.items import record_class, BaseItem
+
+
+class StrictRecordTestCase(TestCase):
+    def setUp(self):
+        self.record_class = record_class(BaseItem.combined_index_fields)
+
+    def test_validated_on_creation(self):
+        self.assertRaises(KeyError, self.record_class, {'unknown': u'a'})
+        self.assertRaises(TypeError, self.record_class, {'title': 'a'})
+        self.assertRaises(TypeError, self.record_class, [('hidden', 0)])
+
+    def test_read_like_dict(self):
+        record = self.record_class([('title', u'Raad'), ('hidden', False)])
+
+        self.assertEqual(record['title'], u'Raad')
+        self.assertIn('hidden', record)
+        self.assertNotIn('date', record)
+        self.assertIsNone(record.get('date'))
+        self.assertRaises(KeyError, lambda: record['date'])
+        self.assertEqual(len(record), 2)
+        self.assertEqual(dict(record), {'title': u'Raad', 'hidden': False})
+
+    def test_as_dict(self):
+        date = datetime(2018, 1, 1)
+        record = self.record_class({'title': u'Raad', 'date': date})
+        target = {'meta': {}}
+
+        self.assertIs(record.as_dict(target), target)
+        self.assertEqual(target, {'meta': {}, 'title': u'Raad', 'date': date})
+        self.assertIsNot(record.as_dict(), record.as_dict())
+
+    def test_class_per_mapping(self):
+        self.assertIs(record_class(dict(BaseItem.combined_index_fields)),
+                      self.record_class)
+        self.assertIsNot(record_class(BaseItem.meta_fields),
+                         self.record_class)
+        self.assertFalse(hasattr(self.record_class(), '__dict__'))
+
+    def test_record_classes_per_item_class(self):
+        class SourcesItem(BaseItem):
+            combined_index_fields = dict(BaseItem.combined_index_fields,
+                                         sources=list)
+
+        meta_class, combined_class = SourcesItem._record_classes()
+
+        self.assertIs(SourcesItem._record_classes()[1], combined_class)
+        self.assertIs(meta_class, record_class(BaseItem.meta_fields))
+        self.assertIn('sources', combined_class.mapping)
+        self.assertIs(BaseItem._record_classes()[1], self.record_class)
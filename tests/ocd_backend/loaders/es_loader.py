@@ -1,9 +1,13 @@
 import json
 import os.path
 
+import mock
+
 from . import LoaderTestCase
+from ocd_backend import settings
 from ocd_backend.exceptions import ConfigurationError
-from ocd_backend.loaders import ElasticsearchLoader
+from ocd_backend.loaders import (ElasticsearchLoader, ElasticsearchBulkLoader,
+                                 BulkActionBuffer, flush_bulk_buffer)
 
 
 class ESLoaderTestCase(LoaderTestCase):
@@ -34,3 +38,122 @@ class ESLoaderTestCase(LoaderTestCase):
         # self.loader.run(source_definition=self.source_definition)
         self.assertRaises(ConfigurationError, self.loader.run,
                           source_definition=self.source_definition)
+
+
+class ESBulkLoaderTestCase(ESLoaderTestCase):
+    def setUp(self):
+        super(ESBulkLoaderTestCase, self).setUp()
+        self.index_doc['enrichments'] = {}
+        self.loader = ElasticsearchBulkLoader()
+        self.loader.index_name = 'ori_test_index'
+        self.loader.flush_interval = 60
+        self.buffer = BulkActionBuffer()
+
+    def tearDown(self):
+        if self.buffer.timer:
+            self.buffer.timer.cancel()
+
+    def test_index_actions(self):
+        actions = list(self.loader.index_actions(
+            self.object_id, self.object_id, self.combined_index_doc,
+            self.index_doc, 'item'))
+
+        # Combined index, source index and one per media url
+        self.assertEqual(len(actions), 2 + len(self.index_doc['media_urls']))
+        self.assertEqual(actions[1]['_index'], 'ori_test_index')
+        self.assertEqual(actions[1]['_id'], self.object_id)
+        self.assertEqual(actions[2]['_type'], 'url')
+
+    def test_threshold_reached(self):
+        self.assertFalse(self.buffer.threshold_reached(2, 1024, 60))
+
+        self.buffer.add({'_source': '{}'}, 60)
+        self.assertFalse(self.buffer.threshold_reached(2, 1024, 60))
+        self.assertTrue(self.buffer.threshold_reached(2, 2, 60))
+        self.assertTrue(self.buffer.threshold_reached(2, 1024, 0))
+
+        self.buffer.add({'_source': '{}'}, 60)
+        self.assertTrue(self.buffer.threshold_reached(2, 1024, 60))
+
+    def test_postpone_cleanup(self):
+        self.assertFalse(self.buffer.postpone_cleanup(
+            self.source_definition, {'chain_id': 'a'}))
+
+        self.buffer.add({'_source': '{}'}, 60)
+        self.assertTrue(self.buffer.postpone_cleanup(
+            self.source_definition, {'chain_id': 'b'}))
+
+    @mock.patch('ocd_backend.loaders.load_object')
+    @mock.patch('ocd_backend.loaders.bulk')
+    def test_flush(self, mocked_bulk, mocked_load_object):
+        mocked_bulk.return_value = (1, [])
+        self.buffer.add({'_source': '{}'}, 60)
+        self.buffer.postpone_cleanup(self.source_definition, {'chain_id': 'a'})
+
+        self.assertEqual(self.buffer.flush(), (1, []))
+        self.assertEqual(len(mocked_bulk.call_args[0][1]), 1)
+        mocked_load_object.return_value.return_value.delay\
+            .assert_called_once_with(chain_id='a')
+
+        self.assertEqual(self.buffer.actions, [])
+        self.assertEqual(self.buffer.pending_cleanups, [])
+        self.assertIsNone(self.buffer.timer)
+
+    @mock.patch('ocd_backend.loaders.bulk')
+    def test_flush_max_bytes_of_sources(self, mocked_bulk):
+        mocked_bulk.return_value = (2, [])
+        self.buffer.add({'_source': '{}'}, 60, 2048)
+        self.buffer.add({'_source': '{}'}, 60, 1024)
+
+        self.buffer.flush()
+        self.assertEqual(mocked_bulk.call_args[1]['max_chunk_bytes'], 1024)
+
+        self.buffer.add({'_source': '{}'}, 60)
+        self.buffer.flush()
+        self.assertEqual(mocked_bulk.call_args[1]['max_chunk_bytes'],
+                         settings.ES_BULK_MAX_BYTES)
+
+    @mock.patch('ocd_backend.loaders.fingerprint_index')
+    @mock.patch('ocd_backend.loaders.bulk')
+    def test_flush_records_fingerprints(self, mocked_bulk, mocked_index):
+        mocked_bulk.return_value = (1, [
+            {'index': {'_index': 'ori_test_index', '_id': 'b', 'error': ''}}])
+        self.buffer.add({'_source': '{}'}, 60)
+        self.buffer.add_fingerprint('ori_test_index', 'a', 'fingerprint-a')
+        self.buffer.add_fingerprint('ori_test_index', 'b', 'fingerprint-b')
+
+        self.buffer.flush()
+
+        mocked_index.add.assert_called_once_with(
+            'ori_test_index', 'a', 'fingerprint-a')
+        self.assertEqual(self.buffer.pending_fingerprints, [])
+
+    @mock.patch('ocd_backend.loaders.bulk_buffer')
+    def test_after_return_flushes_when_run_is_done(self, mocked_buffer):
+        mocked_buffer.postpone_cleanup.return_value = False
+        self.loader.source_definition = self.source_definition
+        kwargs = {'run_identifier': 'run', 'chain_id': 'a'}
+
+        with mock.patch.object(ElasticsearchBulkLoader, 'backend') as backend, \
+                mock.patch.object(self.loader, 'cleanup') as cleanup:
+            backend.get.return_value = 'running'
+            self.loader.after_return('SUCCESS', None, 'id', (), kwargs, None)
+            self.assertFalse(mocked_buffer.flush.called)
+
+            backend.get.return_value = 'done'
+            self.loader.after_return('SUCCESS', None, 'id', (), kwargs, None)
+            mocked_buffer.flush.assert_called_once_with()
+
+        self.assertEqual(cleanup.call_count, 2)
+
+    @mock.patch('ocd_backend.loaders.bulk_buffer')
+    def test_flush_on_worker_process_shutdown(self, mocked_buffer):
+        flush_bulk_buffer(pid=1, exitcode=0)
+        mocked_buffer.flush.assert_called_once_with()
+
+    def test_item_fingerprint(self):
+        self.loader.source_definition = self.source_definition
+        self.assertIsNone(self.loader.item_fingerprint(self.index_doc))
+
+        self.source_definition['skip_unchanged'] = True
+        self.assertEqual(len(self.loader.item_fingerprint(self.index_doc)), 40)
@@ -1,7 +1,15 @@
 from unittest import TestCase
 import datetime
+import time
 
-from ocd_backend.utils.misc import normalize_motion_id
+import mock
+
+from ocd_backend import settings
+from ocd_backend.utils.misc import (normalize_motion_id, batches,
+                                    concurrent_map)
+from ocd_backend.utils.file_parsing import poppler_pages_text
+from ocd_backend.utils.parallel_pdf import page_ranges, parallel_convert
+from ocd_backend.utils.pdf import convert_max_pages
 
 class MotionIdNormalizerTestCase(TestCase):
     def test_normalize_motion_id(self):
@@ -16,3 +24,76 @@ class MotionIdNormalizerTestCase(TestCase):
         self.assertEqual(normalized_motion_id, '2016M124')
         normalized_motion_id = normalize_motion_id('M2016-67')
         self.assertEqual(normalized_motion_id, '2016M67')
+
+
+class BatchesTestCase(TestCase):
+    def test_batches(self):
+        result = list(batches(iter(range(7)), 3))
+        self.assertEqual(result, [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_batches_exact_size(self):
+        result = list(batches(iter(range(4)), 2))
+        self.assertEqual(result, [[0, 1], [2, 3]])
+
+    def test_batches_empty(self):
+        self.assertEqual(list(batches(iter([]), 2)), [])
+
+
+class ConcurrentMapTestCase(TestCase):
+    def test_results_in_order(self):
+        def double(i):
+            # Make later elements finish first
+            time.sleep((10 - i) / 1000.0)
+            return i * 2
+
+        self.assertEqual(list(concurrent_map(double, range(10), 4)),
+                         [i * 2 for i in range(10)])
+
+    def test_serial(self):
+        self.assertEqual(list(concurrent_map(lambda i: i, xrange(3), 1)),
+                         [0, 1, 2])
+
+
+class PageRangesTestCase(TestCase):
+    def test_ranges_cover_all_pages(self):
+        self.assertEqual(page_ranges(10, 3, 1), [(0, 4), (4, 7), (7, 10)])
+
+    def test_minimum_pages_per_range(self):
+        self.assertEqual(page_ranges(10, 4, 5), [(0, 5), (5, 10)])
+        self.assertEqual(page_ranges(3, 4, 5), [(0, 3)])
+
+    def test_no_pages(self):
+        self.assertEqual(page_ranges(0, 4, 5), [])
+
+    def test_single_range_extracted_in_process(self):
+        page_count = mock.Mock(return_value=30)
+        pages_text = mock.Mock(return_value='text')
+        with mock.patch('ocd_backend.utils.parallel_pdf._engine_functions',
+                        return_value=(page_count, pages_text)):
+            text = parallel_convert('file.pdf', max_pages=5, workers=4,
+                                    min_pages=10)
+
+        self.assertEqual(text, 'text')
+        pages_text.assert_called_once_with('file.pdf', 0, 5)
+
+    @mock.patch('ocd_backend.utils.file_parsing.pdf')
+    def test_only_range_pages_read(self, pdf):
+        line = mock.Mock(text=u'line')
+        document = pdf.Document.return_value
+        document.no_of_pages = 10
+        document.get_page.return_value = [[[line]]]
+
+        text = poppler_pages_text('file.pdf', 4, 6)
+
+        self.assertEqual(text, 'line\nline')
+        self.assertEqual(document.get_page.call_args_list,
+                         [mock.call(4), mock.call(5)])
+        self.assertFalse(document.__iter__.called)
+
+    @mock.patch.object(settings, 'PDF_EXTRACTION_WORKERS', 4)
+    @mock.patch('ocd_backend.utils.pdf.convert', return_value='text')
+    @mock.patch('ocd_backend.utils.pdf.parallel_convert',
+                side_effect=OSError('no workers'))
+    def test_pdfminer_falls_back_to_single_process(self, parallel, convert):
+        self.assertEqual(convert_max_pages('file.pdf', 2), 'text')
+        convert.assert_called_once_with('file.pdf', range(0, 2))
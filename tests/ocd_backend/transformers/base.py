@@ -1,5 +1,8 @@
 import os.path
 
+import mock
+from celery.exceptions import SoftTimeLimitExceeded
+
 from . import TransformerTestCase
 
 from ocd_backend.exceptions import NoDeserializerAvailable
@@ -42,3 +45,20 @@ class BaseTransformerTestCase(TransformerTestCase):
         self.assertIsNotNone(object_id)
         self.assertIsNotNone(combi_doc)
         self.assertIsNotNone(doc)
+
+    def test_run_batch(self):
+        results = self.transformer.run(
+            [self.item, ('application/test', self.item[1]), self.item],
+            source_definition=self.source_definition)
+        # The item without a deserializer is skipped
+        self.assertEqual(len(results), 2)
+        for result in results:
+            self.assertEqual(len(result), 5)
+
+    def test_run_batch_time_limit(self):
+        # Only errors are skipped, a time limit stops the batch
+        with mock.patch.object(self.transformer, 'deserialize_item',
+                               side_effect=SoftTimeLimitExceeded):
+            self.assertRaises(SoftTimeLimitExceeded, self.transformer.run,
+                              [self.item, self.item],
+                              source_definition=self.source_definition)
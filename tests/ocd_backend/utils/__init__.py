@@ -0,0 +1,15 @@
+# Import test modules here so the noserunner can pick them up. Add additional
+# testcases when required
+from .cache import TTLCacheTestCase
+from .api import CachedAPIRequestTestCase
+from .text_cache import TextExtractionCacheTestCase
+from .http_cache import DownloadStoreTestCase
+from .soap import SoapClientFactoryTestCase
+from .ibabs import MeetingTypeRegistryTestCase
+from .fingerprints import FingerprintTestCase
+from .rate_limit import TokenBucketTestCase, RateLimitedSessionTestCase
+from .http_sessions import SessionRegistryTestCase
+from .segments import SegmentsTestCase
+from .serializers import MsgpackSerializerTestCase
+from .definitions import SourceDefinitionRegistryTestCase
+from .misc import LoadObjectTestCase, StripNamespacesTestCase
@@ -0,0 +1,35 @@
+from unittest import TestCase
+
+import mock
+
+from ocd_backend.utils.api import FrontendAPIMixin, api_cache
+
+
+class CachedAPIRequestTestCase(TestCase):
+    def setUp(self):
+        api_cache.invalidate()
+        self.mixin = FrontendAPIMixin()
+        self.mixin.source_definition = {'index_name': 'test'}
+
+    @mock.patch.object(FrontendAPIMixin, 'api_request')
+    def test_cached_api_request(self, mocked_api_request):
+        mocked_api_request.return_value = [{'id': 1}]
+
+        first = self.mixin.cached_api_request('test', 'organizations',
+                                              classification='Council')
+        first[0]['id'] = 2
+        second = self.mixin.cached_api_request('test', 'organizations',
+                                               classification='Council')
+        self.assertEqual(second, [{'id': 1}])
+        self.assertEqual(mocked_api_request.call_count, 1)
+
+        self.mixin.cached_api_request('test', 'organizations',
+                                      classification='Party')
+        self.assertEqual(mocked_api_request.call_count, 2)
+
+    @mock.patch.object(FrontendAPIMixin, 'api_request')
+    def test_empty_results_not_cached(self, mocked_api_request):
+        mocked_api_request.return_value = []
+        self.mixin.cached_api_request('test', 'organizations')
+        self.mixin.cached_api_request('test', 'organizations')
+        self.assertEqual(mocked_api_request.call_count, 2)
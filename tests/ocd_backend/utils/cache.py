@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+from ocd_backend.utils.cache import TTLCache
+
+
+class TTLCacheTestCase(TestCase):
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        # Accessing 'a' makes 'b' the least recently used entry
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_expiry(self):
+        cache = TTLCache(ttl=-1)
+        cache.set('a', 1)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.misses, 1)
+
+    def test_invalidate(self):
+        cache = TTLCache()
+        cache.set(('x', 1), 1)
+        cache.set(('y', 2), 2)
+        cache.invalidate(lambda key: key[0] == 'x')
+        self.assertNotIn(('x', 1), cache)
+        self.assertIn(('y', 2), cache)
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
@@ -0,0 +1,80 @@
+from unittest import TestCase
+
+import mock
+
+from ocd_backend import celery_app
+from ocd_backend.utils.definitions import SourceDefinitionRegistry
+
+
+class DefinitionTask(celery_app.Task):
+    def run(self, **kwargs):
+        return kwargs.get('source_definition')
+
+
+class DefinitionCleanupTask(DefinitionTask):
+    uses_source_definition = False
+
+
+class SourceDefinitionRegistryTestCase(TestCase):
+    def setUp(self):
+        self.hashes = {}
+        self.redis = mock.MagicMock()
+        pipe = self.redis.pipeline.return_value
+        pipe.hmset.side_effect = \
+            lambda key, mapping: self.hashes.setdefault(key, {}).update(mapping)
+        self.redis.hget.side_effect = \
+            lambda key, field: self.hashes.get(key, {}).get(field)
+        self.redis.delete.side_effect = \
+            lambda key: self.hashes.pop(key, None)
+
+        patcher = mock.patch.object(SourceDefinitionRegistry, 'redis',
+                                    self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.registry = SourceDefinitionRegistry(cache_size=2)
+        self.registry.store('pipeline_1', {
+            'meetings': {'id': 'meetings', 'extractor': 'a.B',
+                         'enrichers': [('c.D', {})]},
+            'motions': {'id': 'motions', 'extractor': 'e.F'}
+        })
+
+    def test_resolve(self):
+        kwargs = self.registry.resolve({'run_identifier': 'pipeline_1',
+                                        'pipeline_id': 'meetings'})
+
+        self.assertEqual(kwargs['source_definition'],
+                         {'id': 'meetings', 'extractor': 'a.B',
+                          'enrichers': [('c.D', {})]})
+
+    def test_inline_definition_kept(self):
+        kwargs = self.registry.resolve({'run_identifier': 'pipeline_1',
+                                        'source_definition': {'id': 'x'}})
+
+        self.assertEqual(kwargs['source_definition'], {'id': 'x'})
+        self.assertFalse(self.redis.hget.called)
+
+    def test_looked_up_once(self):
+        self.registry.get('pipeline_1', 'meetings')
+        self.registry.get('pipeline_1', 'meetings')
+        self.registry.get('pipeline_1', 'motions')
+
+        self.assertEqual(self.redis.hget.call_count, 2)
+
+    def test_resolved_when_task_is_called(self):
+        kwargs = {'run_identifier': 'pipeline_1', 'pipeline_id': 'motions'}
+        with mock.patch('ocd_backend.utils.definitions.source_definitions',
+                        self.registry):
+            self.assertEqual(DefinitionTask()(**kwargs),
+                             {'id': 'motions', 'extractor': 'e.F'})
+
+            self.registry.remove('pipeline_1')
+            self.assertIsNone(DefinitionCleanupTask()(**kwargs))
+            self.assertRaises(KeyError, DefinitionTask(), **kwargs)
+
+    def test_remove(self):
+        self.registry.get('pipeline_1', 'meetings')
+        self.registry.remove('pipeline_1')
+
+        self.assertRaises(KeyError, self.registry.get, 'pipeline_1',
+                          'meetings')
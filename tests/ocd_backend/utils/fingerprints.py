@@ -0,0 +1,41 @@
+from unittest import TestCase
+
+import mock
+
+from ocd_backend.pipeline import skip_unchanged
+from ocd_backend.utils.fingerprints import fingerprint, FingerprintIndex
+
+
+class FingerprintTestCase(TestCase):
+    def test_fingerprint_ignores_decoding(self):
+        self.assertEqual(fingerprint('application/json', '{"a": "\xe2\x82\xac"}'),
+                         fingerprint('application/json', u'{"a": "\u20ac"}'))
+
+    def test_fingerprint_includes_content_type(self):
+        self.assertNotEqual(fingerprint('application/json', '{}'),
+                            fingerprint('application/xml', '{}'))
+
+    @mock.patch('ocd_backend.pipeline.fingerprint_index')
+    def test_skip_unchanged(self, index):
+        loaded = fingerprint('application/json', '{"a": 1}')
+        index.contains.side_effect = lambda name, fp: fp == loaded
+
+        items = list(skip_unchanged([('application/json', '{"a": 1}'),
+                                     ('application/json', '{"a": 2}')],
+                                    'ori_test'))
+
+        self.assertEqual(items, [('application/json', '{"a": 2}')])
+        index.contains.assert_called_with('ori_test', mock.ANY)
+
+    def test_previous_fingerprint_removed(self):
+        redis = mock.MagicMock()
+        redis.hget.return_value = 'old'
+        pipe = redis.pipeline.return_value
+
+        with mock.patch.object(FingerprintIndex, 'redis', redis):
+            FingerprintIndex().add('ori_test', 'id', 'new')
+
+        pipe.hdel.assert_called_once_with('ori_test_fingerprints', 'old')
+        pipe.hset.assert_any_call('ori_test_fingerprints', 'new', 'id')
+        pipe.hset.assert_any_call('ori_test_fingerprint_ids', 'id', 'new')
+        pipe.execute.assert_called_once_with()
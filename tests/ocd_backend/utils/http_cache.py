@@ -0,0 +1,74 @@
+from unittest import TestCase
+import os
+import shutil
+import tempfile
+
+import mock
+
+from ocd_backend.utils.http_cache import DownloadStore
+
+
+class DownloadStoreTestCase(TestCase):
+    def setUp(self):
+        self.files_dir = tempfile.mkdtemp()
+        self.store = DownloadStore(self.files_dir)
+        self.url = 'http://example.org/document.pdf'
+
+        self.http_session = mock.Mock()
+        self.http_session.get.return_value = mock.Mock(
+            status_code=200,
+            headers={'etag': '"abc"', 'content-type': 'application/pdf'},
+            iter_content=lambda chunk_size: ['content'])
+
+    def tearDown(self):
+        shutil.rmtree(self.files_dir)
+
+    def test_fetch_stores_validators(self):
+        content_type, size, f = self.store.fetch(self.http_session, self.url)
+        self.assertEqual((content_type, size, f.read()),
+                         ('application/pdf', 7, 'content'))
+
+        validators = self.store.get_validators(self.url)
+        self.assertEqual(validators['etag'], '"abc"')
+        self.assertEqual(validators['size'], 7)
+
+    def test_fetch_not_modified(self):
+        self.store.fetch(self.http_session, self.url)
+
+        self.http_session.get.return_value = mock.Mock(status_code=304)
+        content_type, size, f = self.store.fetch(self.http_session, self.url)
+        self.assertEqual(f.read(), 'content')
+        self.assertEqual(self.http_session.get.call_args[1]['headers'],
+                         {'If-None-Match': '"abc"'})
+
+    def test_no_validators_for_missing_copy(self):
+        self.store.fetch(self.http_session, self.url)
+        os.remove(self.store.file_path(self.url))
+        self.assertIsNone(self.store.get_validators(self.url))
+
+    def test_no_copy_without_validators(self):
+        self.store.fetch(self.http_session, self.url)
+        self.http_session.get.return_value.headers = {
+            'content-type': 'application/pdf'}
+
+        content_type, size, f = self.store.fetch(self.http_session, self.url)
+
+        self.assertEqual(f.read(), 'content')
+        self.assertFalse(os.path.exists(self.store.file_path(self.url)))
+        self.assertIsNone(self.store.get_validators(self.url))
+
+        store = DownloadStore(self.files_dir, keep_all=True)
+        store.fetch(self.http_session, self.url)
+        self.assertTrue(os.path.exists(store.file_path(self.url)))
+
+    def test_evicts_least_recently_used(self):
+        store = DownloadStore(self.files_dir, max_size=10)
+        old_url = 'http://example.org/old.pdf'
+        store.fetch(self.http_session, old_url)
+        os.utime(store.file_path(old_url), (0, 0))
+
+        store.fetch(self.http_session, self.url)
+
+        self.assertFalse(os.path.exists(store.file_path(old_url)))
+        self.assertIsNone(store.get_validators(old_url))
+        self.assertIsNotNone(store.get_validators(self.url))
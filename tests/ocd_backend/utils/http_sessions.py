@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+import mock
+import requests
+
+from ocd_backend.extractors import HttpRequestMixin
+from ocd_backend.utils.http_sessions import SessionRegistry
+
+
+class SessionRegistryTestCase(TestCase):
+    def setUp(self):
+        self.registry = SessionRegistry()
+        self.addCleanup(self.registry.close)
+
+    def test_reuses_sessions(self):
+        session = self.registry.get('a', pool_maxsize=4)
+
+        self.assertIs(self.registry.get('a'), session)
+        self.assertIsNot(self.registry.get('b'), session)
+        self.assertEqual(
+            session.get_adapter('https://example.com')._pool_maxsize, 4)
+
+    @mock.patch('requests.adapters.HTTPAdapter.send')
+    def test_stats(self, send):
+        send.return_value = requests.Response()
+        send.return_value.status_code = 200
+        session = self.registry.get('a', pool_maxsize=4)
+
+        session.get('http://example.com/')
+        session.get('http://example.com/')
+
+        stats = self.registry.stats()['a']['http://']
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['peak_active'], 1)
+        self.assertEqual(stats['active'], 0)
+        self.assertEqual(stats['pool_maxsize'], 4)
+        self.assertEqual(self.registry.stats()['a']['https://']['requests'],
+                         0)
+
+    def test_http_request_mixin(self):
+        class Extractor(HttpRequestMixin):
+            def __init__(self, source_definition):
+                self.source_definition = source_definition
+
+        first = Extractor({'id': 'session_test', 'http_pool_maxsize': 3})
+        second = Extractor({'id': 'session_test', 'http_pool_maxsize': 3})
+        other = Extractor({'id': 'other_session_test'})
+
+        self.assertIs(first.http_session, second.http_session)
+        self.assertIsNot(first.http_session, other.http_session)
+        self.assertEqual(first.http_session.get_adapter(
+            'http://example.com')._pool_maxsize, 3)
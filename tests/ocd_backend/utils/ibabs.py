@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+import mock
+
+from ocd_backend.utils.ibabs import MeetingTypeRegistry
+
+
+class MeetingTypeRegistryTestCase(TestCase):
+    def setUp(self):
+        self.registry = MeetingTypeRegistry(ttl=60)
+        self.client = mock.Mock()
+        self.client.service.GetMeetingtypes.return_value = mock.Mock(
+            Meetingtypes=[[mock.Mock(Id=1, Meetingtype=u'Raad',
+                                     Abbreviation=u'R',
+                                     Description=u'Gemeenteraad')]])
+
+    def test_fetched_once_per_site(self):
+        self.assertEqual(self.registry.as_dict(self.client, 'site'),
+                         {1: u'Gemeenteraad'})
+        self.registry.as_dict(self.client, 'site')
+        self.registry.as_dict(self.client, 'other')
+
+        self.assertEqual(self.client.service.GetMeetingtypes.call_args_list,
+                         [mock.call('site'), mock.call('other')])
+
+    def test_errors_not_cached(self):
+        self.client.service.GetMeetingtypes.return_value = mock.Mock(
+            Meetingtypes=None, Message=u'Unknown site')
+
+        self.assertIsNone(self.registry.get(self.client, 'site'))
+        self.assertEqual(self.registry.as_dict(self.client, 'site'), {})
+        self.assertEqual(self.client.service.GetMeetingtypes.call_count, 2)
+
+    def test_invalidate(self):
+        self.registry.get(self.client, 'site')
+        self.registry.invalidate('site')
+        self.registry.get(self.client, 'site')
+
+        self.assertEqual(self.client.service.GetMeetingtypes.call_count, 2)
+
+    def test_redis(self):
+        redis = mock.Mock()
+        redis.get.return_value = None
+        registry = MeetingTypeRegistry(ttl=60, use_redis=True)
+
+        with mock.patch.object(MeetingTypeRegistry, 'redis', redis):
+            registry.get(self.client, 'site')
+            key, ttl, value = redis.setex.call_args[0]
+
+            redis.get.return_value = value
+            other_process = MeetingTypeRegistry(ttl=60, use_redis=True)
+            self.assertEqual(other_process.as_dict(self.client, 'site'),
+                             {1: u'Gemeenteraad'})
+
+        self.assertEqual((key, ttl), ('ibabs_meetingtypes_site', 60))
+        self.assertEqual(self.client.service.GetMeetingtypes.call_count, 1)
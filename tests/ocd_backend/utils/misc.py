@@ -0,0 +1,50 @@
+from unittest import TestCase
+from threading import Thread
+
+import mock
+from lxml import etree
+
+from ocd_backend.utils.misc import load_object, strip_namespaces
+
+
+class LoadObjectTestCase(TestCase):
+    @mock.patch.dict('ocd_backend.utils.misc._loaded_objects', clear=True)
+    def test_loaded_once(self):
+        item_class = load_object('ocd_backend.items.BaseItem')
+
+        with mock.patch('ocd_backend.items.BaseItem'):
+            self.assertIs(load_object('ocd_backend.items.BaseItem'),
+                          item_class)
+
+    def test_errors_not_cached(self):
+        self.assertRaises(NameError, load_object,
+                          'ocd_backend.items.UnknownItem')
+        self.assertRaises(NameError, load_object,
+                          'ocd_backend.items.UnknownItem')
+        self.assertRaises(ValueError, load_object, 'BaseItem')
+
+
+class StripNamespacesTestCase(TestCase):
+    def test_strip_namespaces(self):
+        item = etree.XML('<a:root xmlns:a="urn:a" xmlns:b="urn:b" b:x="1">'
+                         '<b:child>text</b:child></a:root>')
+
+        stripped = strip_namespaces(item)
+
+        self.assertEqual(etree.tostring(stripped),
+                         '<root x="1"><child>text</child></root>')
+
+    def test_threads(self):
+        results = []
+
+        def strip():
+            item = etree.XML('<a:root xmlns:a="urn:a"/>')
+            results.append(etree.tostring(strip_namespaces(item)))
+
+        threads = [Thread(target=strip) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ['<root/>'] * 4)
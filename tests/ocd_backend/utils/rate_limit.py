@@ -0,0 +1,127 @@
+from unittest import TestCase
+import time
+
+import mock
+
+from ocd_backend import settings
+from ocd_backend.utils.rate_limit import (TokenBucket, RateLimitedSession,
+                                          parse_retry_after, get_host_limiter)
+
+
+class TokenBucketTestCase(TestCase):
+    def test_spaces_calls(self):
+        limiter = TokenBucket(100)
+
+        start = time.time()
+        for _ in range(5):
+            limiter.wait()
+
+        self.assertGreaterEqual(time.time() - start, 0.04)
+
+    def test_burst(self):
+        limiter = TokenBucket(1, burst=5)
+
+        start = time.time()
+        for _ in range(5):
+            limiter.wait()
+        self.assertLess(time.time() - start, 0.1)
+
+        self.assertGreater(limiter.reserve(), 0.5)
+
+    def test_no_limit(self):
+        limiter = TokenBucket(None)
+
+        start = time.time()
+        for _ in range(100):
+            limiter.wait()
+
+        self.assertLess(time.time() - start, 0.1)
+
+    def test_defer(self):
+        limiter = TokenBucket(None)
+        limiter.defer(10)
+
+        self.assertGreater(limiter.reserve(), 9)
+
+    @mock.patch.dict('ocd_backend.utils.rate_limit._rate_limiters',
+                     clear=True)
+    def test_unlimited_without_default_limit(self):
+        with mock.patch.object(settings, 'HTTP_RATE_LIMIT', None), \
+                mock.patch.object(settings, 'HTTP_RATE_LIMITS',
+                                  {'slow.example.com': (1, 2)}):
+            self.assertIsNone(get_host_limiter('fast.example.com').rate)
+            self.assertEqual(get_host_limiter('slow.example.com').rate, 1)
+
+    @mock.patch.dict('ocd_backend.utils.rate_limit._rate_limiters',
+                     clear=True)
+    def test_default_limit(self):
+        with mock.patch.object(settings, 'HTTP_RATE_LIMITS',
+                               {'fast.example.com': None,
+                                'api.example.com': (10, 20)}):
+            self.assertEqual(get_host_limiter('go.example.com').rate, 1)
+            self.assertIsNone(get_host_limiter('fast.example.com').rate)
+            self.assertEqual(get_host_limiter('api.example.com').rate, 10)
+
+
+class RateLimitedSessionTestCase(TestCase):
+    def setUp(self):
+        self.limiter = TokenBucket(None)
+        patcher = mock.patch('ocd_backend.utils.rate_limit.get_host_limiter',
+                             return_value=self.limiter)
+        self.get_host_limiter = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.session = RateLimitedSession()
+        self.limiter.wait = mock.MagicMock()
+        self.limiter.defer = mock.MagicMock()
+
+    def response(self, status_code, headers=None):
+        return mock.MagicMock(status_code=status_code, headers=headers or {})
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('120'), 120)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'),
+                         0)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertIsNone(parse_retry_after(None))
+
+    @mock.patch('requests.Session.send')
+    def test_waits_for_host(self, send):
+        send.return_value = self.response(200)
+        request = mock.MagicMock(url='http://example.com/page')
+
+        self.assertEqual(self.session.send(request), send.return_value)
+        self.get_host_limiter.assert_called_once_with('example.com')
+        self.assertEqual(self.limiter.wait.call_count, 1)
+        self.assertFalse(self.limiter.defer.called)
+
+    @mock.patch('requests.Session.send')
+    def test_retries_too_many_requests(self, send):
+        send.side_effect = [self.response(429, {'Retry-After': '2'}),
+                            self.response(200)]
+        request = mock.MagicMock(url='http://example.com/page')
+
+        self.assertEqual(self.session.send(request).status_code, 200)
+        self.assertEqual(self.limiter.wait.call_count, 2)
+        self.limiter.defer.assert_called_once_with(2)
+
+    @mock.patch('requests.Session.send')
+    def test_backs_off_without_retry_after(self, send):
+        send.side_effect = [self.response(429), self.response(429),
+                            self.response(200)]
+        request = mock.MagicMock(url='http://example.com/page')
+
+        with mock.patch.object(settings, 'HTTP_RATE_LIMIT_BACKOFF', 1):
+            self.assertEqual(self.session.send(request).status_code, 200)
+
+        self.assertEqual(self.limiter.defer.call_args_list,
+                         [mock.call(1), mock.call(2)])
+
+    @mock.patch('requests.Session.send')
+    def test_defers_unavailable(self, send):
+        send.return_value = self.response(503, {'Retry-After': '30'})
+        request = mock.MagicMock(url='http://example.com/page')
+
+        self.assertEqual(self.session.send(request).status_code, 503)
+        self.assertEqual(send.call_count, 1)
+        self.limiter.defer.assert_called_once_with(30)
@@ -0,0 +1,58 @@
+from unittest import TestCase
+import datetime
+import os
+import shutil
+import tempfile
+
+import mock
+
+from ocd_backend.exceptions import ConfigurationError
+from ocd_backend.utils.segments import (SegmentWriter, read_segments,
+                                        latest_recording_path,
+                                        new_recording_path)
+
+
+class SegmentsTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.items = [('application/json', '{"id": %d}' % i) for i in range(25)]
+        self.items.append(('application/xml', u'<caf\xe9/>'))
+
+    def record(self, name, items):
+        path = os.path.join(self.directory, 'source', name)
+        writer = SegmentWriter(path, segment_size=10)
+        return path, writer.tee(items)
+
+    def test_record_and_replay(self):
+        path, items = self.record('1', self.items)
+
+        self.assertEqual(list(items), self.items)
+        self.assertEqual(len(os.listdir(path)), 3 + 1)
+        self.assertEqual(list(read_segments(path)), self.items)
+        self.assertEqual(list(read_segments(path, start=15)), self.items[15:])
+        self.assertIsInstance(list(read_segments(path))[0][1], str)
+
+    def test_latest_complete_recording(self):
+        path, items = self.record('1', self.items)
+        list(items)
+
+        # An interrupted recording can be read, but is not complete
+        interrupted_path, items = self.record('2', self.items)
+        for _ in range(15):
+            next(items)
+        items.close()
+
+        self.assertEqual(list(read_segments(interrupted_path)),
+                         self.items[:15])
+        self.assertEqual(latest_recording_path(self.directory, 'source'),
+                         path)
+        self.assertRaises(ConfigurationError, latest_recording_path,
+                          self.directory, 'other_source')
+
+    @mock.patch('ocd_backend.utils.segments.datetime')
+    def test_new_recordings_unique(self, datetime_):
+        datetime_.utcnow.return_value = datetime.datetime(2018, 1, 1)
+
+        self.assertNotEqual(new_recording_path(self.directory, 'source'),
+                            new_recording_path(self.directory, 'source'))
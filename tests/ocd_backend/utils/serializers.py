@@ -0,0 +1,75 @@
+from unittest import TestCase
+import datetime
+import types
+
+from dateutil.tz import tzutc
+from kombu.serialization import dumps as kombu_dumps, loads as kombu_loads
+import mock
+
+from ocd_backend import settings
+from ocd_backend.exceptions import ConfigurationError
+from ocd_backend.utils.serializers import MsgpackSerializer
+
+
+class MsgpackSerializerTestCase(TestCase):
+    def setUp(self):
+        self.serializer = MsgpackSerializer('zlib', threshold=100)
+        self.message = ((
+            'abc', u'749181',
+            {'date': datetime.datetime(2016, 5, 26, 20, 0),
+             'start_date': datetime.datetime(2016, 5, 26, 20, 0,
+                                             tzinfo=tzutc()),
+             'day': datetime.date(2016, 5, 26),
+             'source_data': {'data': '<?xml version="1.0" encoding="utf-8"?>'
+                                     '<caf\xc3\xa9/>'},
+             'title': u'caf\xe9',
+             'media_urls': [('a', 1), {'nested': (None, True, 1.5)}]},
+            'item'
+        ),), {'source_definition': {'id': 'test'}}
+
+    def test_round_trip(self):
+        message = self.serializer.loads(self.serializer.dumps(self.message))
+
+        self.assertEqual(message, self.message)
+        item = message[0][0]
+        self.assertIsInstance(item, tuple)
+        self.assertIsInstance(item[0], str)
+        self.assertIsInstance(item[1], unicode)
+        self.assertIsInstance(item[2]['source_data']['data'], str)
+        self.assertIsInstance(item[2]['media_urls'][0], tuple)
+        self.assertIsNone(item[2]['date'].tzinfo)
+        self.assertIsInstance(item[2]['day'], datetime.date)
+
+    def test_compression_threshold(self):
+        self.assertEqual(self.serializer.dumps(('a',))[0], '\x00')
+        self.assertEqual(self.serializer.dumps(self.message)[0], '\x01')
+        self.assertEqual(
+            MsgpackSerializer(None).dumps(self.message)[0], '\x00')
+
+    def test_unsupported(self):
+        self.assertRaises(ConfigurationError, MsgpackSerializer, 'unknown')
+        self.assertRaises(TypeError, self.serializer.dumps, set())
+        self.assertRaises(ValueError, self.serializer.loads, '\xff')
+
+    def test_registered(self):
+        content_type, encoding, data = kombu_dumps(self.message,
+                                                   serializer='ocd_msgpack')
+
+        self.assertEqual(kombu_loads(data, content_type, encoding),
+                         self.message)
+
+    def test_local_settings_change_compression(self):
+        local_settings = types.ModuleType('local_settings')
+        local_settings.TASK_COMPRESSION = None
+        local_settings.TASK_COMPRESSION_THRESHOLD = 10
+        try:
+            with mock.patch.dict('sys.modules',
+                                 {'local_settings': local_settings}):
+                reload(settings)
+
+            self.assertIsNone(settings.task_serializer.compress)
+            self.assertEqual(settings.task_serializer.threshold, 10)
+            _, _, data = kombu_dumps(self.message, serializer='ocd_msgpack')
+            self.assertEqual(data[0], '\x00')
+        finally:
+            reload(settings)
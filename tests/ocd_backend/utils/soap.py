@@ -0,0 +1,40 @@
+from unittest import TestCase
+
+import mock
+
+from ocd_backend.utils.soap import SoapClientFactory
+
+
+class SoapClientFactoryTestCase(TestCase):
+    def setUp(self):
+        self.factory = SoapClientFactory(ttl=60)
+
+    @mock.patch('ocd_backend.utils.soap.Client')
+    def test_wsdl_loaded_once(self, client_class):
+        first = self.factory.get_client('http://example.org/wsdl')
+        second = self.factory.get_client('http://example.org/wsdl',
+                                         port='https')
+
+        client_class.assert_called_once_with('http://example.org/wsdl',
+                                             cache=None)
+        self.assertEqual(client_class.return_value.clone.call_count, 2)
+        second.set_options.assert_called_once_with(port='https')
+        self.assertEqual(first, client_class.return_value.clone.return_value)
+
+    @mock.patch('ocd_backend.utils.soap.time')
+    @mock.patch('ocd_backend.utils.soap.Client')
+    def test_wsdl_reloaded_after_ttl(self, client_class, time):
+        time.return_value = 1000
+        self.factory.get_client('http://example.org/wsdl')
+        time.return_value = 1061
+        self.factory.get_client('http://example.org/wsdl')
+
+        self.assertEqual(client_class.call_count, 2)
+
+    @mock.patch('ocd_backend.utils.soap.Client')
+    def test_on_disk_cache(self, client_class):
+        factory = SoapClientFactory(cache_dir='/tmp/wsdl', ttl=60)
+        factory.get_client('http://example.org/wsdl')
+
+        cache = client_class.call_args[1]['cache']
+        self.assertEqual(cache.location, '/tmp/wsdl')
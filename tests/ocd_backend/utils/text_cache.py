@@ -0,0 +1,50 @@
+from unittest import TestCase
+import os
+import shutil
+import tempfile
+
+import mock
+
+from ocd_backend.utils.text_cache import TextExtractionCache
+
+
+class TextExtractionCacheTestCase(TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = TextExtractionCache(self.cache_dir, 1024)
+        self.extract = mock.Mock(return_value='text', __name__='extract')
+
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir,
+                                         delete=False) as f:
+            f.write('content')
+        self.path = f.name
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_extract_cached(self):
+        self.assertEqual(self.cache.extract(self.extract, self.path, 20),
+                         'text')
+        self.assertEqual(self.cache.extract(self.extract, self.path, 20),
+                         'text')
+        self.assertEqual(self.extract.call_count, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+        # A different number of pages results in a different text
+        self.cache.extract(self.extract, self.path, 0)
+        self.assertEqual(self.extract.call_count, 2)
+
+    def test_failed_extraction_not_cached(self):
+        self.extract.return_value = None
+        self.assertIsNone(self.cache.extract(self.extract, self.path, 20))
+        self.assertIsNone(self.cache.extract(self.extract, self.path, 20))
+        self.assertEqual(self.extract.call_count, 2)
+
+    def test_evict(self):
+        self.cache.max_size = 10
+        self.cache.set('aa_old', '12345')
+        os.utime(self.cache._entry_path('aa_old'), (0, 0))
+        self.cache.set('bb_new', '123456')
+
+        self.assertIsNone(self.cache.get('aa_old'))
+        self.assertEqual(self.cache.get('bb_new'), '123456')